@@ -0,0 +1,59 @@
+/**
+ * Projection fixtures shared with the Python projection engine
+ *
+ * scripts/tests/fixtures/projection_cases.json records the chartData this
+ * model returns for a set of plans; scripts/tests/test_projection_engine.py
+ * checks scripts/projection_engine.py against the same file. This test keeps
+ * the fixtures in step with the TS model. After an intended change to the
+ * projection, regenerate them with:
+ *
+ *   UPDATE_PROJECTION_FIXTURES=1 npx jest projectionFixtures
+ */
+
+import fs from 'fs';
+import path from 'path';
+import {
+  calculateRetirementProjection,
+  getPortfolioExhaustionAge,
+  isProjectionSuccessful,
+  ProjectionOptions,
+} from '../lib/calculations/projection';
+
+const FIXTURES = path.join(__dirname, '..', 'scripts', 'tests', 'fixtures', 'projection_cases.json');
+
+interface ProjectionCase {
+  name: string;
+  options: ProjectionOptions;
+  success: boolean;
+  exhaustionAge: number | null;
+  chartData: any[];
+}
+
+const fixtures: { cases: ProjectionCase[] } = JSON.parse(fs.readFileSync(FIXTURES, 'utf8'));
+
+function run(options: ProjectionOptions) {
+  const result = calculateRetirementProjection(options);
+  return {
+    success: isProjectionSuccessful(result),
+    exhaustionAge: getPortfolioExhaustionAge(result),
+    chartData: result.chartData,
+  };
+}
+
+describe('Projection fixtures', () => {
+  if (process.env.UPDATE_PROJECTION_FIXTURES) {
+    it('regenerates the fixtures', () => {
+      const cases = fixtures.cases.map(({ name, options }) => ({ name, options, ...run(options) }));
+      fs.writeFileSync(FIXTURES, JSON.stringify({ cases }, null, 2) + '\n');
+    });
+    return;
+  }
+
+  it.each(fixtures.cases.map((c) => [c.name, c] as const))('%s matches the recorded projection', (_, c) => {
+    const result = run(c.options);
+
+    expect(result.chartData).toEqual(c.chartData);
+    expect(result.success).toBe(c.success);
+    expect(result.exhaustionAge).toBe(c.exhaustionAge);
+  });
+});
@@ -8,7 +8,6 @@ import { NextRequest, NextResponse } from 'next/server';
 import { spawn } from 'child_process';
 import path from 'path';
 import fs from 'fs';
-import os from 'os';
 
 export async function POST(request: NextRequest) {
   try {
@@ -33,14 +32,6 @@ export async function POST(request: NextRequest) {
       }
     }
     
-    // Use OS temp directory (works on Windows, Mac, Linux)
-    const tempDir = os.tmpdir();
-    const tempDataPath = path.join(tempDir, `retirement-data-${Date.now()}.json`);
-    const tempPdfPath = path.join(tempDir, `retirement-report-${Date.now()}.pdf`);
-    
-    // Write data to temp file
-    fs.writeFileSync(tempDataPath, JSON.stringify(data));
-    
     // Path to Python script
     const scriptPath = path.join(process.cwd(), 'scripts', 'generate_pdf_report.py');
     
@@ -60,23 +51,24 @@ export async function POST(request: NextRequest) {
       pythonCommand = 'python';
     }
     
-    const python = spawn(pythonCommand, [scriptPath, tempDataPath, tempPdfPath]);
+    // '-' '-' = read JSON from stdin, write the PDF to stdout (no temp files)
+    const python = spawn(pythonCommand, [scriptPath, '-', '-']);
     
     let errorOutput = '';
-    let stdOutput = '';
+    const pdfChunks: Buffer[] = [];
     
-    python.stdout.on('data', (data) => {
-      stdOutput += data.toString();
+    python.stdout.on('data', (chunk: Buffer) => {
+      pdfChunks.push(chunk);
     });
     
     python.stderr.on('data', (data) => {
       errorOutput += data.toString();
     });
     
-    await new Promise((resolve, reject) => {
+    const finished = new Promise((resolve, reject) => {
       python.on('close', (code) => {
         if (code !== 0) {
-          reject(new Error(`Python script exited with code ${code}:\nSTDERR: ${errorOutput}\nSTDOUT: ${stdOutput}`));
+          reject(new Error(`Python script exited with code ${code}:\nSTDERR: ${errorOutput}`));
         } else {
           resolve(true);
         }
@@ -87,25 +79,24 @@ export async function POST(request: NextRequest) {
       });
     });
     
-    // Check if PDF was created
-    if (!fs.existsSync(tempPdfPath)) {
+    // Send the request data on stdin
+    python.stdin.on('error', () => {
+      // Reported through the close handler above
+    });
+    python.stdin.end(JSON.stringify(data));
+    
+    await finished;
+    
+    const pdfBuffer = Buffer.concat(pdfChunks);
+    
+    // Check if PDF was produced
+    if (pdfBuffer.length === 0) {
       return NextResponse.json(
-        { error: 'PDF file was not created', stderr: errorOutput, stdout: stdOutput },
+        { error: 'PDF was not generated', stderr: errorOutput },
         { status: 500 }
       );
     }
     
-    // Read generated PDF
-    const pdfBuffer = fs.readFileSync(tempPdfPath);
-    
-    // Clean up temp files
-    try {
-      fs.unlinkSync(tempDataPath);
-      fs.unlinkSync(tempPdfPath);
-    } catch (cleanupError) {
-      console.warn('Failed to clean up temp files:', cleanupError);
-    }
-    
     // Return PDF
     return new NextResponse(pdfBuffer, {
       headers: {
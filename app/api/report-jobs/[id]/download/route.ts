@@ -0,0 +1,65 @@
+/**
+ * API Route: /api/report-jobs/{id}/download
+ *
+ * Returns the finished PDF/DOCX of a report job. Responds 409 while the job
+ * is still queued or running (or has failed), and 404 once it has expired.
+ */
+
+import { NextRequest, NextResponse } from 'next/server';
+import {
+  CONTENT_TYPES,
+  JOB_NOT_FOUND,
+  JOB_NOT_READY,
+  ReportFormat,
+  isJobId,
+  parseJobOutput,
+  runReportJobs,
+} from '@/lib/utils/reportJobs';
+
+export async function GET(request: NextRequest, { params }: { params: Promise<{ id: string }> }) {
+  try {
+    const { id } = await params;
+    if (!isJobId(id)) {
+      return NextResponse.json({ error: 'Invalid job id' }, { status: 400 });
+    }
+
+    // Status first, for the format (and a clear error when not ready)
+    const status = await runReportJobs(['status', id]);
+    const job = parseJobOutput(status);
+    if (status.code === JOB_NOT_FOUND) {
+      return NextResponse.json({ error: job.error }, { status: 404 });
+    }
+
+    const result = await runReportJobs(['fetch', id, '-']);
+    if (result.code === JOB_NOT_FOUND) {
+      return NextResponse.json(parseJobOutput(result), { status: 404 });
+    }
+    if (result.code === JOB_NOT_READY) {
+      return NextResponse.json(
+        { error: parseJobOutput(result).error, status: job.status, jobError: job.error },
+        { status: 409 }
+      );
+    }
+    if (result.code !== 0) {
+      return NextResponse.json(
+        { error: 'Failed to fetch report', details: parseJobOutput(result).error },
+        { status: 500 }
+      );
+    }
+
+    const format = job.format as ReportFormat;
+    return new NextResponse(result.stdout, {
+      headers: {
+        'Content-Type': CONTENT_TYPES[format],
+        'Content-Disposition': `attachment; filename="retirement-plan.${format}"`,
+      },
+    });
+
+  } catch (error: any) {
+    console.error('Error fetching report:', error);
+    return NextResponse.json(
+      { error: 'Failed to fetch report', details: error.message },
+      { status: 500 }
+    );
+  }
+}
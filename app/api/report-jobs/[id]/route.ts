@@ -0,0 +1,42 @@
+/**
+ * API Route: /api/report-jobs/{id}
+ *
+ * Status of a queued report: queued (with its queue position), running,
+ * done (with the report size) or failed (with the error).
+ */
+
+import { NextRequest, NextResponse } from 'next/server';
+import { JOB_NOT_FOUND, isJobId, parseJobOutput, runReportJobs } from '@/lib/utils/reportJobs';
+
+export async function GET(request: NextRequest, { params }: { params: Promise<{ id: string }> }) {
+  try {
+    const { id } = await params;
+    if (!isJobId(id)) {
+      return NextResponse.json({ error: 'Invalid job id' }, { status: 400 });
+    }
+
+    const result = await runReportJobs(['status', id]);
+    const job = parseJobOutput(result);
+    if (result.code === JOB_NOT_FOUND) {
+      return NextResponse.json({ error: job.error }, { status: 404 });
+    }
+    if (result.code !== 0) {
+      return NextResponse.json(
+        { error: 'Failed to read job status', details: job.error },
+        { status: 500 }
+      );
+    }
+
+    if (job.status === 'done') {
+      job.downloadUrl = `/api/report-jobs/${id}/download`;
+    }
+    return NextResponse.json(job, { headers: { 'Cache-Control': 'no-store' } });
+
+  } catch (error: any) {
+    console.error('Error reading job status:', error);
+    return NextResponse.json(
+      { error: 'Failed to read job status', details: error.message },
+      { status: 500 }
+    );
+  }
+}
@@ -0,0 +1,73 @@
+/**
+ * API Route: /api/report-jobs
+ *
+ * Queues a PDF or DOCX report render and returns its job id immediately.
+ * Poll /api/report-jobs/{id} for the status and fetch the finished report
+ * from /api/report-jobs/{id}/download.
+ *
+ * POST /api/report-jobs?format=pdf|docx   (body: the same payload as /api/generate-pdf-report)
+ */
+
+import { NextRequest, NextResponse } from 'next/server';
+import { REPORT_FORMATS, ReportFormat, parseJobOutput, runReportJobs } from '@/lib/utils/reportJobs';
+
+export async function POST(request: NextRequest) {
+  try {
+    const format = (request.nextUrl.searchParams.get('format') || 'pdf') as ReportFormat;
+    if (!REPORT_FORMATS.includes(format)) {
+      return NextResponse.json(
+        { error: `Unsupported format: ${format}` },
+        { status: 400 }
+      );
+    }
+
+    const data = await request.json();
+
+    // Validate required fields
+    const requiredFields = [
+      'mainSuperBalance',
+      'sequencingBuffer',
+      'currentAge',
+      'retirementAge',
+      'baseSpending',
+      'chartData',
+    ];
+
+    for (const field of requiredFields) {
+      if (!(field in data)) {
+        return NextResponse.json(
+          { error: `Missing required field: ${field}` },
+          { status: 400 }
+        );
+      }
+    }
+
+    const result = await runReportJobs(['submit', format, '-'], JSON.stringify(data));
+    const job = parseJobOutput(result);
+    if (result.code !== 0) {
+      return NextResponse.json(
+        { error: 'Failed to queue report', details: job.error },
+        { status: 500 }
+      );
+    }
+
+    const statusUrl = `/api/report-jobs/${job.id}`;
+    return NextResponse.json(
+      {
+        id: job.id,
+        status: job.status,
+        format,
+        statusUrl,
+        downloadUrl: `${statusUrl}/download`,
+      },
+      { status: 202, headers: { Location: statusUrl } }
+    );
+
+  } catch (error: any) {
+    console.error('Error queueing report:', error);
+    return NextResponse.json(
+      { error: 'Failed to queue report', details: error.message },
+      { status: 500 }
+    );
+  }
+}
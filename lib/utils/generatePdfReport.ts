@@ -64,6 +64,56 @@ export async function generatePdfReport(data: RetirementData): Promise<Blob> {
   return await response.blob();
 }
 
+/**
+ * Generate a report through the asynchronous job API
+ *
+ * Queues the render, polls its status and downloads the finished file, so
+ * no single request stays open for the whole render.
+ */
+export async function generateReportAsync(
+  data: RetirementData,
+  format: 'pdf' | 'docx' = 'pdf',
+  { pollInterval = 1000, timeout = 5 * 60 * 1000 } = {}
+): Promise<Blob> {
+  const submitted = await fetch(`/api/report-jobs?format=${format}`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify(data),
+  });
+
+  if (!submitted.ok) {
+    throw new Error('Failed to queue report');
+  }
+
+  const job = await submitted.json();
+  const deadline = Date.now() + timeout;
+
+  while (Date.now() < deadline) {
+    await new Promise((resolve) => setTimeout(resolve, pollInterval));
+
+    const response = await fetch(job.statusUrl, { cache: 'no-store' });
+    if (!response.ok) {
+      throw new Error('Failed to read report status');
+    }
+
+    const status = await response.json();
+    if (status.status === 'failed') {
+      throw new Error(`Report generation failed: ${status.error}`);
+    }
+    if (status.status === 'done') {
+      const download = await fetch(job.downloadUrl);
+      if (!download.ok) {
+        throw new Error('Failed to download report');
+      }
+      return await download.blob();
+    }
+  }
+
+  throw new Error('Timed out waiting for report');
+}
+
 /**
  * Download the PDF report
  */
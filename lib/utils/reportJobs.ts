@@ -0,0 +1,80 @@
+/**
+ * Report job queue helpers (server-side)
+ *
+ * Thin wrapper around scripts/report_jobs.py, which keeps the durable job
+ * queue (SQLite) and the rendered artifacts. The API routes under
+ * /api/report-jobs use it to submit jobs, read their status and fetch the
+ * finished PDF/DOCX; the renders themselves run in `report_jobs.py worker`
+ * processes, not in the request.
+ */
+
+import { spawn } from 'child_process';
+import path from 'path';
+
+export const REPORT_FORMATS = ['pdf', 'docx'] as const;
+export type ReportFormat = typeof REPORT_FORMATS[number];
+
+export const CONTENT_TYPES: Record<ReportFormat, string> = {
+  pdf: 'application/pdf',
+  docx: 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+};
+
+// Exit statuses of report_jobs.py
+export const JOB_NOT_FOUND = 2;
+export const JOB_NOT_READY = 3;
+
+const JOB_ID = /^[0-9a-f]{32}$/;
+
+export function isJobId(id: string): boolean {
+  return JOB_ID.test(id);
+}
+
+export interface JobCommandResult {
+  code: number | null;
+  stdout: Buffer;
+  stderr: string;
+}
+
+/**
+ * Run `report_jobs.py <args>`, optionally writing input to its stdin
+ */
+export function runReportJobs(args: string[], input?: string | Buffer): Promise<JobCommandResult> {
+  const scriptPath = path.join(process.cwd(), 'scripts', 'report_jobs.py');
+  const pythonCommand = process.platform === 'win32' ? 'python' : 'python3';
+
+  return new Promise((resolve, reject) => {
+    const python = spawn(pythonCommand, [scriptPath, ...args]);
+    const chunks: Buffer[] = [];
+    let stderr = '';
+
+    python.stdout.on('data', (chunk: Buffer) => {
+      chunks.push(chunk);
+    });
+    python.stderr.on('data', (data) => {
+      stderr += data.toString();
+    });
+    python.on('error', (err) => {
+      reject(new Error(`Failed to start Python: ${err.message}`));
+    });
+    python.on('close', (code) => {
+      resolve({ code, stdout: Buffer.concat(chunks), stderr });
+    });
+
+    python.stdin.on('error', () => {
+      // Reported through the close handler above
+    });
+    python.stdin.end(input);
+  });
+}
+
+/**
+ * Parse the JSON a job command printed (on stdout, or stderr for errors)
+ */
+export function parseJobOutput(result: JobCommandResult): any {
+  const text = result.code === 0 ? result.stdout.toString() : result.stderr;
+  try {
+    return JSON.parse(text.trim().split('\n').pop() || '{}');
+  } catch {
+    return { error: text.trim() || `report_jobs.py exited with code ${result.code}` };
+  }
+}
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Australian Retirement Planning - Batch Report Generator
+
+Renders PDF and/or DOCX reports for many clients in one run. Payloads come
+from a JSONL file (one client per line) or a directory of .json files, and
+are rendered in parallel by worker processes that import the generators
+once and reuse them for every client they handle.
+
+Usage:
+    batch_reports.py <clients.jsonl | payload_dir> <output_dir | output.zip>
+                     [--format pdf|docx|both] [--workers N] [--summary-json PATH]
+"""
+
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+
+_renderers = None
+
+
+def _init_worker():
+    """Import both generators once per worker process"""
+    global _renderers
+    from generate_pdf_report import render_pdf_bytes
+    from generate_retirement_docx import render_docx_bytes
+    _renderers = {'pdf': render_pdf_bytes, 'docx': render_docx_bytes}
+
+
+def _render_client(name, data, formats, output_dir):
+    """Render one client's documents; returns per-format results"""
+    results = []
+    for fmt in formats:
+        started = time.perf_counter()
+        try:
+            body = _renderers[fmt](data)
+        except Exception as e:
+            results.append({'format': fmt, 'ok': False, 'error': f'{type(e).__name__}: {e}',
+                            'seconds': time.perf_counter() - started})
+            continue
+        elapsed = time.perf_counter() - started
+        result = {'format': fmt, 'ok': True, 'seconds': elapsed, 'size': len(body)}
+        if output_dir:
+            # Directory output is written by the worker to avoid shipping bytes back
+            with open(os.path.join(output_dir, f'{name}.{fmt}'), 'wb') as f:
+                f.write(body)
+        else:
+            result['body'] = body
+        results.append(result)
+    return name, results
+
+
+def safe_name(name):
+    """Make a client identifier safe to use as a file name"""
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', str(name)).strip('._') or 'client'
+
+
+def _check_object(data):
+    """Reject valid JSON that is not a payload object"""
+    if not isinstance(data, dict):
+        raise ValueError(f'expected a JSON object, got {type(data).__name__}')
+    return data
+
+
+def iter_payloads(source):
+    """Yield (name, payload) pairs from a JSONL file or a directory of .json files.
+
+    Unreadable entries are yielded with the ValueError in place of the payload.
+    """
+    if os.path.isdir(source):
+        for filename in sorted(os.listdir(source)):
+            if not filename.endswith('.json'):
+                continue
+            path = os.path.join(source, filename)
+            try:
+                with open(path, 'r') as f:
+                    data = _check_object(json.load(f))
+            except ValueError as e:
+                yield os.path.splitext(filename)[0], e
+                continue
+            yield data.get('clientId') or os.path.splitext(filename)[0], data
+        return
+
+    with open(source, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                data = _check_object(json.loads(line))
+            except ValueError as e:
+                yield f'line-{line_number}', e
+                continue
+            yield data.get('clientId') or data.get('id') or f'client-{line_number:05d}', data
+
+
+def percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = (pct / 100) * (len(sorted_values) - 1)
+    lower = int(index)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = index - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def run_batch(source, destination, formats=('pdf',), workers=None, in_flight=None):
+    """Render every payload in source into destination; returns a summary dict"""
+    to_zip = destination.lower().endswith('.zip')
+    output_dir = None if to_zip else destination
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    archive = zipfile.ZipFile(destination, 'w', zipfile.ZIP_DEFLATED) if to_zip else None
+
+    workers = workers or os.cpu_count() or 1
+    in_flight = in_flight or workers * 4  # bound queued payloads held in memory
+
+    timings = {fmt: [] for fmt in formats}
+    failures = []
+    clients = 0
+    documents = 0
+    total_bytes = 0
+    used_names = set()
+    started = time.perf_counter()
+
+    def collect(future, name):
+        nonlocal documents, total_bytes
+        try:
+            name, results = future.result()
+        except BrokenProcessPool as e:
+            # A worker died (crash, OOM kill) with this client in flight
+            for fmt in formats:
+                failures.append({'client': name, 'format': fmt, 'error': f'Worker process died: {e}'})
+            return
+        for result in results:
+            if not result['ok']:
+                failures.append({'client': name, 'format': result['format'], 'error': result['error']})
+                continue
+            documents += 1
+            total_bytes += result['size']
+            timings[result['format']].append(result['seconds'])
+            if archive is not None:
+                archive.writestr(f"{name}.{result['format']}", result['body'])
+
+    def new_executor():
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+
+    executor = new_executor()
+    try:
+        pending = {}
+        for name, data in iter_payloads(source):
+            # Keep output names unique when client ids repeat (or look like
+            # an earlier de-duplicated name)
+            base = name = safe_name(name)
+            count = 1
+            while name in used_names:
+                count += 1
+                name = f'{base}-{count}'
+            used_names.add(name)
+
+            clients += 1
+            if isinstance(data, Exception):
+                failures.append({'client': name, 'format': None, 'error': f'Invalid JSON: {data}'})
+                continue
+
+            try:
+                future = executor.submit(_render_client, name, data, formats, output_dir)
+            except BrokenProcessPool:
+                # Clients in flight on the broken pool are failed by collect();
+                # the rest of the batch gets a fresh pool
+                executor.shutdown(wait=False)
+                executor = new_executor()
+                future = executor.submit(_render_client, name, data, formats, output_dir)
+            pending[future] = name
+            if len(pending) >= in_flight:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future, pending.pop(future))
+
+        for future, name in pending.items():
+            collect(future, name)
+    finally:
+        executor.shutdown()
+        if archive is not None:
+            archive.close()
+
+    elapsed = time.perf_counter() - started
+    per_format = {}
+    for fmt, values in timings.items():
+        values.sort()
+        per_format[fmt] = {
+            'documents': len(values),
+            'mean': round(sum(values) / len(values), 4) if values else 0,
+            'p50': round(percentile(values, 50), 4),
+            'p95': round(percentile(values, 95), 4),
+            'max': round(values[-1], 4) if values else 0,
+        }
+
+    return {
+        'source': source,
+        'destination': destination,
+        'workers': workers,
+        'clients': clients,
+        'documents': documents,
+        'failures': len(failures),
+        'failed': failures,
+        'elapsed': round(elapsed, 3),
+        'documents_per_second': round(documents / elapsed, 2) if elapsed > 0 else 0,
+        'total_bytes': total_bytes,
+        'timing': per_format,
+    }
+
+
+def print_summary(summary):
+    """Human-readable batch summary"""
+    print(f"Rendered {summary['documents']} documents for {summary['clients']} clients "
+          f"in {summary['elapsed']:.2f}s ({summary['documents_per_second']:.1f} docs/s, "
+          f"{summary['workers']} workers)")
+    print(f"Output: {summary['destination']} ({summary['total_bytes'] / 1024 / 1024:.1f} MB)")
+    for fmt, stats in summary['timing'].items():
+        print(f"  {fmt.upper():<5} n={stats['documents']:<6} mean={stats['mean'] * 1000:.0f}ms "
+              f"p50={stats['p50'] * 1000:.0f}ms p95={stats['p95'] * 1000:.0f}ms max={stats['max'] * 1000:.0f}ms")
+    if summary['failures']:
+        print(f"Failures: {summary['failures']}")
+        for failure in summary['failed'][:20]:
+            fmt = failure['format'] or 'input'
+            print(f"  {failure['client']} [{fmt}]: {failure['error']}")
+        if summary['failures'] > 20:
+            print(f"  ... and {summary['failures'] - 20} more")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Render retirement reports for many clients')
+    parser.add_argument('source', help='JSONL file (one payload per line) or directory of .json payloads')
+    parser.add_argument('destination', help='Output directory, or a path ending in .zip')
+    parser.add_argument('--format', choices=['pdf', 'docx', 'both'], default='pdf')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--summary-json', help='Also write the summary as JSON to this path')
+    args = parser.parse_args()
+
+    formats = ('pdf', 'docx') if args.format == 'both' else (args.format,)
+    summary = run_batch(args.source, args.destination, formats=formats, workers=args.workers)
+    print_summary(summary)
+
+    if args.summary_json:
+        with open(args.summary_json, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+    sys.exit(1 if summary['failures'] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Australian Retirement Planning - Report Benchmarks
+
+Times both report generators on synthetic, seeded payloads of increasing
+size so render-latency regressions show up before they reach production.
+
+Each profile builds a payload with chartData of a given length, p10-p90
+Monte Carlo percentile paths, many formalTestResults and many
+oneOffExpenses. For each profile the harness records:
+    pdf    generate_pdf_report() time, peak traced memory, output size
+    docx   build + save time, time of every create_* section, peak memory,
+           output size
+
+Caches are bypassed and the report date is pinned, so repeated runs
+measure the same work and produce the same output sizes.
+
+Usage:
+    benchmark_reports.py [--profiles short,40-year,75-year,monthly] [--repeat 5]
+                         [--tests 20] [--expenses 30] [--seed 42]
+                         [--baseline PATH] [--save-baseline PATH] [--tolerance 0.25]
+
+With --baseline, results are compared against a stored run and the exit
+status is 1 if any timing regressed beyond the tolerance.
+"""
+
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from io import BytesIO
+
+from render_profile import RenderProfiler
+
+
+# Profile -> (years, rows per year)
+PROFILES = {
+    'short': (10, 1),
+    '40-year': (40, 1),
+    '75-year': (75, 1),
+    'monthly': (75, 12),
+}
+
+DEFAULT_PROFILES = ('short', '40-year', '75-year', 'monthly')
+
+REPORT_DATE = '2025-07-01'
+
+# Timing changes smaller than this are noise, whatever the ratio
+MIN_REGRESSION_SECONDS = 0.01
+
+_PERCENTILE_SCALE = {'p10': 0.45, 'p25': 0.75, 'p50': 1.0, 'p75': 1.3, 'p90': 1.7}
+
+
+# ========== SYNTHETIC PAYLOADS ==========
+
+def _balance_path(rng, ages, start, spending, income, mean_return, volatility, retirement_age):
+    """Year-by-year rows of one seeded projection path"""
+    rows = []
+    balance = start
+    steps = len(ages)
+    per_year = max(1, round(steps / max(1, ages[-1] - ages[0] + 1)))
+    for i, age in enumerate(ages):
+        retired = age >= retirement_age
+        spend = spending / per_year if retired else 0.0
+        inc = income / per_year if retired else 0.0
+        growth = rng.gauss(mean_return, volatility) / 100 / per_year
+        balance = max(0.0, balance * (1 + growth) - (spend - inc))
+        rows.append({
+            'year': 2026 + i // per_year,
+            'age': round(age, 3),
+            'Total Balance': balance,
+            'Main Super': balance * 0.85,
+            'Buffer': balance * 0.15,
+            'Spending': spend,
+            'Income': inc,
+        })
+    return rows
+
+
+def synthetic_payload(profile, tests=20, expenses=30, seed=42):
+    """Seeded report payload for a benchmark profile"""
+    years, per_year = PROFILES[profile]
+    rng = random.Random(f'{seed}-{profile}')
+    current_age = 100 - years if years < 45 else 25 + (75 - years)
+    retirement_age = min(current_age + 5, 67)
+    ages = [current_age + step / per_year for step in range(years * per_year)]
+
+    start = 1_560_000
+    chart = _balance_path(rng, ages, start, 120_000, 101_000, 6.0, 12.0, retirement_age)
+
+    percentiles = {
+        key: [{'age': row['age'], 'year': row['year'], 'totalBalance': row['Total Balance'] * scale,
+               'spending': row['Spending'], 'income': row['Income']} for row in chart]
+        for key, scale in _PERCENTILE_SCALE.items()
+    }
+
+    formal = {}
+    for i in range(tests):
+        key = f'{chr(ord("A") + i // 9)}{i % 9 + 1}'
+        path = _balance_path(rng, ages, start, 120_000 + 2_000 * i, 101_000, 5.0 - i * 0.1, 15.0,
+                             retirement_age)
+        formal[key] = {
+            'name': f'{key}: Stress scenario {i + 1}',
+            'desc': f'Synthetic stress test {i + 1} with lower returns and higher spending',
+            'simulationData': [{'age': row['age'], 'totalBalance': row['Total Balance']} for row in path],
+        }
+
+    one_off = [
+        {'age': int(retirement_age + rng.randrange(0, max(1, 100 - retirement_age))),
+         'description': f'Planned expense {i + 1}',
+         'amount': rng.randrange(5_000, 80_000, 500)}
+        for i in range(expenses)
+    ]
+
+    return {
+        'mainSuperBalance': 1_360_000,
+        'sequencingBuffer': 200_000,
+        'totalPensionIncome': 101_000,
+        'currentAge': int(current_age),
+        'retirementAge': int(retirement_age),
+        'pensionRecipientType': 'couple',
+        'isHomeowner': True,
+        'baseSpending': 120_000,
+        'spendingPattern': 'jpmorgan',
+        'splurgeAmount': 0,
+        'inflationRate': 2.5,
+        'selectedScenario': 4,
+        'includeAgePension': True,
+        'reportDate': REPORT_DATE,
+        'chartData': chart,
+        'monteCarloResults': {
+            'successRate': 82.5,
+            'runs': 1000,
+            'percentiles': percentiles,
+        },
+        'formalTestResults': formal,
+        'oneOffExpenses': one_off,
+    }
+
+
+# ========== MEASUREMENT ==========
+
+def _quiet_profiler(report, track_memory):
+    return RenderProfiler(report, enabled=True, target=os.devnull, track_memory=track_memory)
+
+
+def _render_pdf(data, profiler):
+    from generate_pdf_report import generate_pdf_report
+    return generate_pdf_report(data, profiler=profiler).getvalue()
+
+
+def _render_docx(data, profiler):
+    from generate_retirement_docx import build_document
+    buffer = BytesIO()
+    build_document(data, profiler=profiler, fragments=False).save(buffer)
+    return buffer.getvalue()
+
+
+def benchmark(render, report, data, repeat):
+    """Median wall time, per-section medians, peak memory and size of one renderer"""
+    render(data, _quiet_profiler(report, False))  # warm up imports and style caches
+
+    totals = []
+    sections = {}
+    for _ in range(repeat):
+        profiler = _quiet_profiler(report, False)
+        started = time.perf_counter()
+        render(data, profiler)
+        totals.append(time.perf_counter() - started)
+        for section in profiler.sections:
+            sections.setdefault(section['name'], []).append(section['seconds'])
+
+    # Memory is traced in a separate run so tracing doesn't skew the timings
+    profiler = _quiet_profiler(report, True)
+    body = render(data, profiler)
+    peak = max((section['peak_bytes'] for section in profiler.sections), default=0)
+
+    return {
+        'seconds': round(statistics.median(totals), 6),
+        'min_seconds': round(min(totals), 6),
+        'sections': {name: round(statistics.median(values), 6) for name, values in sections.items()},
+        'peak_bytes': peak,
+        'size': len(body),
+    }
+
+
+def run_benchmarks(profiles=DEFAULT_PROFILES, repeat=5, tests=20, expenses=30, seed=42):
+    """Benchmark every profile; returns a JSON-serializable result"""
+    os.environ['REPORT_CACHE'] = '0'
+    results = {}
+    for profile in profiles:
+        data = synthetic_payload(profile, tests=tests, expenses=expenses, seed=seed)
+        results[profile] = {
+            'rows': len(data['chartData']),
+            'pdf': benchmark(_render_pdf, 'pdf', data, repeat),
+            'docx': benchmark(_render_docx, 'docx', data, repeat),
+        }
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'settings': {'repeat': repeat, 'tests': tests, 'expenses': expenses, 'seed': seed},
+        'results': results,
+    }
+
+
+# ========== BASELINE COMPARISON ==========
+
+def compare(current, baseline, tolerance=0.25):
+    """Timing regressions beyond tolerance: list of (profile, metric, old, new)"""
+    regressions = []
+    for profile, result in current['results'].items():
+        old_result = baseline.get('results', {}).get(profile)
+        if not old_result:
+            continue
+        for report in ('pdf', 'docx'):
+            new, old = result[report], old_result.get(report, {})
+            metrics = [('seconds', new['seconds'], old.get('seconds'))]
+            metrics += [(f'sections.{name}', seconds, old.get('sections', {}).get(name))
+                        for name, seconds in new['sections'].items()]
+            for metric, new_value, old_value in metrics:
+                if old_value is None:
+                    continue
+                if new_value > old_value * (1 + tolerance) and new_value - old_value > MIN_REGRESSION_SECONDS:
+                    regressions.append((profile, f'{report}.{metric}', old_value, new_value))
+    return regressions
+
+
+def print_results(current, baseline=None):
+    print(f"{'profile':<10} {'rows':>5}  {'pdf ms':>8} {'pdf MB':>7} {'pdf KB':>7}  "
+          f"{'docx ms':>8} {'docx MB':>7} {'docx KB':>7}")
+    for profile, result in current['results'].items():
+        pdf, docx = result['pdf'], result['docx']
+        line = (f"{profile:<10} {result['rows']:>5}  "
+                f"{pdf['seconds'] * 1000:8.1f} {pdf['peak_bytes'] / 1e6:7.1f} {pdf['size'] / 1024:7.0f}  "
+                f"{docx['seconds'] * 1000:8.1f} {docx['peak_bytes'] / 1e6:7.1f} {docx['size'] / 1024:7.0f}")
+        old = (baseline or {}).get('results', {}).get(profile)
+        if old:
+            line += (f"   (baseline pdf {old['pdf']['seconds'] * 1000:.1f} ms, "
+                     f"docx {old['docx']['seconds'] * 1000:.1f} ms)")
+        print(line)
+
+    print("\nDOCX sections (median ms):")
+    names = list(next(iter(current['results'].values()))['docx']['sections'])
+    print(f"  {'section':<34}" + ''.join(f"{profile:>10}" for profile in current['results']))
+    for name in names:
+        print(f"  {name:<34}" + ''.join(
+            f"{result['docx']['sections'].get(name, 0) * 1000:10.1f}" for result in current['results'].values()
+        ))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark the PDF and DOCX report generators')
+    parser.add_argument('--profiles', default=','.join(DEFAULT_PROFILES),
+                        help=f"Comma-separated profiles ({', '.join(PROFILES)})")
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per renderer (median is reported)')
+    parser.add_argument('--tests', type=int, default=20, help='formalTestResults per payload')
+    parser.add_argument('--expenses', type=int, default=30, help='oneOffExpenses per payload')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--baseline', help='Compare against a stored benchmark JSON')
+    parser.add_argument('--save-baseline', help='Write this run as a benchmark JSON')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown before a timing counts as a regression (0.25 = 25%%)')
+    args = parser.parse_args()
+
+    profiles = [p.strip() for p in args.profiles.split(',') if p.strip()]
+    unknown = [p for p in profiles if p not in PROFILES]
+    if unknown:
+        parser.error(f"Unknown profile(s): {', '.join(unknown)}")
+
+    current = run_benchmarks(profiles, args.repeat, args.tests, args.expenses, args.seed)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_results(current, baseline)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"\nBaseline written: {args.save_baseline}")
+
+    if baseline is not None:
+        if baseline.get('settings') != current['settings']:
+            print("\nWarning: baseline was recorded with different settings", file=sys.stderr)
+        regressions = compare(current, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for profile, metric, old, new in regressions:
+                print(f"  {profile:<10} {metric:<50} {old * 1000:8.1f} ms -> {new * 1000:8.1f} ms")
+            sys.exit(1)
+        print("\nNo regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
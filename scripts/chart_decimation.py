@@ -0,0 +1,136 @@
+"""
+Australian Retirement Planning - Chart Data Decimation
+
+Chooses which rows of a series to draw when there are more rows than a
+chart can usefully show (monthly projections, long horizons). Instead of
+keeping every n-th row, the selection preserves the shape of the series:
+largest-triangle-three-buckets for the main line, per-bucket min/max for
+the others, and the exhaustion point is always kept. Depletion years and
+one-off spending spikes therefore always appear on the chart.
+"""
+
+
+def bucket_bounds(count, buckets, skip_ends=False):
+    """Split row indices into roughly equal [start, end) buckets"""
+    first = 1 if skip_ends else 0
+    last = count - 1 if skip_ends else count
+    span = last - first
+    buckets = max(1, min(buckets, span))
+    size = span / buckets
+    bounds = []
+    for b in range(buckets):
+        start = first + int(b * size)
+        end = first + int((b + 1) * size) if b < buckets - 1 else last
+        if end > start:
+            bounds.append((start, end))
+    return bounds
+
+
+def lttb_indices(xs, ys, threshold):
+    """Largest-triangle-three-buckets: indices of threshold shape-preserving points"""
+    count = len(ys)
+    if threshold >= count or threshold < 3:
+        return list(range(count))
+
+    selected = [0]
+    previous = 0
+    bounds = bucket_bounds(count, threshold - 2, skip_ends=True)
+    for b, (start, end) in enumerate(bounds):
+        # Average point of the next bucket (or the final point)
+        if b + 1 < len(bounds):
+            next_start, next_end = bounds[b + 1]
+        else:
+            next_start, next_end = count - 1, count
+        n = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / n
+        avg_y = sum(ys[next_start:next_end]) / n
+
+        px = xs[previous]
+        py = ys[previous]
+        best = start
+        best_area = -1.0
+        for i in range(start, end):
+            area = abs((px - avg_x) * (ys[i] - py) - (px - xs[i]) * (avg_y - py))
+            if area > best_area:
+                best_area = area
+                best = i
+        selected.append(best)
+        previous = best
+
+    selected.append(count - 1)
+    return selected
+
+
+def minmax_indices(ys, buckets):
+    """Index of the smallest and largest value in each bucket"""
+    selected = set()
+    for start, end in bucket_bounds(len(ys), buckets):
+        low = high = start
+        for i in range(start + 1, end):
+            if ys[i] < ys[low]:
+                low = i
+            if ys[i] > ys[high]:
+                high = i
+        selected.add(low)
+        selected.add(high)
+    return selected
+
+
+def max_indices(ys, buckets):
+    """Index of the largest value in each bucket (one row per bar)"""
+    selected = []
+    for start, end in bucket_bounds(len(ys), buckets):
+        high = start
+        for i in range(start + 1, end):
+            if ys[i] > ys[high]:
+                high = i
+        selected.append(high)
+    return selected
+
+
+def exhaustion_index(balances):
+    """First row where the balance reaches zero (None if it never does)"""
+    for i, balance in enumerate(balances):
+        if balance <= 0:
+            return i
+    return None
+
+
+def decimate_line(columns, max_points, primary='total_balance', secondary=()):
+    """Rows to draw for a line chart.
+
+    The primary series is reduced with LTTB, each secondary series keeps
+    its per-bucket extrema, and the first/last rows, the primary series'
+    global min/max and the exhaustion row are always included.
+    """
+    count = len(columns)
+    if count <= max_points:
+        return list(range(count))
+
+    xs = [float(i) for i in range(count)]
+    ys = getattr(columns, primary)
+    keep = set(lttb_indices(xs, ys, max_points))
+
+    buckets = max(1, max_points // 4)
+    for name in secondary:
+        keep |= minmax_indices(getattr(columns, name), buckets)
+
+    keep.add(min(range(count), key=ys.__getitem__))
+    keep.add(max(range(count), key=ys.__getitem__))
+    exhausted = exhaustion_index(columns.total_balance)
+    if exhausted is not None:
+        keep.add(exhausted)
+    return sorted(keep)
+
+
+def decimate_bars(columns, max_bars, series='spending'):
+    """Rows to draw as bars: the peak row of each bucket, plus the exhaustion row"""
+    count = len(columns)
+    if count <= max_bars:
+        return list(range(count))
+
+    keep = set(max_indices(getattr(columns, series), max_bars))
+    exhausted = exhaustion_index(columns.total_balance)
+    if exhausted is not None:
+        keep.add(exhausted)
+    return sorted(keep)
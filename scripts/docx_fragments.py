@@ -0,0 +1,132 @@
+"""
+Australian Retirement Planning - DOCX Section Fragments
+
+Incremental re-rendering for the Word report. Each create_* section
+declares the payload keys it reads with @depends_on; the body XML it
+appends is cached under a hash of those values (plus the template
+version), so when an adviser edits one input only the sections that read
+it are rebuilt and the rest are spliced back in from their cached
+fragments.
+
+A fragment is the section's body elements wrapped in a <fragment> root.
+Sections that change the document's final w:sectPr (the landscape
+appendix) store the new one as the fragment's last child.
+
+Fragments share the render cache configuration (see render_cache.py): an
+in-process tier, plus REPORT_CACHE_DIR/sections on disk when set.
+"""
+
+import os
+
+from docx.oxml import parse_xml
+from docx.oxml.ns import qn
+from lxml import etree
+
+from render_cache import RenderCache, payload_digest, template_version
+from report_data import report_date
+
+
+# Derived inputs a section can depend on besides payload keys
+REPORT_DATE = '@reportDate'
+
+DERIVED_INPUTS = {
+    REPORT_DATE: lambda data: report_date(data).date().isoformat(),
+}
+
+_SECTPR = qn('w:sectPr')
+
+
+def depends_on(*keys):
+    """Declare the payload keys (or derived inputs) a section reads"""
+    def declare(create):
+        create.dependencies = keys
+        return create
+    return declare
+
+
+def section_key(create, data):
+    """Cache key for one section: its name, template version and inputs"""
+    inputs = {}
+    for key in create.dependencies:
+        if key in DERIVED_INPUTS:
+            inputs[key] = DERIVED_INPUTS[key](data)
+        elif key in data:
+            inputs[key] = data[key]
+    return f'section-{create.__name__}-{template_version()}-{payload_digest(inputs)}'
+
+
+# ========== FRAGMENTS ==========
+
+def _body_end(body):
+    """Index new body content is inserted at (before the final sectPr)"""
+    return len(body) - (1 if body.sectPr is not None else 0)
+
+
+def capture(body, start, sectPr_before):
+    """Serialize the elements a section appended from index start"""
+    parts = [etree.tostring(element) for element in body[start:_body_end(body)]]
+    sectPr = body.sectPr
+    if sectPr is not None:
+        sectPr_xml = etree.tostring(sectPr)
+        if sectPr_xml != sectPr_before:
+            parts.append(sectPr_xml)
+    return b'<fragment>' + b''.join(parts) + b'</fragment>'
+
+
+def splice(doc, fragment):
+    """Append a cached fragment's elements to the document body"""
+    body = doc.element.body
+    for element in list(parse_xml(fragment)):
+        sectPr = body.sectPr
+        if element.tag == _SECTPR:
+            if sectPr is not None:
+                body.replace(sectPr, element)
+            else:
+                body.append(element)
+        elif sectPr is not None:
+            sectPr.addprevious(element)
+        else:
+            body.append(element)
+
+
+# ========== CACHE ==========
+
+_fragment_cache = None
+_fragment_loaded = False
+
+
+def fragment_cache():
+    """Process-wide fragment cache configured like the render cache (None when disabled)"""
+    global _fragment_cache, _fragment_loaded
+    if not _fragment_loaded:
+        cache = RenderCache.from_env()
+        if cache is not None and cache.disk is not None:
+            cache = RenderCache(cache.memory.max_bytes if cache.memory else 0,
+                                os.path.join(cache.disk.directory, 'sections'),
+                                cache.disk.max_bytes)
+        _fragment_cache = cache
+        _fragment_loaded = True
+    return _fragment_cache
+
+
+def render_section(doc, data, create, cache=None):
+    """Run create(doc, data), or splice its cached fragment when its inputs are unchanged.
+
+    Returns True when the section came from the cache.
+    """
+    if cache is None or getattr(create, 'dependencies', None) is None:
+        create(doc, data)
+        return False
+
+    key = section_key(create, data)
+    fragment = cache.get(key)
+    if fragment is not None:
+        splice(doc, fragment)
+        return True
+
+    body = doc.element.body
+    start = _body_end(body)
+    sectPr_before = etree.tostring(body.sectPr) if body.sectPr is not None else None
+    create(doc, data)
+    cache.put(key, capture(body, start, sectPr_before))
+    return False
@@ -0,0 +1,187 @@
+"""
+Australian Retirement Planning - Bulk DOCX Tables
+
+Builds a whole Word table (w:tbl) as one XML string and parses it once,
+instead of creating it through python-docx's per-cell API. Going through
+table.rows[i].cells[j] rebuilds the cell grid on every access, so a
+year-by-year table costs quadratic time; here the cost is one pass over
+the values.
+
+Formatting is given as per-column rules (format, alignment, bold, colour)
+plus an optional row rule for shading. Individual cells can override the
+column rules by passing a Cell instead of a plain value.
+"""
+
+from docx.oxml import parse_xml
+from docx.shared import Emu
+from docx.table import Table
+
+
+DEFAULT_TABLE_STYLE = 'Light Grid Accent 1'
+
+_W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+_ALIGNMENTS = {
+    None: None,
+    'left': 'left',
+    'center': 'center',
+    'right': 'right',
+    'justify': 'both',
+}
+
+_TABLE_LOOK = (
+    '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" '
+    'w:lastRow="0" w:noHBand="0" w:noVBand="1" w:val="04A0"/>'
+)
+
+
+class Cell:
+    """A cell value with formatting that overrides its column's rules"""
+
+    __slots__ = ('value', 'bold', 'color', 'fill', 'align', 'size')
+
+    def __init__(self, value, bold=None, color=None, fill=None, align=None, size=None):
+        self.value = value
+        self.bold = bold
+        self.color = color
+        self.fill = fill
+        self.align = align
+        self.size = size
+
+
+def _per_column(rule, cols, default=None):
+    """Expand a column rule (single value, list or {index: value}) to a list"""
+    if rule is None:
+        return [default] * cols
+    if isinstance(rule, dict):
+        return [rule.get(i, default) for i in range(cols)]
+    if isinstance(rule, (list, tuple)):
+        return list(rule) + [default] * (cols - len(rule))
+    return [rule] * cols
+
+
+def _escape(text):
+    # Same as xml.sax.saxutils.escape, which would pull in urllib/http/email on import
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _run_xml(text, bold, color, size):
+    props = ''
+    if bold:
+        props += '<w:b/>'
+    if color:
+        props += f'<w:color w:val="{color}"/>'
+    if size:
+        props += f'<w:sz w:val="{int(size * 2)}"/>'
+    if props:
+        props = f'<w:rPr>{props}</w:rPr>'
+    # Line breaks inside a value become w:br, as python-docx does for cell.text
+    parts = []
+    for i, line in enumerate(text.split('\n')):
+        if i:
+            parts.append('<w:br/>')
+        if line:
+            parts.append(f'<w:t xml:space="preserve">{_escape(line)}</w:t>')
+    return f'<w:r>{props}{"".join(parts)}</w:r>'
+
+
+def _borders_xml(borders):
+    if not borders:
+        return ''
+    color = borders.get('color', '000000')
+    edges = ''.join(
+        f'<w:{edge} w:val="single" w:sz="{borders[edge]}" w:color="{color}"/>'
+        for edge in ('top', 'left', 'bottom', 'right') if edge in borders
+    )
+    return f'<w:tcBorders>{edges}</w:tcBorders>'
+
+
+def _cell_xml(width, text, bold, color, fill, align, size, borders):
+    props = f'<w:tcW w:type="dxa" w:w="{width}"/>{borders}'
+    if fill:
+        props += f'<w:shd w:fill="{fill}"/>'
+    paragraph = ''
+    jc = _ALIGNMENTS[align]
+    if jc:
+        paragraph += f'<w:pPr><w:jc w:val="{jc}"/></w:pPr>'
+    if text:
+        paragraph += _run_xml(text, bold, color, size)
+    return f'<w:tc><w:tcPr>{props}</w:tcPr><w:p>{paragraph}</w:p></w:tc>'
+
+
+def build_table_xml(rows, cols, width, header=None, formats=None, align=None,
+                    bold=None, color=None, size=None, header_fill=None,
+                    header_color='FFFFFF', header_align=None, row_fill=None,
+                    borders=None, repeat_header=False, style_id=None):
+    """Serialize a table to w:tbl XML in a single pass over the rows"""
+    col_width = width // cols
+    formats = _per_column(formats, cols, str)
+    aligns = _per_column(align, cols)
+    bolds = _per_column(bold, cols, False)
+    colors = _per_column(color, cols)
+    sizes = _per_column(size, cols)
+    border_xml = _borders_xml(borders)
+
+    parts = [f'<w:tbl xmlns:w="{_W_NS}"><w:tblPr>']
+    if style_id:
+        parts.append(f'<w:tblStyle w:val="{style_id}"/>')
+    parts.append('<w:tblW w:type="auto" w:w="0"/>')
+    parts.append(_TABLE_LOOK)
+    parts.append('</w:tblPr><w:tblGrid>')
+    parts.append(f'<w:gridCol w:w="{col_width}"/>' * cols)
+    parts.append('</w:tblGrid>')
+
+    if header:
+        parts.append('<w:tr><w:trPr><w:tblHeader/></w:trPr>' if repeat_header else '<w:tr>')
+        header_aligns = _per_column(header_align, cols)
+        for i in range(cols):
+            text = str(header[i]) if i < len(header) else ''
+            parts.append(_cell_xml(col_width, text, True, header_color, header_fill,
+                                   header_aligns[i], sizes[i], border_xml))
+        parts.append('</w:tr>')
+
+    for r, values in enumerate(rows):
+        fill = row_fill(r, values) if row_fill else None
+        parts.append('<w:tr>')
+        for i in range(cols):
+            value = values[i] if i < len(values) else ''
+            if isinstance(value, Cell):
+                text = '' if value.value is None else formats[i](value.value)
+                parts.append(_cell_xml(
+                    col_width, text,
+                    bolds[i] if value.bold is None else value.bold,
+                    value.color or colors[i],
+                    value.fill or fill,
+                    value.align or aligns[i],
+                    value.size or sizes[i],
+                    border_xml,
+                ))
+            else:
+                text = '' if value is None else formats[i](value)
+                parts.append(_cell_xml(col_width, text, bolds[i], colors[i], fill,
+                                       aligns[i], sizes[i], border_xml))
+        parts.append('</w:tr>')
+
+    parts.append('</w:tbl>')
+    return ''.join(parts)
+
+
+def add_table(doc, rows, cols=None, header=None, style=DEFAULT_TABLE_STYLE, **rules):
+    """Append a fully formatted table to the document body.
+
+    rows is an iterable of row sequences; plain values are rendered with
+    the column's format (str by default), Cell values override the column
+    rules for that cell. Column rules (formats, align, bold, color, size)
+    take a single value, a list, or an {index: value} dict. row_fill is a
+    callable (row_index, values) -> hex fill or None. Returns the
+    python-docx Table for any further tweaks.
+    """
+    rows = rows if isinstance(rows, (list, tuple)) else list(rows)
+    if cols is None:
+        cols = len(header) if header else max((len(row) for row in rows), default=1)
+    style_id = doc.styles[style].style_id if style else None
+    width = Emu(doc._block_width).twips
+    tbl = parse_xml(build_table_xml(rows, cols, width, header=header,
+                                    style_id=style_id, **rules))
+    doc.element.body._insert_tbl(tbl)
+    return Table(tbl, doc._body)
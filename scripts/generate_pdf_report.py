@@ -2,24 +2,43 @@
 Australian Retirement Planning - PDF Report Generator
 
 Generates a comprehensive PDF report suitable for financial advisers.
+
+Usage:
+    generate_pdf_report.py <input_json> <output_pdf>
+    generate_pdf_report.py - -                               (JSON on stdin, PDF on stdout)
+    generate_pdf_report.py <input_npz> <output_pdf>          (columnar payload bundle)
+    generate_pdf_report.py --worker [--socket PATH]          (long-lived worker)
+    generate_pdf_report.py --worker --socket PATH --probe    (health check)
+    generate_pdf_report.py --startup-report [<input> <output>] (import-time budget)
+
+Set REPORT_PROFILE=stderr (or a metrics file path) for per-section timings.
+Set REPORT_PARALLEL=N (or auto) to prepare charts in a process pool.
+Set REPORT_CACHE_DIR to reuse output for repeat payloads (see render_cache.py).
 """
 
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT, TA_JUSTIFY
-from reportlab.lib import colors
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
+    SimpleDocTemplate, Paragraph, Spacer, Table,
     PageBreak, Image, KeepTogether
 )
-from reportlab.graphics.shapes import Drawing
-from reportlab.graphics.charts.linecharts import HorizontalLineChart
-from reportlab.graphics.charts.barcharts import VerticalBarChart
 from reportlab.lib.colors import HexColor
-import json
-from datetime import datetime
+from reportlab.pdfgen.canvas import Canvas
+from array import array
 from io import BytesIO
+from itertools import repeat
+from operator import add, mul, sub, truediv
+import os
+import time
+
+from chart_decimation import decimate_bars, decimate_line
+from render_cache import cached_render
+from report_data import chart_columns, format_label, report_date, report_timestamp, to_number
+from report_payload import load_payload
+from render_profile import RenderProfiler
+from report_styles import get_styles
+from report_summary import (formal_test_passed, formal_tests, outcome_summary, percentile_finals, percentile_paths,
+                            simulation_runs, summarize_chart)
 
 
 def format_currency(value):
@@ -32,41 +51,37 @@ def format_percent(value):
     return f"{value:.1f}%"
 
 
-def create_portfolio_chart(chart_data, width=6*inch, height=3*inch):
+def create_portfolio_chart(chart_data, width=6*inch, height=3*inch, max_points=120):
     """Create portfolio balance chart with multiple series"""
+    # Chart modules are only imported by reports that draw charts
+    from reportlab.graphics.charts.legends import Legend
+    from reportlab.graphics.charts.lineplots import LinePlot
+    from reportlab.graphics.shapes import Drawing
+    
     if not chart_data or len(chart_data) == 0:
         # Return empty drawing if no data
         return Drawing(width, height)
     
     drawing = Drawing(width, height)
     
-    lc = HorizontalLineChart()
+    # Ages are plotted on a numeric axis so decimated rows keep their spacing
+    lc = LinePlot()
     lc.x = 50
     lc.y = 50
     lc.height = height - 100
     lc.width = width - 100
     
-    # Extract data - handle different key names
-    # Sample for clarity
-    step = max(1, len(chart_data) // 20)  # Max 20 points on chart
-    sampled_data = chart_data[::step]
-    
-    ages = []
-    total_balances = []
-    super_balances = []
-    incomes = []
-    
-    for d in sampled_data:
-        # Try different possible key names (including spaced versions)
-        age = d.get('age', 0)
-        total_balance = d.get('Total Balance', d.get('totalBalance', d.get('total_balance', d.get('balance', 0))))
-        super_balance = d.get('Main Super', d.get('mainSuper', d.get('main_super', 0)))
-        income = d.get('Income', d.get('income', d.get('inc', 0)))
-        
-        ages.append(age)
-        total_balances.append(total_balance / 1000)  # In thousands
-        super_balances.append(super_balance / 1000)
-        incomes.append(income / 1000)
+    # Key-name aliases are resolved once by the normalizer
+    columns = chart_columns(chart_data)
+    
+    # Full series up to max_points; beyond that keep a shape-preserving subset
+    # that always includes extrema and the exhaustion year
+    rows = decimate_line(columns, max_points, secondary=('main_super', 'income'))
+    
+    ages = [columns.age[i] if columns.age[i] == columns.age[i] else float(i) for i in rows]
+    total_balances = [columns.total_balance[i] / 1000 for i in rows]  # In thousands
+    super_balances = [columns.main_super[i] / 1000 for i in rows]
+    incomes = [columns.income[i] / 1000 for i in rows]
     
     if not ages or not total_balances:
         # No valid data, return empty chart
@@ -84,24 +99,32 @@ def create_portfolio_chart(chart_data, width=6*inch, height=3*inch):
         min_value = max(0, min_value - 50)  # Subtract $50k from bottom (but not below 0)
         value_range = max_value - min_value
     
-    # Set up data series
-    lc.data = [total_balances, super_balances, incomes]
+    # Set up data series as (age, value) points
+    lc.data = [
+        list(zip(ages, total_balances)),
+        list(zip(ages, super_balances)),
+        list(zip(ages, incomes)),
+    ]
     
-    # Category axis (ages)
-    lc.categoryAxis.categoryNames = [str(age) for age in ages]
-    lc.categoryAxis.labels.angle = 45
-    lc.categoryAxis.labels.fontSize = 7
-    lc.categoryAxis.labels.dy = -5
+    # X axis (ages)
+    age_span = max(ages) - min(ages)
+    lc.xValueAxis.valueMin = min(ages)
+    lc.xValueAxis.valueMax = max(ages) if age_span > 0 else min(ages) + 1
+    lc.xValueAxis.valueStep = 5 if age_span > 10 else 1
+    lc.xValueAxis.labels.angle = 45
+    lc.xValueAxis.labels.fontSize = 7
+    lc.xValueAxis.labels.dy = -5
+    lc.xValueAxis.labelTextFormat = lambda x: f'{int(x)}'
     
     # Value axis (balances in thousands)
-    lc.valueAxis.valueMin = 0
-    lc.valueAxis.valueMax = max_value * 1.1
-    lc.valueAxis.valueStep = max(10, value_range / 5)  # At least $10k steps
-    lc.valueAxis.labels.fontSize = 7
-    lc.valueAxis.labels.fontName = 'Helvetica'
+    lc.yValueAxis.valueMin = 0
+    lc.yValueAxis.valueMax = max_value * 1.1
+    lc.yValueAxis.valueStep = max(10, value_range / 5)  # At least $10k steps
+    lc.yValueAxis.labels.fontSize = 7
+    lc.yValueAxis.labels.fontName = 'Helvetica'
     
     # Format Y-axis labels to show "$XXXk"
-    lc.valueAxis.labelTextFormat = lambda x: f'${int(x)}k'
+    lc.yValueAxis.labelTextFormat = lambda x: f'${int(x)}k'
     
     # Line styles
     lc.lines[0].strokeColor = HexColor('#2563eb')  # Blue - Total Balance
@@ -118,7 +141,6 @@ def create_portfolio_chart(chart_data, width=6*inch, height=3*inch):
     drawing.add(lc)
     
     # Add legend
-    from reportlab.graphics.charts.legends import Legend
     legend = Legend()
     legend.x = width - 150
     legend.y = height - 30
@@ -137,8 +159,11 @@ def create_portfolio_chart(chart_data, width=6*inch, height=3*inch):
     return drawing
 
 
-def create_spending_income_chart(chart_data, width=6*inch, height=3*inch):
+def create_spending_income_chart(chart_data, width=6*inch, height=3*inch, max_bars=15):
     """Create spending vs income chart"""
+    from reportlab.graphics.charts.barcharts import VerticalBarChart
+    from reportlab.graphics.shapes import Drawing
+    
     if not chart_data or len(chart_data) == 0:
         return Drawing(width, height)
     
@@ -150,29 +175,21 @@ def create_spending_income_chart(chart_data, width=6*inch, height=3*inch):
     bc.height = height - 100
     bc.width = width - 100
     
-    # Sample every 5 years or so
-    step = max(1, len(chart_data) // 15)  # Max 15 bars
-    sampled_data = chart_data[::step]
+    columns = chart_columns(chart_data)
     
-    ages = []
-    spending = []
-    income = []
+    # One bar per bucket of years, choosing each bucket's peak spending year
+    # so one-off expense spikes (and the exhaustion year) are never skipped
+    rows = decimate_bars(columns, max_bars)
     
-    for d in sampled_data:
-        age = d.get('age', 0)
-        # Handle spaced property names
-        spend = d.get('Spending', d.get('spending', d.get('spend', 0)))
-        inc = d.get('Income', d.get('income', d.get('inc', 0)))
-        
-        ages.append(age)
-        spending.append(spend / 1000)  # In thousands
-        income.append(inc / 1000)
+    ages = [format_label(columns.age[i]) for i in rows]
+    spending = [columns.spending[i] / 1000 for i in rows]  # In thousands
+    income = [columns.income[i] / 1000 for i in rows]
     
     if not ages:
         return Drawing(width, height)
     
     bc.data = [spending, income]
-    bc.categoryAxis.categoryNames = [str(age) for age in ages]
+    bc.categoryAxis.categoryNames = ages
     bc.categoryAxis.labels.angle = 45
     bc.categoryAxis.labels.fontSize = 8
     
@@ -197,18 +214,243 @@ def create_spending_income_chart(chart_data, width=6*inch, height=3*inch):
     return drawing
 
 
-def generate_pdf_report(data_dict, output_path=None):
+def create_monte_carlo_fan_chart(percentiles, width=6*inch, height=3*inch):
+    """Create fan chart of the p10-p90 Monte Carlo balance bands (None if no paths)"""
+    paths = percentile_paths(percentiles)
+    if paths is None:
+        return None
+    ages, bands = paths
+    
+    from reportlab.graphics.charts.legends import Legend
+    from reportlab.graphics.charts.lineplots import LinePlot
+    from reportlab.graphics.shapes import Drawing, Polygon
+    
+    drawing = Drawing(width, height)
+    
+    plot_x, plot_y = 50, 50
+    plot_width, plot_height = width - 100, height - 100
+    
+    # Ages fall back to year index when the paths don't carry them
+    if any(age != age for age in ages):
+        ages = array('d', range(len(ages)))
+    x_min, x_max = min(ages), max(ages)
+    if x_max <= x_min:
+        x_max = x_min + 1
+    y_max = max(max(bands['p90']), max(bands['p50']), 1) / 1000 * 1.1  # In thousands
+    
+    # Map each band column to drawing coordinates with whole-column map()
+    # passes, then interleave them into polygon outlines by slice assignment
+    x_scale = plot_width / (x_max - x_min)
+    y_scale = plot_height / y_max
+    def scaled(values, low, scale, origin):
+        return array('d', map(add, repeat(origin), map(mul, map(sub, values, repeat(low)), repeat(scale))))
+    
+    xs = scaled(ages, x_min, x_scale, plot_x)
+    ys = {
+        key: scaled(map(truediv, map(max, repeat(0.0), values), repeat(1000)), 0.0, y_scale, plot_y)
+        for key, values in bands.items()
+    }
+    
+    def band_points(lower, upper):
+        # Outline: along the upper band, then back along the lower band
+        n = len(xs)
+        points = array('d', bytes(32 * n))  # 4n doubles
+        points[0:2 * n:2] = xs
+        points[1:2 * n:2] = ys[upper]
+        points[2 * n::2] = xs[::-1]
+        points[2 * n + 1::2] = ys[lower][::-1]
+        return points.tolist()
+    
+    drawing.add(Polygon(band_points('p10', 'p90'), fillColor=HexColor('#bfdbfe'), strokeColor=None))
+    drawing.add(Polygon(band_points('p25', 'p75'), fillColor=HexColor('#60a5fa'), strokeColor=None))
+    
+    # Axes and median line on top of the bands, sharing the same scale
+    lp = LinePlot()
+    lp.x = plot_x
+    lp.y = plot_y
+    lp.width = plot_width
+    lp.height = plot_height
+    lp.data = [list(zip(ages, map(truediv, bands['p50'], repeat(1000))))]
+    lp.lines[0].strokeColor = HexColor('#1e3a8a')
+    lp.lines[0].strokeWidth = 2
+    
+    lp.xValueAxis.valueMin = x_min
+    lp.xValueAxis.valueMax = x_max
+    lp.xValueAxis.valueStep = 5 if x_max - x_min > 10 else 1
+    lp.xValueAxis.labels.fontSize = 7
+    lp.xValueAxis.labelTextFormat = lambda x: f'{int(x)}'
+    
+    lp.yValueAxis.valueMin = 0
+    lp.yValueAxis.valueMax = y_max
+    lp.yValueAxis.valueStep = max(10, y_max / 5)
+    lp.yValueAxis.labels.fontSize = 7
+    lp.yValueAxis.labelTextFormat = lambda x: f'${int(x)}k'
+    drawing.add(lp)
+    
+    legend = Legend()
+    legend.x = plot_x + 10
+    legend.y = height - 5
+    legend.deltay = 10
+    legend.fontSize = 7
+    legend.alignment = 'right'
+    legend.columnMaximum = 3
+    legend.colorNamePairs = [
+        (HexColor('#1e3a8a'), 'Median (50th)'),
+        (HexColor('#60a5fa'), '25th - 75th percentile'),
+        (HexColor('#bfdbfe'), '10th - 90th percentile'),
+    ]
+    drawing.add(legend)
+    
+    return drawing
+
+
+# ========== STORY PREPARATION ==========
+
+class _Deferred:
+    """Serial stand-in for a Future: the job runs when its result is needed"""
+    
+    def __init__(self, fn, args):
+        self.fn = fn
+        self.args = args
+    
+    def result(self):
+        return self.fn(*self.args)
+
+
+def flatten_drawing(node):
+    """Expand chart widgets into plain shapes (the geometry doc.build would compute).
+    
+    The result draws identically but holds no widget objects, so it can be
+    pickled back from a pool worker.
+    """
+    from reportlab.graphics.shapes import Group, UserNode
+    
+    while isinstance(node, UserNode):
+        node = node.provideNode()
+    if isinstance(node, Group):
+        node.contents = [flatten_drawing(child) for child in node.contents]
+    return node
+
+
+def _prepared_chart(builder, *args):
+    return flatten_drawing(builder(*args))
+
+
+def prepare(executor, fn, *args):
+    """Schedule fn(*args) on the story executor (or defer it when there is none)"""
+    if executor is None:
+        return _Deferred(fn, args)
+    return executor.submit(fn, *args)
+
+
+def prepare_chart(executor, builder, *args):
+    """Schedule a chart; pool workers return it with its geometry already computed"""
+    if executor is None:
+        return _Deferred(builder, args)
+    return executor.submit(_prepared_chart, builder, *args)
+
+
+_story_executor = None
+
+
+def story_executor():
+    """Process pool for story preparation, sized by REPORT_PARALLEL (None when unset).
+    
+    REPORT_PARALLEL=N uses N worker processes, REPORT_PARALLEL=auto one per
+    CPU. The pool is created once and reused by later reports.
+    """
+    global _story_executor
+    if _story_executor is None:
+        setting = os.environ.get('REPORT_PARALLEL', '').strip().lower()
+        if setting == 'auto':
+            workers = os.cpu_count() or 1
+        else:
+            try:
+                workers = int(setting or 0)
+            except ValueError:
+                workers = 0
+        if workers < 1:
+            return None
+        
+        # Only reports that opt in pay for importing multiprocessing
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        
+        # Render pool workers are daemonic and cannot start children;
+        # the pool already runs jobs in parallel across them
+        if multiprocessing.current_process().daemon:
+            return None
+        methods = multiprocessing.get_all_start_methods()
+        # Forked workers inherit the imported ReportLab modules
+        context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+        _story_executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    return _story_executor
+
+
+def pinned_canvas(timestamp):
+    """Canvas class whose creation date and document ID derive from timestamp.
+
+    ReportLab otherwise stamps the current time and seeds the /ID from it,
+    so two renders of the same report would never be byte-identical.
+    """
+    class PinnedCanvas(Canvas):
+        def __init__(self, *args, **kwargs):
+            kwargs['invariant'] = 1
+            super().__init__(*args, **kwargs)
+            stamp = self._doc._timeStamp
+            stamp.t = timestamp
+            stamp.lt = time.gmtime(timestamp)
+            stamp.YMDhms = tuple(stamp.lt)[:6]
+            self._doc.signature.update(str(timestamp).encode())
+    
+    return PinnedCanvas
+
+
+def generate_pdf_report(data_dict, output_path=None, theme=None, profiler=None, executor=None):
     """
     Generate comprehensive retirement planning PDF report
     
     Args:
         data_dict: Dictionary containing retirement planning data
         output_path: Path to save PDF (if None, returns BytesIO)
+        theme: Registered style theme (see report_styles.register_theme)
+        profiler: Optional RenderProfiler (defaults to REPORT_PROFILE env)
+        executor: Optional executor that prepares charts and formal test
+            summaries in parallel (defaults to REPORT_PARALLEL env)
     
     Returns:
         BytesIO object or None (if output_path provided)
     """
     
+    # Per-section timings are only collected when profiling is enabled
+    if profiler is None:
+        profiler = RenderProfiler.from_env('pdf')
+    try:
+        return _build_pdf_report(data_dict, output_path, theme, profiler, executor)
+    except Exception as e:
+        # A failed render still reports where it failed (and stops tracemalloc)
+        profiler.fail(e)
+        raise
+
+
+def _build_pdf_report(data_dict, output_path, theme, profiler, executor):
+    
+    # Server-side simulations need NumPy, so they are only imported on request
+    if data_dict.get('serverMonteCarlo'):
+        from monte_carlo import with_server_monte_carlo
+        profiler.checkpoint('server_monte_carlo')
+        data_dict = with_server_monte_carlo(data_dict)
+    if data_dict.get('serverHistoricalMonteCarlo'):
+        from historical_backtest import with_server_historical
+        profiler.checkpoint('server_historical')
+        data_dict = with_server_historical(data_dict)
+    if data_dict.get('formalTestDefinitions'):
+        from stress_tests import with_server_formal_tests
+        profiler.checkpoint('server_formal_tests')
+        data_dict = with_server_formal_tests(data_dict)
+    
+    profiler.checkpoint('setup')
+    
     # Create PDF document
     if output_path:
         doc = SimpleDocTemplate(output_path, pagesize=letter,
@@ -221,46 +463,17 @@ def generate_pdf_report(data_dict, output_path=None):
     # Container for the 'Flowable' objects
     story = []
     
-    # Define styles
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=HexColor('#1f2937'),
-        spaceAfter=30,
-        alignment=TA_CENTER,
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        textColor=HexColor('#2563eb'),
-        spaceAfter=12,
-        spaceBefore=12,
-    )
-    
-    subheading_style = ParagraphStyle(
-        'CustomSubHeading',
-        parent=styles['Heading3'],
-        fontSize=12,
-        textColor=HexColor('#4b5563'),
-        spaceAfter=6,
-    )
-    
-    body_style = ParagraphStyle(
-        'CustomBody',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=HexColor('#374151'),
-        alignment=TA_JUSTIFY,
-    )
+    # Shared styles (built once per process, see report_styles)
+    styles = get_styles(theme)
+    title_style = styles.title
+    heading_style = styles.heading
+    subheading_style = styles.subheading
+    body_style = styles.body
     
     # ========== PAGE 1: COVER PAGE ==========
     
+    profiler.checkpoint('page1_cover', story)
+    
     story.append(Spacer(1, 1.5*inch))
     
     story.append(Paragraph("Australian Retirement Planning Report", title_style))
@@ -268,23 +481,13 @@ def generate_pdf_report(data_dict, output_path=None):
     
     # Client info box
     client_data = [
-        ['Report Generated:', datetime.now().strftime('%d %B %Y')],
+        ['Report Generated:', report_date(data_dict).strftime('%d %B %Y')],
         ['Planning Horizon:', f"Age {data_dict.get('currentAge', 'N/A')} to 100"],
         ['Retirement Age:', str(data_dict.get('retirementAge', 'N/A'))],
     ]
     
     client_table = Table(client_data, colWidths=[2*inch, 3*inch])
-    client_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), HexColor('#f3f4f6')),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('TOPPADDING', (0, 0), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-    ]))
+    client_table.setStyle(styles.table('client'))
     story.append(client_table)
     
     story.append(Spacer(1, 0.5*inch))
@@ -303,36 +506,34 @@ def generate_pdf_report(data_dict, output_path=None):
     
     # ========== PAGE 2: EXECUTIVE SUMMARY ==========
     
+    profiler.checkpoint('page2_executive_summary', story)
+    
     story.append(Paragraph("Executive Summary", heading_style))
     story.append(Spacer(1, 12))
     
-    # Calculate summary statistics
-    chart_data = data_dict.get('chartData', [])
+    # Calculate summary statistics (chartData is normalized once, here)
+    chart_data = chart_columns(data_dict.get('chartData', []))
+    
+    # Independent charts are scheduled up front so a pool can compute their
+    # geometry while the rest of the story is assembled
+    if executor is None:
+        executor = story_executor()
+    charts = {}
     if chart_data:
-        final_data = chart_data[-1]
-        # Handle spaced property names
-        final_balance = final_data.get('Total Balance', final_data.get('totalBalance', final_data.get('total_balance', final_data.get('balance', 0))))
-        final_age = final_data.get('age', 100)
-        
-        # Find exhaustion age
-        exhaustion_age = None
-        for d in chart_data:
-            balance = d.get('Total Balance', d.get('totalBalance', d.get('total_balance', d.get('balance', 0))))
-            if balance <= 0:
-                exhaustion_age = d.get('age')
-                break
-        
-        # Calculate totals
-        retirement_data = [d for d in chart_data if d.get('age', 0) >= data_dict.get('retirementAge', 60)]
-        
-        # Handle spaced property names for spending and income
-        total_spending = sum(d.get('Spending', d.get('spending', d.get('spend', 0))) for d in retirement_data)
-        total_income = sum(d.get('Income', d.get('income', d.get('inc', 0))) for d in retirement_data)
-        avg_spending = total_spending / len(retirement_data) if retirement_data else 0
-        
-        # For age pension and withdrawals, we'll estimate or use 0 since they're not in chartData
-        total_age_pension = 0  # Not in chartData
-        total_withdrawn = total_spending - total_income  # Approximate
+        charts['portfolio'] = prepare_chart(executor, create_portfolio_chart, chart_data)
+        charts['spending_income'] = prepare_chart(executor, create_spending_income_chart, chart_data)
+    # Page 5 shows the historical results when present, else the simulated ones
+    for key in ('historicalMonteCarloResults', 'monteCarloResults'):
+        results = data_dict.get(key)
+        if results and results.get('successRate') is not None:
+            charts[key] = prepare_chart(executor, create_monte_carlo_fan_chart, results.get('percentiles', {}))
+            break
+    if chart_data:
+        # One pass gives final balance, exhaustion age and retirement totals
+        # (age pension isn't in chartData, so withdrawals are approximate)
+        chart_summary = summarize_chart(chart_data, data_dict.get('retirementAge', 60))
+        final_balance = chart_summary.final_balance
+        exhaustion_age = chart_summary.exhaustion_age
         
         # Summary data
         summary_data = [
@@ -340,27 +541,15 @@ def generate_pdf_report(data_dict, output_path=None):
             ['Final Balance (Age 100)', format_currency(final_balance)],
             ['Portfolio Outcome', 'Success - Lasts to Age 100' if final_balance > 0 else f'Depletes at Age {exhaustion_age}'],
             ['', ''],
-            ['Average Annual Spending', format_currency(avg_spending)],
-            ['Total Income Received', format_currency(total_income)],
-            ['Net Portfolio Withdrawals', format_currency(max(0, total_withdrawn))],
+            ['Average Annual Spending', format_currency(chart_summary.avg_spending)],
+            ['Total Income Received', format_currency(chart_summary.total_income)],
+            ['Net Portfolio Withdrawals', format_currency(chart_summary.net_withdrawals)],
         ]
     else:
         summary_data = [['No projection data available', '']]
     
     summary_table = Table(summary_data, colWidths=[3*inch, 2.5*inch])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), HexColor('#2563eb')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('TOPPADDING', (0, 0), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('BACKGROUND', (0, 1), (-1, -1), HexColor('#f9fafb')),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-    ]))
+    summary_table.setStyle(styles.table('summary'))
     story.append(summary_table)
     
     story.append(Spacer(1, 24))
@@ -382,6 +571,8 @@ def generate_pdf_report(data_dict, output_path=None):
     
     # ========== PAGE 3: ASSUMPTIONS ==========
     
+    profiler.checkpoint('page3_assumptions', story)
+    
     story.append(Paragraph("Planning Assumptions", heading_style))
     story.append(Spacer(1, 12))
     
@@ -400,16 +591,7 @@ def generate_pdf_report(data_dict, output_path=None):
     ]
     
     portfolio_table = Table(portfolio_data, colWidths=[3*inch, 2.5*inch])
-    portfolio_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), HexColor('#f9fafb')),
-        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-    ]))
+    portfolio_table.setStyle(styles.table('details'))
     story.append(portfolio_table)
     
     story.append(Spacer(1, 24))
@@ -439,22 +621,15 @@ def generate_pdf_report(data_dict, output_path=None):
     ]
     
     economic_table = Table(economic_data, colWidths=[3*inch, 2.5*inch])
-    economic_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), HexColor('#f9fafb')),
-        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-    ]))
+    economic_table.setStyle(styles.table('details'))
     story.append(economic_table)
     
     story.append(PageBreak())
     
     # ========== PAGE 4: CHARTS ==========
     
+    profiler.checkpoint('page4_charts', story)
+    
     story.append(Paragraph("Portfolio Projection", heading_style))
     story.append(Spacer(1, 12))
     
@@ -462,13 +637,13 @@ def generate_pdf_report(data_dict, output_path=None):
         # Portfolio balance chart
         story.append(Paragraph("Portfolio Balance Over Time", subheading_style))
         story.append(Spacer(1, 6))
-        story.append(create_portfolio_chart(chart_data))
+        story.append(charts['portfolio'].result())
         story.append(Spacer(1, 24))
         
         # Spending vs income chart
         story.append(Paragraph("Annual Spending vs Income", subheading_style))
         story.append(Spacer(1, 6))
-        story.append(create_spending_income_chart(chart_data))
+        story.append(charts['spending_income'].result())
     else:
         story.append(Paragraph("No projection data available", body_style))
     
@@ -476,6 +651,8 @@ def generate_pdf_report(data_dict, output_path=None):
     
     # ========== PAGE 5: MONTE CARLO RESULTS (IF AVAILABLE) ==========
     
+    profiler.checkpoint('page5_monte_carlo', story)
+    
     monte_carlo = data_dict.get('monteCarloResults')
     historical_mc = data_dict.get('historicalMonteCarloResults')
     
@@ -487,44 +664,42 @@ def generate_pdf_report(data_dict, output_path=None):
             story.append(Paragraph("Historical Monte Carlo Analysis", subheading_style))
             
             success_rate = historical_mc.get('successRate', 0)
-            percentiles = historical_mc.get('percentiles', {})
             
-            # Percentiles might be numbers or objects, handle both
-            def get_percentile_value(p_data):
-                if isinstance(p_data, dict):
-                    return p_data.get('finalBalance', 0)
-                elif isinstance(p_data, (int, float)):
-                    return p_data
-                return 0
+            # Percentiles may be numbers, objects or full YearlyData[] paths
+            finals = percentile_finals(historical_mc.get('percentiles', {}))
+            
+            # Backtests measure success over their horizon (35-year blocks), not to age 100
+            horizon = int(to_number(historical_mc.get('horizon')))
+            if horizon > 0:
+                success_label = f'Success Rate (portfolio lasts {horizon} years)'
+                balance_label = f'Portfolio Balance after {horizon} Years:'
+            else:
+                success_label = 'Success Rate (portfolio lasts to age 100)'
+                balance_label = 'Portfolio Balance at Age 100:'
             
             mc_data = [
-                ['Success Rate (portfolio lasts to age 100)', f"{success_rate:.1f}%"],
+                [success_label, f"{success_rate:.1f}%"],
                 ['', ''],
-                ['Portfolio Balance at Age 100:', ''],
-                ['10th Percentile (worst case)', format_currency(get_percentile_value(percentiles.get('p10', 0)))],
-                ['25th Percentile', format_currency(get_percentile_value(percentiles.get('p25', 0)))],
-                ['50th Percentile (median)', format_currency(get_percentile_value(percentiles.get('p50', 0)))],
-                ['75th Percentile', format_currency(get_percentile_value(percentiles.get('p75', 0)))],
-                ['90th Percentile (best case)', format_currency(get_percentile_value(percentiles.get('p90', 0)))],
+                [balance_label, ''],
+                ['10th Percentile (worst case)', format_currency(finals['p10'])],
+                ['25th Percentile', format_currency(finals['p25'])],
+                ['50th Percentile (median)', format_currency(finals['p50'])],
+                ['75th Percentile', format_currency(finals['p75'])],
+                ['90th Percentile (best case)', format_currency(finals['p90'])],
             ]
             
             mc_table = Table(mc_data, colWidths=[4*inch, 2*inch])
-            mc_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), HexColor('#10b981')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('BACKGROUND', (0, 2), (-1, 2), HexColor('#e5e7eb')),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTNAME', (0, 2), (-1, 2), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                ('TOPPADDING', (0, 0), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                ('BACKGROUND', (0, 1), (-1, -1), HexColor('#f9fafb')),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ]))
+            mc_table.setStyle(styles.table('historical_mc'))
             story.append(mc_table)
             story.append(Spacer(1, 12))
             
+            # Fan chart when the full percentile paths were supplied
+            fan_chart = charts['historicalMonteCarloResults'].result()
+            if fan_chart is not None:
+                story.append(Paragraph("Range of Portfolio Outcomes", subheading_style))
+                story.append(fan_chart)
+                story.append(Spacer(1, 12))
+            
             # Interpretation
             if success_rate >= 90:
                 interpretation = f"With a {success_rate:.1f}% success rate, your retirement plan shows strong resilience across various market scenarios based on historical data."
@@ -540,44 +715,33 @@ def generate_pdf_report(data_dict, output_path=None):
             story.append(Paragraph("Monte Carlo Simulation Analysis", subheading_style))
             
             success_rate = monte_carlo.get('successRate', 0)
-            percentiles = monte_carlo.get('percentiles', {})
             
-            # Percentiles might be numbers or objects, handle both
-            def get_percentile_value(p_data):
-                if isinstance(p_data, dict):
-                    return p_data.get('finalBalance', 0)
-                elif isinstance(p_data, (int, float)):
-                    return p_data
-                return 0
+            # Percentiles may be numbers, objects or full YearlyData[] paths
+            finals = percentile_finals(monte_carlo.get('percentiles', {}))
             
             mc_data = [
                 ['Success Rate (portfolio lasts to age 100)', f"{success_rate:.1f}%"],
                 ['', ''],
                 ['Portfolio Balance at Age 100:', ''],
-                ['10th Percentile (worst case)', format_currency(get_percentile_value(percentiles.get('p10', 0)))],
-                ['25th Percentile', format_currency(get_percentile_value(percentiles.get('p25', 0)))],
-                ['50th Percentile (median)', format_currency(get_percentile_value(percentiles.get('p50', 0)))],
-                ['75th Percentile', format_currency(get_percentile_value(percentiles.get('p75', 0)))],
-                ['90th Percentile (best case)', format_currency(get_percentile_value(percentiles.get('p90', 0)))],
+                ['10th Percentile (worst case)', format_currency(finals['p10'])],
+                ['25th Percentile', format_currency(finals['p25'])],
+                ['50th Percentile (median)', format_currency(finals['p50'])],
+                ['75th Percentile', format_currency(finals['p75'])],
+                ['90th Percentile (best case)', format_currency(finals['p90'])],
             ]
             
             mc_table = Table(mc_data, colWidths=[4*inch, 2*inch])
-            mc_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), HexColor('#3b82f6')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('BACKGROUND', (0, 2), (-1, 2), HexColor('#e5e7eb')),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTNAME', (0, 2), (-1, 2), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                ('TOPPADDING', (0, 0), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                ('BACKGROUND', (0, 1), (-1, -1), HexColor('#f9fafb')),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ]))
+            mc_table.setStyle(styles.table('monte_carlo'))
             story.append(mc_table)
             story.append(Spacer(1, 12))
             
+            # Fan chart when the full percentile paths were supplied
+            fan_chart = charts['monteCarloResults'].result()
+            if fan_chart is not None:
+                story.append(Paragraph("Range of Portfolio Outcomes", subheading_style))
+                story.append(fan_chart)
+                story.append(Spacer(1, 12))
+            
             # Interpretation
             if success_rate >= 90:
                 interpretation = f"With a {success_rate:.1f}% success rate, your retirement plan shows strong resilience across various market scenarios."
@@ -585,6 +749,7 @@ def generate_pdf_report(data_dict, output_path=None):
                 interpretation = f"With a {success_rate:.1f}% success rate, your retirement plan has a good probability of success."
             else:
                 interpretation = f"With a {success_rate:.1f}% success rate, consider adjusting your retirement strategy."
+            interpretation += f" Based on {simulation_runs(monte_carlo, data_dict):,} simulated scenarios."
             
             story.append(Paragraph(interpretation, body_style))
         
@@ -592,8 +757,10 @@ def generate_pdf_report(data_dict, output_path=None):
     
     # ========== PAGE 6: FORMAL TEST RESULTS (IF AVAILABLE) ==========
     
-    formal_tests = data_dict.get('formalTestResults', {})
-    if formal_tests:
+    profiler.checkpoint('page6_formal_tests', story)
+    
+    tests = formal_tests(data_dict)
+    if tests:
         story.append(Paragraph("Formal Test Scenarios", heading_style))
         story.append(Spacer(1, 12))
         
@@ -603,54 +770,47 @@ def generate_pdf_report(data_dict, output_path=None):
         ))
         story.append(Spacer(1, 12))
         
-        for test_key, test_data in formal_tests.items():
-            if not isinstance(test_data, dict):
-                continue
-                
+        # Outcome summaries are independent per test; reduced outcomes need no pass
+        summaries = {
+            test_key: prepare(executor, summarize_chart, test_data['simulationData'])
+            for test_key, test_data in tests if test_data.get('simulationData')
+        }
+        summaries.update({
+            test_key: _Deferred(outcome_summary, (test_data,))
+            for test_key, test_data in tests
+            if test_key not in summaries and test_data.get('finalBalance') is not None
+        })
+        
+        for test_key, test_data in tests:
             test_name = test_data.get('name', test_key)
             test_desc = test_data.get('desc', 'No description available')
-            test_sim_data = test_data.get('simulationData', [])
-            
             story.append(Paragraph(test_name, subheading_style))
             story.append(Paragraph(test_desc, body_style))
             story.append(Spacer(1, 6))
             
-            # Calculate outcome for this test
-            if test_sim_data:
-                final_balance = test_sim_data[-1].get('totalBalance', 0)
-                min_balance = min(d.get('totalBalance', 0) for d in test_sim_data)
+            # Outcome for this test (final, lowest and depletion balances)
+            if test_key in summaries:
+                test_summary = summaries[test_key].result()
                 
-                if final_balance > 0:
-                    outcome = f"PASS - Portfolio survives with {format_currency(final_balance)} remaining"
+                if formal_test_passed(test_data, test_summary):
+                    outcome = f"PASS - Portfolio survives with {format_currency(test_summary.final_balance)} remaining"
                     outcome_color = HexColor('#10b981')  # Green
+                elif test_summary.exhaustion_age is not None:
+                    outcome = f"FAIL - Portfolio depletes at age {test_summary.exhaustion_age}"
+                    outcome_color = HexColor('#ef4444')  # Red
                 else:
-                    # Find depletion age
-                    depletion_age = None
-                    for d in test_sim_data:
-                        if d.get('totalBalance', 0) <= 0:
-                            depletion_age = d.get('age')
-                            break
-                    outcome = f"FAIL - Portfolio depletes at age {depletion_age}"
+                    outcome = "FAIL - Portfolio does not last the test period"
                     outcome_color = HexColor('#ef4444')  # Red
                 
-                lowest_point = f"Lowest balance: {format_currency(min_balance)}"
-                
-                outcome_data = [
-                    ['Test Outcome', outcome],
-                    ['', lowest_point],
-                ]
+                outcome_data = [['Test Outcome', outcome]]
+                if test_summary.min_balance is not None:
+                    lowest = f"Lowest balance: {format_currency(test_summary.min_balance)}"
+                    if test_summary.min_balance_age:
+                        lowest += f" (age {test_summary.min_balance_age})"
+                    outcome_data.append(['', lowest])
                 
                 outcome_table = Table(outcome_data, colWidths=[1.5*inch, 4*inch])
-                outcome_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (0, -1), HexColor('#f3f4f6')),
-                    ('TEXTCOLOR', (1, 0), (1, 0), outcome_color),
-                    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                    ('FONTNAME', (1, 0), (1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 9),
-                    ('TOPPADDING', (0, 0), (-1, -1), 4),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ]))
+                outcome_table.setStyle(styles.table('outcome', ('TEXTCOLOR', (1, 0), (1, 0), outcome_color)))
                 story.append(outcome_table)
             
             story.append(Spacer(1, 12))
@@ -659,6 +819,8 @@ def generate_pdf_report(data_dict, output_path=None):
     
     # ========== PAGE 7: YEAR-BY-YEAR DETAILS (SAMPLE) ==========
     
+    profiler.checkpoint('page7_year_by_year', story)
+    
     story.append(Paragraph("Year-by-Year Projection (Every 5 Years)", heading_style))
     story.append(Spacer(1, 12))
     
@@ -668,33 +830,21 @@ def generate_pdf_report(data_dict, output_path=None):
         
         sample_data = [['Age', 'Portfolio', 'Spending', 'Income', 'Main Super', 'Buffer']]
         
-        for i, d in enumerate(chart_data):
+        last_index = len(chart_data) - 1
+        for i in range(len(chart_data)):
             # Show at specified interval OR always show the last year
-            if i % year_interval == 0 or i == len(chart_data) - 1:
-                # Handle spaced property names
+            if i % year_interval == 0 or i == last_index:
                 sample_data.append([
-                    str(d.get('age', '')),
-                    format_currency(d.get('Total Balance', d.get('totalBalance', d.get('total_balance', d.get('balance', 0))))),
-                    format_currency(d.get('Spending', d.get('spending', d.get('spend', 0)))),
-                    format_currency(d.get('Income', d.get('income', d.get('inc', 0)))),
-                    format_currency(d.get('Main Super', d.get('mainSuper', d.get('main_super', 0)))),
-                    format_currency(d.get('Buffer', d.get('buffer', d.get('seqBuffer', 0)))),
+                    format_label(chart_data.age[i]),
+                    format_currency(chart_data.total_balance[i]),
+                    format_currency(chart_data.spending[i]),
+                    format_currency(chart_data.income[i]),
+                    format_currency(chart_data.main_super[i]),
+                    format_currency(chart_data.buffer[i]),
                 ])
         
         detail_table = Table(sample_data, colWidths=[0.6*inch, 1.3*inch, 1.3*inch, 1.3*inch, 1.3*inch, 1.3*inch])
-        detail_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#2563eb')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-            ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 4),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-            ('BACKGROUND', (0, 1), (-1, -1), HexColor('#f9fafb')),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [HexColor('#ffffff'), HexColor('#f9fafb')]),
-        ]))
+        detail_table.setStyle(styles.table('detail'))
         story.append(detail_table)
     else:
         story.append(Paragraph("No projection data available", body_style))
@@ -712,6 +862,8 @@ def generate_pdf_report(data_dict, output_path=None):
     
     # ========== ONE-OFF EXPENSES (IF ANY) ==========
     
+    profiler.checkpoint('one_off_expenses', story)
+    
     one_off_expenses = data_dict.get('oneOffExpenses', [])
     if one_off_expenses and len(one_off_expenses) > 0:
         story.append(Paragraph("Planned One-Off Expenses", heading_style))
@@ -730,26 +882,15 @@ def generate_pdf_report(data_dict, output_path=None):
         expense_data.append(['', 'TOTAL', format_currency(total_expenses)])
         
         expense_table = Table(expense_data, colWidths=[0.8*inch, 3.5*inch, 1.5*inch])
-        expense_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#2563eb')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-            ('ALIGN', (2, 0), (2, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ('BACKGROUND', (0, 1), (-1, -2), HexColor('#f9fafb')),
-            ('BACKGROUND', (0, -1), (-1, -1), HexColor('#dbeafe')),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ]))
+        expense_table.setStyle(styles.table('expense'))
         story.append(expense_table)
         
         story.append(PageBreak())
     
     # ========== FINAL PAGE: NOTES AND RECOMMENDATIONS ==========
     
+    profiler.checkpoint('final_notes', story)
+    
     story.append(Paragraph("Important Considerations", heading_style))
     story.append(Spacer(1, 12))
     
@@ -786,7 +927,14 @@ def generate_pdf_report(data_dict, output_path=None):
     story.append(footer)
     
     # Build PDF
-    doc.build(story)
+    profiler.checkpoint('doc_build')
+    flowable_count = len(story)  # doc.build consumes the story
+    timestamp = report_timestamp(data_dict)
+    if timestamp is None:
+        doc.build(story)
+    else:
+        doc.build(story, canvasmaker=pinned_canvas(timestamp))
+    profiler.finish(flowables=flowable_count)
     
     if output_path:
         return None
@@ -795,22 +943,42 @@ def generate_pdf_report(data_dict, output_path=None):
         return buffer
 
 
+def render_pdf_bytes(data_dict):
+    """Render a report straight to PDF bytes, reusing cached bytes for repeat payloads"""
+    return cached_render('pdf', data_dict, lambda data: generate_pdf_report(data).getvalue())
+
+
 # Command-line usage
 if __name__ == "__main__":
     import sys
     
-    if len(sys.argv) == 3:
-        # Called from API route with input and output paths
+    if len(sys.argv) >= 2 and sys.argv[1] == '--startup-report':
+        # Import-time budget check (see startup_report.py)
+        from startup_report import main as startup_report
+        sys.exit(startup_report('pdf', __file__, sys.argv[2:]))
+    elif len(sys.argv) >= 2 and sys.argv[1] == '--worker':
+        # Long-lived worker: ReportLab is imported once, then many jobs are
+        # served over stdin/stdout (or --socket PATH) using render_protocol
+        from render_protocol import run_worker
+        run_worker(sys.argv[2:], {'pdf': render_pdf_bytes}, name='pdf')
+    elif len(sys.argv) == 3:
+        # Called from API route with input and output paths ('-' = stdin/stdout)
         input_json_path = sys.argv[1]
         output_pdf_path = sys.argv[2]
         
-        # Read JSON data
-        with open(input_json_path, 'r') as f:
-            data = json.load(f)
+        # Read JSON data (or a columnar payload bundle)
+        data = load_payload(input_json_path)
         
         # Generate PDF
-        generate_pdf_report(data, output_pdf_path)
-        print(f"PDF report generated: {output_pdf_path}")
+        if output_pdf_path == '-':
+            # Stream the finished PDF to stdout without touching disk
+            sys.stdout.buffer.write(render_pdf_bytes(data))
+            sys.stdout.buffer.flush()
+            print("PDF report generated: <stdout>", file=sys.stderr)
+        else:
+            with open(output_pdf_path, 'wb') as f:
+                f.write(render_pdf_bytes(data))
+            print(f"PDF report generated: {output_pdf_path}")
     else:
         # Sample data for testing
         sample_data = {
@@ -2,18 +2,38 @@
 """
 Comprehensive Retirement Planning Word Document Generator
 Generates professional, editable retirement reports with all features.
+
+Input may be JSON or a columnar payload bundle (see report_payload.py).
+Set REPORT_PROFILE=stderr (or a metrics file path) for per-section timings.
+Set REPORT_CACHE_DIR to reuse output for repeat payloads (see render_cache.py);
+unchanged sections are reused from cached fragments (see docx_fragments.py).
 """
 
-import json
 import sys
-from datetime import datetime
+import time
+import zipfile
+from datetime import datetime, timezone
+from io import BytesIO
 from docx import Document
 from docx.shared import Pt, RGBColor, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.enum.style import WD_STYLE_TYPE
+from docx.enum.section import WD_ORIENT, WD_SECTION
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 
+from docx_fragments import REPORT_DATE, depends_on, fragment_cache, render_section
+from docx_tables import Cell, add_table
+from render_cache import cached_render
+from render_profile import RenderProfiler
+from report_data import chart_columns, format_label, report_date, report_timestamp
+from report_payload import load_payload
+from report_summary import (PERCENTILE_KEYS, percentile_final_balance, percentile_paths, plan_metrics,
+                            simulation_runs)
+
+# Earliest date a zip member can carry
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
 def format_currency(amount):
     """Format currency in Australian style"""
     return f"${amount:,.0f}"
@@ -51,6 +71,7 @@ def set_cell_border(cell, **kwargs):
             tcBorders.append(edge_elm)
     tcPr.append(tcBorders)
 
+@depends_on('pensionRecipientType', 'currentAge', 'retirementAge', REPORT_DATE)
 def create_cover_page(doc, data):
     """Create professional cover page"""
     
@@ -82,7 +103,7 @@ def create_cover_page(doc, data):
         ('Prepared For:', data.get('pensionRecipientType', 'single').title() + ' Retiree'),
         ('Current Age:', str(data.get('currentAge', 'N/A'))),
         ('Retirement Age:', str(data.get('retirementAge', 'N/A'))),
-        ('Report Date:', datetime.now().strftime('%d %B %Y')),
+        ('Report Date:', report_date(data).strftime('%d %B %Y')),
     ]
     
     for i, (label, value) in enumerate(info):
@@ -113,7 +134,8 @@ def create_cover_page(doc, data):
     
     doc.add_page_break()
 
-def create_table_of_contents(doc):
+@depends_on()
+def create_table_of_contents(doc, data=None):
     """Create table of contents"""
     
     heading = doc.add_heading("Table of Contents", level=1)
@@ -126,6 +148,7 @@ def create_table_of_contents(doc):
         ("4. Risk Analysis", "Monte Carlo results and stress testing"),
         ("5. Recommendations", "Actionable insights for your plan"),
         ("6. Scenario Details", "Detailed breakdowns and assumptions"),
+        ("Appendix A. Year-by-Year Projections", "Every projected year, with Monte Carlo percentiles"),
     ]
     
     for title, desc in toc_items:
@@ -141,6 +164,8 @@ def create_table_of_contents(doc):
     
     doc.add_page_break()
 
+@depends_on('mainSuperBalance', 'sequencingBuffer', 'baseSpending', 'totalPensionIncome',
+            'monteCarloResults', 'historicalMonteCarloResults', 'monteCarloRuns')
 def create_executive_summary(doc, data):
     """Create executive summary section"""
     
@@ -148,10 +173,11 @@ def create_executive_summary(doc, data):
     heading.runs[0].font.color.rgb = RGBColor(30, 58, 138)
     
     # Calculate key metrics
-    portfolio_total = data.get('mainSuperBalance', 0) + data.get('sequencingBuffer', 0)
-    annual_spending = data.get('baseSpending', 0)
-    pension_income = data.get('totalPensionIncome', 0)
-    net_drawdown = annual_spending - pension_income
+    metrics = plan_metrics(data)
+    portfolio_total = metrics['portfolio_total']
+    annual_spending = metrics['annual_spending']
+    pension_income = metrics['pension_income']
+    net_drawdown = metrics['net_drawdown']
     
     # Success/Fail Status
     mc_results = data.get('monteCarloResults') or data.get('historicalMonteCarloResults')
@@ -175,7 +201,7 @@ def create_executive_summary(doc, data):
     table = doc.add_table(rows=5 if mc_results else 4, cols=2)
     table.style = 'Light Grid Accent 1'
     
-    metrics = [
+    key_metrics = [
         ('Total Portfolio', format_currency(portfolio_total)),
         ('Annual Spending', format_currency(annual_spending)),
         ('Pension Income', format_currency(pension_income)),
@@ -183,9 +209,9 @@ def create_executive_summary(doc, data):
     ]
     
     if mc_results:
-        metrics.append(('Monte Carlo Success Rate', f"{success_rate:.1f}%"))
+        key_metrics.append(('Monte Carlo Success Rate', f"{success_rate:.1f}%"))
     
-    for i, (label, value) in enumerate(metrics):
+    for i, (label, value) in enumerate(key_metrics):
         table.rows[i].cells[0].text = label
         table.rows[i].cells[1].text = value
         table.rows[i].cells[0].paragraphs[0].runs[0].font.bold = True
@@ -202,7 +228,7 @@ def create_executive_summary(doc, data):
     
     # Portfolio adequacy
     if portfolio_total > 0:
-        withdrawal_rate = (net_drawdown / portfolio_total) * 100
+        withdrawal_rate = metrics['withdrawal_rate']
         if withdrawal_rate <= 4:
             findings.append(f"✓ Sustainable withdrawal rate of {withdrawal_rate:.1f}% (recommended ≤4%)")
         elif withdrawal_rate <= 5:
@@ -213,7 +239,7 @@ def create_executive_summary(doc, data):
     # Success rate analysis
     if mc_results:
         if success_rate >= 85:
-            findings.append(f"✓ Strong portfolio resilience with {success_rate:.1f}% success across 1,000 scenarios")
+            findings.append(f"✓ Strong portfolio resilience with {success_rate:.1f}% success across {simulation_runs(mc_results, data):,} scenarios")
         elif success_rate >= 70:
             findings.append(f"⚠ Moderate portfolio resilience with {success_rate:.1f}% success rate")
         else:
@@ -229,6 +255,10 @@ def create_executive_summary(doc, data):
     
     doc.add_page_break()
 
+@depends_on('currentAge', 'retirementAge', 'pensionRecipientType', 'isHomeowner',
+            'mainSuperBalance', 'sequencingBuffer', 'totalPensionIncome', 'baseSpending',
+            'spendingPattern', 'selectedScenario', 'inflationRate', 'includeAgePension',
+            'splurgeAmount', 'splurgeDuration')
 def create_assumptions_section(doc, data):
     """Create financial assumptions section"""
     
@@ -238,9 +268,6 @@ def create_assumptions_section(doc, data):
     # Personal Details
     doc.add_heading("Personal Details", level=2)
     
-    table = doc.add_table(rows=4, cols=2)
-    table.style = 'Light Grid Accent 1'
-    
     personal = [
         ('Current Age', str(data.get('currentAge', 'N/A'))),
         ('Retirement Age', str(data.get('retirementAge', 'N/A'))),
@@ -248,36 +275,23 @@ def create_assumptions_section(doc, data):
         ('Homeowner Status', 'Yes' if data.get('isHomeowner') else 'No'),
     ]
     
-    for i, (label, value) in enumerate(personal):
-        table.rows[i].cells[0].text = label
-        table.rows[i].cells[1].text = value
-        table.rows[i].cells[0].paragraphs[0].runs[0].font.bold = True
-        table.rows[i].cells[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
+    add_table(doc, personal, bold={0: True}, align={1: 'right'})
     
     doc.add_paragraph()
     
     # Financial Resources
     doc.add_heading("Financial Resources", level=2)
     
-    table = doc.add_table(rows=4, cols=2)
-    table.style = 'Light Grid Accent 1'
-    
     resources = [
         ('Superannuation Balance', format_currency(data.get('mainSuperBalance', 0))),
         ('Sequencing Buffer', format_currency(data.get('sequencingBuffer', 0))),
-        ('Total Portfolio', format_currency(data.get('mainSuperBalance', 0) + data.get('sequencingBuffer', 0))),
+        # Bold and color the total row
+        ('Total Portfolio', Cell(format_currency(data.get('mainSuperBalance', 0) + data.get('sequencingBuffer', 0)),
+                                 bold=True, color='1E3A8A')),
         ('Annual Pension Income', format_currency(data.get('totalPensionIncome', 0))),
     ]
     
-    for i, (label, value) in enumerate(resources):
-        table.rows[i].cells[0].text = label
-        table.rows[i].cells[1].text = value
-        table.rows[i].cells[0].paragraphs[0].runs[0].font.bold = True
-        table.rows[i].cells[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
-        # Bold and color the total row
-        if i == 2:
-            table.rows[i].cells[1].paragraphs[0].runs[0].font.bold = True
-            table.rows[i].cells[1].paragraphs[0].runs[0].font.color.rgb = RGBColor(30, 58, 138)
+    add_table(doc, resources, bold={0: True}, align={1: 'right'})
     
     doc.add_paragraph()
     
@@ -299,74 +313,47 @@ def create_assumptions_section(doc, data):
             f"{format_currency(data.get('splurgeAmount'))} for {data.get('splurgeDuration')} years"
         ))
     
-    table = doc.add_table(rows=len(assumptions), cols=2)
-    table.style = 'Light Grid Accent 1'
-    
-    for i, (label, value) in enumerate(assumptions):
-        table.rows[i].cells[0].text = label
-        table.rows[i].cells[1].text = value
-        table.rows[i].cells[0].paragraphs[0].runs[0].font.bold = True
-        table.rows[i].cells[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
+    add_table(doc, assumptions, bold={0: True}, align={1: 'right'})
     
     doc.add_page_break()
 
+@depends_on('chartData')
 def create_projections_section(doc, data):
     """Create portfolio projections section"""
     
     heading = doc.add_heading("3. Portfolio Projections", level=1)
     heading.runs[0].font.color.rgb = RGBColor(30, 58, 138)
     
-    chart_data = data.get('chartData', [])
+    chart_data = chart_columns(data.get('chartData', []))
     if not chart_data:
         doc.add_paragraph("No projection data available.")
         doc.add_page_break()
         return
     
     # Condensed view for readability
-    if len(chart_data) > 25:
-        selected_years = (chart_data[:10] + 
-                         chart_data[len(chart_data)//2-2:len(chart_data)//2+3] +
-                         chart_data[-10:])
+    count = len(chart_data)
+    if count > 25:
+        selected_rows = (list(range(10)) +
+                         list(range(count//2-2, count//2+3)) +
+                         list(range(count-10, count)))
         condensed = True
     else:
-        selected_years = chart_data
+        selected_rows = list(range(count))
         condensed = False
     
-    # Create table
-    table = doc.add_table(rows=len(selected_years) + 1, cols=5)
-    table.style = 'Light Grid Accent 1'
-    
-    # Header row
-    headers = ['Year', 'Age', 'Total Balance', 'Income', 'Spending']
-    for i, header in enumerate(headers):
-        cell = table.rows[0].cells[i]
-        cell.text = header
-        cell.paragraphs[0].runs[0].font.bold = True
-        cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-        set_cell_background(cell, '1E3A8A')
-        cell.paragraphs[0].runs[0].font.color.rgb = RGBColor(255, 255, 255)
-    
-    # Data rows
-    for idx, row_data in enumerate(selected_years, 1):
-        balance = row_data.get('Total Balance', 0)
-        income = row_data.get('Income', 0)
-        spending = row_data.get('Spending', 0)
-        
-        values = [
-            str(row_data.get('year', '')),
-            str(row_data.get('age', '')),
-            format_currency(balance) if isinstance(balance, (int, float)) else str(balance),
-            format_currency(income) if isinstance(income, (int, float)) else str(income),
-            format_currency(spending) if isinstance(spending, (int, float)) else str(spending),
-        ]
-        
-        for i, value in enumerate(values):
-            cell = table.rows[idx].cells[i]
-            cell.text = value
-            if i < 2:
-                cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-            else:
-                cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
+    rows = [
+        (chart_data.year[row], chart_data.age[row], chart_data.total_balance[row],
+         chart_data.income[row], chart_data.spending[row])
+        for row in selected_rows
+    ]
+    add_table(
+        doc, rows,
+        header=['Year', 'Age', 'Total Balance', 'Income', 'Spending'],
+        header_fill='1E3A8A',
+        header_align='center',
+        formats=[format_label, format_label, format_currency, format_currency, format_currency],
+        align=['center', 'center', 'right', 'right', 'right'],
+    )
     
     doc.add_paragraph()
     
@@ -374,13 +361,14 @@ def create_projections_section(doc, data):
     if condensed:
         note = doc.add_paragraph()
         note.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run = note.add_run("Note: Table shows representative years. Export detailed CSV for complete year-by-year data.")
+        run = note.add_run("Note: Table shows representative years. Appendix A lists every projected year.")
         run.font.size = Pt(9)
         run.font.italic = True
         run.font.color.rgb = RGBColor(100, 116, 139)
     
     doc.add_page_break()
 
+@depends_on('monteCarloResults', 'historicalMonteCarloResults', 'monteCarloRuns')
 def create_risk_analysis_section(doc, data):
     """Create risk analysis section"""
     
@@ -398,14 +386,9 @@ def create_risk_analysis_section(doc, data):
     risk_text, risk_color = get_risk_level(success_rate)
     
     # Success Rate Banner
-    table = doc.add_table(rows=1, cols=1)
-    cell = table.rows[0].cells[0]
-    cell.text = f"Monte Carlo Success Rate: {success_rate:.1f}%\n{risk_text}"
-    cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-    cell.paragraphs[0].runs[0].font.bold = True
-    cell.paragraphs[0].runs[0].font.size = Pt(14)
-    cell.paragraphs[0].runs[0].font.color.rgb = RGBColor(255, 255, 255)
-    set_cell_background(cell, risk_color)
+    banner = Cell(f"Monte Carlo Success Rate: {success_rate:.1f}%\n{risk_text}",
+                  bold=True, color='FFFFFF', fill=risk_color, align='center', size=14)
+    add_table(doc, [[banner]], style=None)
     
     doc.add_paragraph()
     
@@ -424,7 +407,9 @@ def create_risk_analysis_section(doc, data):
     else:
         interpretation.append("High Risk: Your portfolio is likely to deplete prematurely in many scenarios.")
     
-    interpretation.append(f"Out of 1,000 simulated retirement scenarios with varying market returns, {int(success_rate*10)} scenarios maintained sufficient funds through retirement while {int((100-success_rate)*10)} scenarios depleted prematurely.")
+    runs = simulation_runs(mc_results, data)
+    successful = round(runs * success_rate / 100)
+    interpretation.append(f"Out of {runs:,} simulated retirement scenarios with varying market returns, {successful:,} scenarios maintained sufficient funds through retirement while {runs - successful:,} scenarios depleted prematurely.")
     
     for text in interpretation:
         doc.add_paragraph(text)
@@ -436,19 +421,6 @@ def create_risk_analysis_section(doc, data):
     if percentiles:
         doc.add_heading("Portfolio Balance at Retirement End (Percentiles)", level=2)
         
-        table = doc.add_table(rows=6, cols=3)
-        table.style = 'Light Grid Accent 1'
-        
-        # Header
-        headers = ['Percentile', 'Final Balance', 'Interpretation']
-        for i, header in enumerate(headers):
-            cell = table.rows[0].cells[i]
-            cell.text = header
-            cell.paragraphs[0].runs[0].font.bold = True
-            set_cell_background(cell, '475569')
-            cell.paragraphs[0].runs[0].font.color.rgb = RGBColor(255, 255, 255)
-        
-        # Data
         p_items = [
             ('p10', '10th', 'Worst case (bottom 10%)'),
             ('p25', '25th', 'Below average'),
@@ -457,15 +429,22 @@ def create_risk_analysis_section(doc, data):
             ('p90', '90th', 'Best case (top 10%)'),
         ]
         
-        for idx, (key, label, interp) in enumerate(p_items, 1):
-            value = percentiles.get(key, 0)
-            table.rows[idx].cells[0].text = label
-            table.rows[idx].cells[1].text = format_currency(value)
-            table.rows[idx].cells[2].text = interp
-            table.rows[idx].cells[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
+        # Bands may be numbers, objects or full YearlyData[] paths
+        rows = [
+            (label, format_currency(percentile_final_balance(percentiles.get(key, 0))), interp)
+            for key, label, interp in p_items
+        ]
+        add_table(
+            doc, rows,
+            header=['Percentile', 'Final Balance', 'Interpretation'],
+            header_fill='475569',
+            align={1: 'right'},
+        )
     
     doc.add_page_break()
 
+@depends_on('mainSuperBalance', 'sequencingBuffer', 'baseSpending', 'totalPensionIncome',
+            'includeAgePension', 'monteCarloResults', 'historicalMonteCarloResults', 'monteCarloRuns')
 def create_recommendations_section(doc, data):
     """Create recommendations section"""
     
@@ -475,15 +454,11 @@ def create_recommendations_section(doc, data):
     recommendations = []
     
     # Calculate metrics
-    portfolio_total = data.get('mainSuperBalance', 0) + data.get('sequencingBuffer', 0)
-    annual_spending = data.get('baseSpending', 0)
-    pension_income = data.get('totalPensionIncome', 0)
-    net_drawdown = annual_spending - pension_income
-    
-    if portfolio_total > 0:
-        withdrawal_rate = (net_drawdown / portfolio_total) * 100
-    else:
-        withdrawal_rate = 0
+    metrics = plan_metrics(data)
+    portfolio_total = metrics['portfolio_total']
+    annual_spending = metrics['annual_spending']
+    pension_income = metrics['pension_income']
+    withdrawal_rate = metrics['withdrawal_rate']
     
     mc_results = data.get('monteCarloResults') or data.get('historicalMonteCarloResults')
     success_rate = mc_results.get('successRate', 0) if mc_results else None
@@ -595,6 +570,7 @@ def create_recommendations_section(doc, data):
     
     doc.add_page_break()
 
+@depends_on('oneOffExpenses', 'monteCarloResults', 'historicalMonteCarloResults', 'monteCarloRuns')
 def create_scenario_details_section(doc, data):
     """Create scenario details section"""
     
@@ -609,25 +585,17 @@ def create_scenario_details_section(doc, data):
         # Filter expenses with amounts
         expenses = [e for e in one_off if e.get('amount', 0) > 0]
         
-        table = doc.add_table(rows=len(expenses) + 1, cols=3)
-        table.style = 'Light Grid Accent 1'
-        
-        # Header
-        headers = ['Description', 'Age', 'Amount']
-        for i, header in enumerate(headers):
-            cell = table.rows[0].cells[i]
-            cell.text = header
-            cell.paragraphs[0].runs[0].font.bold = True
-            set_cell_background(cell, '475569')
-            cell.paragraphs[0].runs[0].font.color.rgb = RGBColor(255, 255, 255)
-        
-        # Data
-        for idx, expense in enumerate(expenses, 1):
-            table.rows[idx].cells[0].text = expense.get('description', 'N/A')
-            table.rows[idx].cells[1].text = str(expense.get('age', 'N/A'))
-            table.rows[idx].cells[2].text = format_currency(expense.get('amount', 0))
-            table.rows[idx].cells[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-            table.rows[idx].cells[2].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
+        rows = [
+            (expense.get('description', 'N/A'), expense.get('age', 'N/A'), expense.get('amount', 0))
+            for expense in expenses
+        ]
+        add_table(
+            doc, rows,
+            header=['Description', 'Age', 'Amount'],
+            header_fill='475569',
+            formats=[str, str, format_currency],
+            align={1: 'center', 2: 'right'},
+        )
         
         doc.add_paragraph()
     
@@ -650,42 +618,202 @@ def create_scenario_details_section(doc, data):
     
     doc.add_paragraph()
     
-    p = doc.add_paragraph("Monte Carlo simulations run 1,000 scenarios with randomized annual returns based on your expected return and volatility inputs, providing statistical confidence intervals for outcomes.")
+    runs = simulation_runs(data.get('monteCarloResults') or data.get('historicalMonteCarloResults'), data)
+    p = doc.add_paragraph(f"Monte Carlo simulations run {runs:,} scenarios with randomized annual returns based on your expected return and volatility inputs, providing statistical confidence intervals for outcomes.")
+
+def percentile_columns(chart_data, percentiles):
+    """Per-band balances aligned to the chartData rows (None if no paths)"""
+    paths = percentile_paths(percentiles)
+    if paths is None:
+        return None
+    ages, bands = paths
+    
+    # Match rows on age; paths without ages line up by year index
+    rows_by_age = {age: i for i, age in enumerate(ages) if age == age}
+    columns = {key: [None] * len(chart_data) for key in PERCENTILE_KEYS}
+    for row in range(len(chart_data)):
+        age = chart_data.age[row]
+        index = rows_by_age.get(age) if rows_by_age else row
+        if index is None or index >= len(ages):
+            continue
+        for key in PERCENTILE_KEYS:
+            columns[key][row] = bands[key][index]
+    return columns
+
+@depends_on('chartData', 'monteCarloResults', 'historicalMonteCarloResults',
+            'appendixPercentileColumns')
+def create_year_by_year_appendix(doc, data):
+    """Create the complete year-by-year appendix on landscape pages"""
+    
+    chart_data = chart_columns(data.get('chartData', []))
+    if not chart_data:
+        return
+    
+    # Landscape section so the percentile columns stay readable
+    section = doc.add_section(WD_SECTION.NEW_PAGE)
+    section.orientation = WD_ORIENT.LANDSCAPE
+    section.page_width, section.page_height = section.page_height, section.page_width
+    
+    heading = doc.add_heading("Appendix A. Year-by-Year Projections", level=1)
+    heading.runs[0].font.color.rgb = RGBColor(30, 58, 138)
+    
+    headers = ['Year', 'Age', 'Total Balance', 'Income', 'Spending']
+    series = [chart_data.year, chart_data.age, chart_data.total_balance,
+              chart_data.income, chart_data.spending]
+    
+    mc_results = data.get('monteCarloResults') or data.get('historicalMonteCarloResults') or {}
+    bands = None
+    if data.get('appendixPercentileColumns', True):
+        bands = percentile_columns(chart_data, mc_results.get('percentiles'))
+    if bands:
+        headers += [f'P{key[1:]}' for key in PERCENTILE_KEYS]
+        series += [bands[key] for key in PERCENTILE_KEYS]
+    
+    doc.add_paragraph(
+        f"All {len(chart_data)} projected years in today's dollars."
+        + (" P10-P90 columns show the Monte Carlo balance percentiles for the same age." if bands else "")
+    )
+    
+    add_table(
+        doc, zip(*series),
+        header=headers,
+        header_fill='1E3A8A',
+        header_align='center',
+        repeat_header=True,
+        formats=[format_label, format_label] + [format_currency] * (len(headers) - 2),
+        align=['center', 'center'] + ['right'] * (len(headers) - 2),
+        size=8,
+        # Shade the years after the portfolio is exhausted
+        row_fill=lambda r, values: 'FEE2E2' if values[2] <= 0 else None,
+    )
+
+# Report sections in document order
+DOCUMENT_SECTIONS = (
+    create_cover_page,
+    create_table_of_contents,
+    create_executive_summary,
+    create_assumptions_section,
+    create_projections_section,
+    create_risk_analysis_section,
+    create_recommendations_section,
+    create_scenario_details_section,
+    create_year_by_year_appendix,
+)
+
+def build_document(data, profiler=None, fragments=None):
+    """Build the complete report document from payload data.
+    
+    fragments is a section fragment cache (defaults to the process-wide
+    one from docx_fragments; pass False to rebuild every section).
+    """
+    
+    # Per-section timings are only collected when profiling is enabled
+    if profiler is None:
+        profiler = RenderProfiler.from_env('docx')
+    try:
+        return _build_document(data, profiler, fragments)
+    except Exception as e:
+        # A failed render still reports where it failed (and stops tracemalloc)
+        profiler.fail(e)
+        raise
+
+def _build_document(data, profiler, fragments):
+    
+    # Server-side simulations need NumPy, so they are only imported on request
+    if data.get('serverMonteCarlo'):
+        from monte_carlo import with_server_monte_carlo
+        with profiler.section('server_monte_carlo'):
+            data = with_server_monte_carlo(data)
+    if data.get('serverHistoricalMonteCarlo'):
+        from historical_backtest import with_server_historical
+        with profiler.section('server_historical'):
+            data = with_server_historical(data)
+    
+    # Create document
+    with profiler.section('setup'):
+        doc = Document()
+        
+        # Set document properties
+        core_props = doc.core_properties
+        core_props.title = "Australian Retirement Planning Report"
+        core_props.author = "Retirement Planning Calculator"
+        core_props.subject = "Comprehensive Retirement Analysis"
+        timestamp = report_timestamp(data)
+        if timestamp is None:
+            core_props.created = datetime.now()
+        else:
+            # Reproducible mode: every embedded time is the pinned report date
+            pinned = datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+            core_props.created = pinned
+            core_props.modified = pinned
+            core_props.last_printed = pinned
+    
+    # Build document sections, reusing cached fragments of unchanged ones
+    cache = fragment_cache() if fragments is None else fragments or None
+    for create in DOCUMENT_SECTIONS:
+        with profiler.section(create.__name__, doc):
+            render_section(doc, data, create, cache)
+    
+    profiler.finish(body_elements=len(doc.element.body))
+    return doc
+
+def pin_zip_timestamps(content, timestamp):
+    """Rewrite a .docx archive with every member dated timestamp.
+
+    python-docx stamps each zip member with the current time, so without
+    this two saves of the same document differ.
+    """
+    date_time = max(time.gmtime(timestamp)[:6], ZIP_EPOCH)
+    output = BytesIO()
+    with zipfile.ZipFile(BytesIO(content)) as source, \
+            zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as target:
+        for info in source.infolist():
+            member = zipfile.ZipInfo(info.filename, date_time)
+            member.compress_type = zipfile.ZIP_DEFLATED
+            member.external_attr = info.external_attr
+            target.writestr(member, source.read(info))
+    return output.getvalue()
+
+def _build_docx_bytes(data):
+    buffer = BytesIO()
+    build_document(data).save(buffer)
+    timestamp = report_timestamp(data)
+    if timestamp is None:
+        return buffer.getvalue()
+    return pin_zip_timestamps(buffer.getvalue(), timestamp)
+
+def render_docx_bytes(data):
+    """Render the report straight to DOCX bytes, reusing cached bytes for repeat payloads"""
+    return cached_render('docx', data, _build_docx_bytes)
 
 def main():
+    if len(sys.argv) >= 2 and sys.argv[1] == '--startup-report':
+        # Import-time budget check (see startup_report.py)
+        from startup_report import main as startup_report
+        sys.exit(startup_report('docx', __file__, sys.argv[2:]))
+    
     if len(sys.argv) != 3:
         print("Usage: generate_retirement_docx.py <input_json> <output_docx>")
+        print("       generate_retirement_docx.py - -   (JSON on stdin, DOCX on stdout)")
+        print("       generate_retirement_docx.py --startup-report [<input_json> <output_docx>]")
         sys.exit(1)
     
     input_file = sys.argv[1]
     output_file = sys.argv[2]
     
-    # Load data
-    with open(input_file, 'r') as f:
-        data = json.load(f)
+    # Load data (JSON or a columnar payload bundle)
+    data = load_payload(input_file)
     
-    # Create document
-    doc = Document()
-    
-    # Set document properties
-    core_props = doc.core_properties
-    core_props.title = "Australian Retirement Planning Report"
-    core_props.author = "Retirement Planning Calculator"
-    core_props.subject = "Comprehensive Retirement Analysis"
-    core_props.created = datetime.now()
-    
-    # Build document sections
-    create_cover_page(doc, data)
-    create_table_of_contents(doc)
-    create_executive_summary(doc, data)
-    create_assumptions_section(doc, data)
-    create_projections_section(doc, data)
-    create_risk_analysis_section(doc, data)
-    create_recommendations_section(doc, data)
-    create_scenario_details_section(doc, data)
-    
-    # Save document
-    doc.save(output_file)
+    # Stream the document to stdout without touching disk
+    if output_file == '-':
+        sys.stdout.buffer.write(render_docx_bytes(data))
+        sys.stdout.buffer.flush()
+        print("Word document generated successfully: <stdout>", file=sys.stderr)
+        return
+    
+    # Build and save document (or reuse the cached bytes of an identical request)
+    with open(output_file, 'wb') as f:
+        f.write(render_docx_bytes(data))
     
     print(f"Word document generated successfully: {output_file}")
 
@@ -0,0 +1,159 @@
+"""
+Australian Retirement Planning - Historical Backtest Engine
+
+Server-side counterpart of the rolling-window ("complete blocks") method of
+runHistoricalMonteCarlo (app/page.tsx). The annual return history is kept
+as a packed float array; every start-year window over it is a zero-copy
+strided view, and all windows are projected together by the vectorized
+projection engine. Success rate and p10-p90 bands are computed as in
+monte_carlo.py, in the historicalMonteCarloResults shape the report
+generators already read.
+
+Like the client, each window is projected for the horizon only: success
+means lasting all horizon years with a final balance >= 0 (see
+projection_engine.survived), and the bands end at the horizon rather than
+at age 100.
+
+Requires NumPy. Reports opt in with a serverHistoricalMonteCarlo payload key:
+    "serverHistoricalMonteCarlo": true
+    "serverHistoricalMonteCarlo": {"horizon": 35}
+    "serverHistoricalMonteCarlo": {"returns": [...], "firstYear": 1900}
+
+Run directly to backtest a payload:
+    python historical_backtest.py <input_json> [horizon]
+"""
+
+from array import array
+import json
+import sys
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from monte_carlo import PERCENTILE_SERIES, MonteCarloResult
+from projection_engine import ProjectionParams, project
+from report_data import to_number
+
+
+# S&P 500 total returns (%), 1928-2025; mirrors historicalMarketData in app/page.tsx
+FIRST_HISTORICAL_YEAR = 1928
+HISTORICAL_RETURNS = array('d', (
+    43.8, -8.4, -25.1, -43.3, -8.2, 54.0, -1.4, 47.7, 33.9, -35.0, 31.1, -0.4, -9.8,
+    -11.6, 20.3, 25.9, 19.8, 36.4, -8.1, 5.7, 5.5, 18.8, 31.7,
+    24.0, 18.4, -1.0, 52.6, 31.6, 6.6, -10.8, 43.4, 12.0, 0.5,
+    26.9, -8.7, 22.8, 16.5, 12.5, -10.1, 24.0, 11.1, -8.5, 4.0,
+    14.3, 19.0, -14.7, -26.5, 37.2, 23.8, -7.2, 6.6, 18.4, 32.4,
+    -4.9, 21.4, 22.5, 6.3, 32.2, 18.5, 5.2, 16.8, 31.5, -3.2,
+    30.5, 7.7, 10.0, 1.3, 37.4, 23.1, 33.4, 28.6, 21.0, -9.1,
+    -11.9, -22.1, 28.7, 10.9, 4.9, 15.8, 5.5, -37.0, 26.5, 15.1,
+    2.1, 16.0, 32.4, 13.7, 1.4, 12.0, 21.8, -4.4, 31.5, 18.4,
+    28.7, -18.1, 26.3, 23.3, 12.1,
+))
+
+# Years of history per window (and years projected), as the client's
+# complete-blocks method
+DEFAULT_HORIZON = 35
+
+
+def rolling_windows(returns, horizon):
+    """(windows, horizon) read-only view of every start-year window (no copy)"""
+    returns = np.frombuffer(returns, dtype=np.float64) if isinstance(returns, array) \
+        else np.asarray(returns, dtype=np.float64)
+    if not 0 < horizon <= len(returns):
+        raise ValueError(f'horizon must be between 1 and {len(returns)} years, got {horizon}')
+    return sliding_window_view(returns, horizon)
+
+
+class BacktestResult(MonteCarloResult):
+    """Monte Carlo result whose runs are the historical start years"""
+
+    __slots__ = ('first_year', 'horizon', 'data_years', 'survived')
+
+    def __init__(self, first_year, horizon, data_years, projection):
+        super().__init__(len(projection), None, None, None, projection)
+        self.first_year = first_year
+        self.horizon = horizon
+        self.data_years = data_years
+        # Failed if it ran out before the horizon or ended below zero
+        self.survived = projection.survived(horizon)
+        self.success_rate = float(self.survived.mean() * 100) if self.runs else 0.0
+
+    def period(self, index):
+        start = self.first_year + index
+        return f'{start}-{start + self.horizon - 1}'
+
+    def failed_periods(self):
+        """Historical periods the plan ran out of money in"""
+        return [self.period(int(i)) for i in np.flatnonzero(~self.survived)]
+
+    def to_payload(self):
+        """Results in the historicalMonteCarloResults shape the generators read"""
+        return {
+            'successRate': self.success_rate,
+            'percentiles': self.percentile_paths(),
+            'runs': self.runs,
+            'actualRuns': self.runs,
+            'method': 'block',
+            'horizon': self.horizon,
+            'dataYears': self.data_years,
+            'periods': [self.period(0), self.period(self.runs - 1)],
+            'failedPeriods': self.failed_periods(),
+            'source': 'server',
+        }
+
+
+def run_backtest(params, returns=HISTORICAL_RETURNS, first_year=FIRST_HISTORICAL_YEAR,
+                 horizon=DEFAULT_HORIZON):
+    """Project a plan through every historical start year in one vectorized sweep"""
+    # The plan ends at age 100 even when the horizon is longer
+    horizon = min(int(horizon), len(params.ages))
+    windows = rolling_windows(returns, horizon)
+    projection = project(params, windows, keep=PERCENTILE_SERIES, years=horizon)
+    return BacktestResult(first_year, horizon, len(returns), projection)
+
+
+def backtest_for_payload(data):
+    """Run the backtest described by a report payload"""
+    options = data.get('serverHistoricalMonteCarlo')
+    options = options if isinstance(options, dict) else {}
+    returns = HISTORICAL_RETURNS
+    first_year = FIRST_HISTORICAL_YEAR
+    if options.get('returns'):
+        returns = array('d', (to_number(r) for r in options['returns']))
+        first_year = int(to_number(options.get('firstYear'), FIRST_HISTORICAL_YEAR))
+    horizon = int(to_number(options.get('horizon'), DEFAULT_HORIZON))
+    return run_backtest(ProjectionParams.from_payload(data), returns, first_year, horizon)
+
+
+def with_server_historical(data):
+    """Payload copy whose historicalMonteCarloResults were computed here (unchanged if not requested)"""
+    if not data.get('serverHistoricalMonteCarlo'):
+        return data
+    data = dict(data)
+    data['historicalMonteCarloResults'] = backtest_for_payload(data).to_payload()
+    return data
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        print("Usage: historical_backtest.py <input_json> [horizon]")
+        sys.exit(1)
+
+    with open(sys.argv[1], 'r') as f:
+        data = json.load(f)
+
+    horizon = int(sys.argv[2]) if len(sys.argv) == 3 else DEFAULT_HORIZON
+    result = run_backtest(ProjectionParams.from_payload(data), horizon=horizon)
+    payload = result.to_payload()
+    print(json.dumps({
+        'successRate': round(payload['successRate'], 2),
+        'runs': payload['runs'],
+        'horizon': payload['horizon'],
+        'periods': payload['periods'],
+        'failedPeriods': payload['failedPeriods'],
+        'finalBalances': {key: round(float(band[result.years - 1]), 2)
+                          for key, band in result.bands['total_balance'].items()},
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
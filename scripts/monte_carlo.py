@@ -0,0 +1,176 @@
+"""
+Australian Retirement Planning - Batched Monte Carlo Engine
+
+Server-side counterpart of runMonteCarloSimulation (lib/calculations/
+monteCarlo.ts). The runs x years matrix of normally distributed returns is
+drawn in one call from a seeded generator, every path is advanced together
+by the vectorized projection engine, and the p10-p90 bands are taken along
+the run axis. Results use the monteCarloResults shape the report generators
+already read, so simulations of up to RUNS_LIMIT paths can be computed at
+render time. A run succeeds by projection_engine.survived, which differs
+from the client only for a path ending on exactly $0.
+
+Requires NumPy. Reports opt in with a serverMonteCarlo payload key:
+    "serverMonteCarlo": true
+    "serverMonteCarlo": {"runs": 20000, "seed": 42}
+Without a seed, a pinned report date (reportDate / SOURCE_DATE_EPOCH) is
+used as one, so reproducible reports stay reproducible. Seeds are taken
+modulo 2**32, so negative ones (pre-1970 report dates) are valid too.
+
+Larger run counts are capped at REPORT_MC_MAX_RUNS (default 20,000, at most
+RUNS_LIMIT); a capped result records both counts and warns on stderr.
+"""
+
+import os
+import sys
+import warnings
+
+import numpy as np
+
+from projection_engine import ProjectionParams, project
+from report_data import report_timestamp, to_number
+from report_summary import PERCENTILE_KEYS
+
+
+DEFAULT_RUNS = 1000
+DEFAULT_MAX_RUNS = 20000
+RUNS_LIMIT = 100000
+SEED_MODULUS = 2 ** 32
+DEFAULT_EXPECTED_RETURN = 7.0
+DEFAULT_VOLATILITY = 18.0
+
+PERCENTILE_SERIES = {
+    'total_balance': 'totalBalance',
+    'spending': 'spending',
+    'income': 'income',
+}
+
+
+def draw_returns(runs, years, expected_return, volatility, seed=None):
+    """runs x years matrix of annual returns (%) from one seeded generator"""
+    rng = np.random.default_rng(seed)
+    return rng.normal(expected_return, volatility, size=(runs, years))
+
+
+def percentile_bands(values):
+    """p10-p90 of each year across runs (linear interpolation, as calculatePercentile).
+
+    values is (runs, years). Exhausted paths are NaN from the year after they
+    run out and, like the TS model, no longer count towards later years.
+    """
+    levels = [int(key[1:]) for key in PERCENTILE_KEYS]
+    if not values.size:
+        return {key: np.full(values.shape[1], np.nan) for key in PERCENTILE_KEYS}
+    with warnings.catch_warnings():
+        # Years no run reached are all NaN; their bands stay NaN
+        warnings.simplefilter('ignore', RuntimeWarning)
+        bands = np.nanpercentile(values, levels, axis=0)
+    return dict(zip(PERCENTILE_KEYS, bands))
+
+
+class MonteCarloResult:
+    """Success rate, percentile bands and ending balances of a batched run"""
+
+    __slots__ = ('runs', 'requested_runs', 'seed', 'expected_return', 'volatility',
+                 'projection', 'success_rate', 'years', 'bands', 'ending_balances')
+
+    def __init__(self, runs, seed, expected_return, volatility, projection):
+        self.runs = runs
+        self.requested_runs = runs
+        self.seed = seed
+        self.expected_return = expected_return
+        self.volatility = volatility
+        self.projection = projection
+        self.success_rate = projection.success_rate
+        self.ending_balances = np.sort(projection.final_balance)
+
+        # Years any path reached; later years have no data in any run
+        self.years = int(projection.lengths.max()) if runs else 0
+        self.bands = {
+            name: percentile_bands(getattr(projection, name)[:, :self.years])
+            for name in PERCENTILE_SERIES
+        }
+
+    def percentile_paths(self):
+        """Percentile bands as YearlyData[] lists keyed p10-p90"""
+        ages = self.projection.ages
+        years = self.projection.years
+        paths = {}
+        for key in PERCENTILE_KEYS:
+            rows = []
+            for y in range(self.years):
+                row = {'age': int(ages[y]), 'year': int(years[y])}
+                for name, field in PERCENTILE_SERIES.items():
+                    row[field] = float(self.bands[name][key][y])
+                rows.append(row)
+            paths[key] = rows
+        return paths
+
+    def to_payload(self):
+        """Results in the monteCarloResults shape the generators read"""
+        return {
+            'successRate': self.success_rate,
+            'percentiles': self.percentile_paths(),
+            'runs': self.runs,
+            'requestedRuns': self.requested_runs,
+            'seed': self.seed,
+            'expectedReturn': self.expected_return,
+            'volatility': self.volatility,
+            'source': 'server',
+        }
+
+
+def run_monte_carlo(params, runs=DEFAULT_RUNS, expected_return=DEFAULT_EXPECTED_RETURN,
+                    volatility=DEFAULT_VOLATILITY, seed=None):
+    """Simulate runs return sequences for a plan in one vectorized sweep"""
+    returns = draw_returns(runs, len(params.ages), expected_return, volatility, seed)
+    projection = project(params, returns, keep=PERCENTILE_SERIES)
+    return MonteCarloResult(runs, seed, expected_return, volatility, projection)
+
+
+def max_runs():
+    """Run count cap for one simulation (REPORT_MC_MAX_RUNS, at most RUNS_LIMIT)"""
+    value = os.environ.get('REPORT_MC_MAX_RUNS')
+    limit = int(float(value)) if value else DEFAULT_MAX_RUNS
+    return min(max(limit, 1), RUNS_LIMIT)
+
+
+def parse_seed(value):
+    """Generator seed from a payload value (int or numeric string), modulo 2**32"""
+    try:
+        seed = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'Invalid Monte Carlo seed: {value!r}') from None
+    return seed % SEED_MODULUS
+
+
+def monte_carlo_for_payload(data, runs=None, seed=None):
+    """Run the simulation described by a report payload"""
+    options = data.get('serverMonteCarlo')
+    options = options if isinstance(options, dict) else {}
+    requested = runs or int(to_number(options.get('runs', data.get('monteCarloRuns')), DEFAULT_RUNS))
+    runs = min(max(requested, 1), max_runs())
+    if runs < requested:
+        print(f"Monte Carlo runs capped at {runs:,} ({requested:,} requested; see REPORT_MC_MAX_RUNS)",
+              file=sys.stderr)
+    if seed is None:
+        seed = options.get('seed')
+    if seed is None:
+        # Reproducible mode: the pinned report date seeds the generator
+        seed = report_timestamp(data)
+    if seed is not None:
+        seed = parse_seed(seed)
+    expected_return = to_number(options.get('expectedReturn', data.get('expectedReturn')), DEFAULT_EXPECTED_RETURN)
+    volatility = to_number(options.get('volatility', data.get('returnVolatility')), DEFAULT_VOLATILITY)
+    result = run_monte_carlo(ProjectionParams.from_payload(data), runs, expected_return, volatility, seed)
+    result.requested_runs = requested
+    return result
+
+
+def with_server_monte_carlo(data):
+    """Payload copy whose monteCarloResults were computed here (unchanged if not requested)"""
+    if not data.get('serverMonteCarlo'):
+        return data
+    data = dict(data)
+    data['monteCarloResults'] = monte_carlo_for_payload(data).to_payload()
+    return data
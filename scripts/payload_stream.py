@@ -0,0 +1,274 @@
+"""
+Australian Retirement Planning - Streaming Payload Ingestion
+
+Parses a JSON report payload incrementally instead of materializing it with
+json.load(). Scalar parameters and small objects are decoded eagerly as
+usual, but every YearlyData[] list the reports read (chartData, percentile
+paths, formal test simulationData) is reduced row by row into ChartColumns
+as it is read, and bulk results the reports never use (allProjections,
+endingBalances, median paths) are dropped element by element as they are
+read. Peak memory therefore tracks the handful of float columns and the
+largest single element, not the payload size.
+
+The pure-Python parser is several times slower than json.loads(), so
+load_json() only streams payloads larger than REPORT_STREAM_THRESHOLD_MB
+(default 8); smaller ones are decoded in one call and reduced the same way
+afterwards.
+"""
+
+import codecs
+import json
+import math
+import os
+from array import array
+from json.decoder import scanstring
+
+from report_data import CHART_FIELDS, LABEL_FIELDS, ChartColumns, to_number
+
+
+# Payload paths holding YearlyData[] lists that are stored as columns
+COLUMNAR_PATHS = (
+    ('chartData',),
+    ('constantReturnChartData',),
+    ('monteCarloResults', 'percentiles', '*'),
+    ('historicalMonteCarloResults', 'percentiles', '*'),
+    ('formalTestResults', '*', 'simulationData'),
+)
+
+# Bulk results no report section reads
+SKIPPED_PATHS = tuple(
+    (results, key)
+    for results in ('monteCarloResults', 'historicalMonteCarloResults')
+    for key in ('allProjections', 'endingBalances', 'medianProjection', 'medianSimulation')
+)
+
+CHUNK_SIZE = 1 << 16
+DEFAULT_STREAM_THRESHOLD_MB = 8
+
+_WHITESPACE = ' \t\n\r'
+
+
+def path_matches(pattern, path):
+    return len(pattern) == len(path) and all(p == '*' or p == k for p, k in zip(pattern, path))
+
+
+def _leads_to(path, patterns):
+    return any(len(p) > len(path) and path_matches(p[:len(path)], path) for p in patterns)
+
+
+class ColumnBuilder:
+    """Appends YearlyData rows to float columns one row at a time"""
+
+    def __init__(self):
+        self.keys = {}
+        self.columns = {field: array('d') for field in CHART_FIELDS}
+        self.rows = 0
+        self._writers = None
+
+    def _resolve(self, row):
+        # The first row carrying a field decides its alias, as resolve_keys does
+        for field, aliases in CHART_FIELDS.items():
+            if field not in self.keys:
+                for alias in aliases:
+                    if alias in row:
+                        self.keys[field] = alias
+                        break
+        self._writers = [
+            (column.append, self.keys.get(field), math.nan if field in LABEL_FIELDS else 0.0)
+            for field, column in self.columns.items()
+        ]
+
+    def add(self, row):
+        if not isinstance(row, dict):
+            return
+        if self._writers is None or len(self.keys) < len(CHART_FIELDS):
+            self._resolve(row)
+        for append, key, default in self._writers:
+            append(default if key is None else to_number(row.get(key), default))
+        self.rows += 1
+
+    def finish(self):
+        return ChartColumns(keys=self.keys, **self.columns)
+
+
+class StreamParser:
+    """Recursive-descent JSON reader over a chunked binary stream"""
+
+    def __init__(self, stream, prefix=b'', columnar=COLUMNAR_PATHS, skipped=SKIPPED_PATHS):
+        self.stream = stream
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.json = json.JSONDecoder()
+        self.buf = self.decoder.decode(prefix)
+        self.pos = 0
+        self.eof = False
+        self.columnar = columnar
+        self.skipped = skipped
+
+    # ----- buffer -----
+
+    def _fill(self, size=CHUNK_SIZE):
+        """Read another chunk, dropping what has already been consumed"""
+        if self.eof:
+            return False
+        chunk = self.stream.read(max(size, CHUNK_SIZE))
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        if not chunk:
+            self.eof = True
+            self.buf += self.decoder.decode(b'', final=True)
+            return False
+        self.buf += self.decoder.decode(chunk)
+        return True
+
+    def _peek(self):
+        """Next non-whitespace character ('' at end of input)"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise json.JSONDecodeError(f'Expecting {char!r}', self.buf, self.pos)
+        self.pos += 1
+
+    def _string(self):
+        self._expect('"')
+        while True:
+            try:
+                value, end = scanstring(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            self.pos = end
+            return value
+
+    def _eager(self):
+        """Decode one complete value from the buffer, reading more as needed"""
+        self._peek()
+        while True:
+            try:
+                value, end = self.json.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Grow geometrically so a large value is not re-decoded per chunk
+                if self._fill(len(self.buf) - self.pos):
+                    continue
+                raise
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def _skip(self):
+        """Consume one value, decoding and dropping one element at a time"""
+        char = self._peek()
+        if char not in '[{':
+            self._eager()
+            return
+        self.pos += 1
+        close = ']' if char == '[' else '}'
+        if self._peek() == close:
+            self.pos += 1
+            return
+        while True:
+            if close == '}':
+                self._string()
+                self._expect(':')
+            self._eager()
+            if self._peek() == ',':
+                self.pos += 1
+                continue
+            self._expect(close)
+            return
+
+    # ----- structure -----
+
+    def value(self, path=()):
+        char = self._peek()
+        if any(path_matches(p, path) for p in self.columnar) and char == '[':
+            return self._columns()
+        if char == '{' and (_leads_to(path, self.columnar) or _leads_to(path, self.skipped)):
+            return self._object(path)
+        return self._eager()
+
+    def _object(self, path):
+        self._expect('{')
+        result = {}
+        if self._peek() == '}':
+            self.pos += 1
+            return result
+        while True:
+            key = self._string()
+            self._expect(':')
+            child = path + (key,)
+            if any(path_matches(p, child) for p in self.skipped):
+                self._skip()
+            else:
+                result[key] = self.value(child)
+            if self._peek() == ',':
+                self.pos += 1
+                continue
+            self._expect('}')
+            return result
+
+    def _columns(self):
+        self._expect('[')
+        builder = ColumnBuilder()
+        if self._peek() == ']':
+            self.pos += 1
+            return builder.finish()
+        while True:
+            builder.add(self._eager())
+            if self._peek() == ',':
+                self.pos += 1
+                continue
+            self._expect(']')
+            return builder.finish()
+
+    def parse(self):
+        result = self.value()
+        if self._peek():
+            raise json.JSONDecodeError('Extra data', self.buf, self.pos)
+        return result
+
+
+def load_json_stream(stream, prefix=b''):
+    """Parse a JSON payload from a binary stream, columnizing large lists on the fly"""
+    return StreamParser(stream, prefix).parse()
+
+
+def columnize(value, path=(), columnar=COLUMNAR_PATHS, skipped=SKIPPED_PATHS):
+    """Reduce an already decoded payload exactly as StreamParser does"""
+    if isinstance(value, list) and any(path_matches(p, path) for p in columnar):
+        builder = ColumnBuilder()
+        for row in value:
+            builder.add(row)
+        return builder.finish()
+    if isinstance(value, dict) and (_leads_to(path, columnar) or _leads_to(path, skipped)):
+        result = {}
+        for key, child in value.items():
+            child_path = path + (key,)
+            if not any(path_matches(p, child_path) for p in skipped):
+                result[key] = columnize(child, child_path, columnar, skipped)
+        return result
+    return value
+
+
+def stream_threshold():
+    """Payload size in bytes above which JSON is parsed incrementally"""
+    return int(float(os.environ.get('REPORT_STREAM_THRESHOLD_MB') or DEFAULT_STREAM_THRESHOLD_MB) * (1 << 20))
+
+
+def load_json(stream, prefix=b'', threshold=None):
+    """Parse a JSON payload: json.loads() when small, incrementally when large"""
+    threshold = stream_threshold() if threshold is None else threshold
+    head = prefix + stream.read(max(threshold + 1 - len(prefix), 0))
+    if len(head) <= threshold:
+        return columnize(json.loads(head))
+    return load_json_stream(stream, prefix=head)
@@ -0,0 +1,411 @@
+"""
+Australian Retirement Planning - Vectorized Projection Engine
+
+Python port of calculateRetirementProjection (lib/calculations/projection.ts).
+The year-by-year model is the same: buffer-first withdrawals, surplus
+income parked in cash and rebalanced into the buffer, cumulative inflation,
+one-off expenses, guardrails, splurge spending and the Age Pension asset
+and income tests. The state is held as vectors over N scenarios and
+advanced one year at a time, so a Monte Carlo run or a set of stress tests
+is projected in a single sweep rather than one projection per scenario.
+
+Requires NumPy. Run directly to cross-check a payload's chartData:
+    python projection_engine.py <input_json>
+"""
+
+import json
+import sys
+
+import numpy as np
+
+from report_data import chart_columns, to_number
+
+
+START_YEAR = 2026
+FINAL_AGE = 100
+
+# Mirrors lib/data/constants.ts
+SCENARIO_RETURNS = {1: 4.5, 2: 6.0, 3: 7.0, 4: 8.0, 5: 9.0}
+DEFAULT_SCENARIO_RETURN = SCENARIO_RETURNS[3]
+
+AGE_PENSION_THRESHOLDS = {
+    'single': {
+        'maxRate': 29754,
+        'assetThresholdHomeowner': 314000,
+        'assetThresholdNonHomeowner': 566000,
+        'assetTaperRate': 3.00 / 1000 * 26,
+        'incomeThreshold': 212,
+        'incomeTaperRate': 0.50,
+    },
+    'couple': {
+        'maxRate': 44855,
+        'assetThresholdHomeowner': 470000,
+        'assetThresholdNonHomeowner': 722000,
+        'assetTaperRate': 3.00 / 1000 * 26,
+        'incomeThreshold': 372,
+        'incomeTaperRate': 0.50,
+    },
+}
+
+SPENDING_PATTERNS = {
+    'jpmorgan': ((60, 65, 70, 75, 80, 85, 90, 95, 100),
+                 (1.0, 0.97, 0.93, 0.89, 0.85, 0.80, 0.75, 0.70, 0.65)),
+    'ageadjusted': ((60, 65, 70, 75, 80, 85, 90, 95, 100),
+                    (1.0, 0.95, 0.90, 0.85, 0.78, 0.72, 0.68, 0.65, 0.62)),
+}
+
+# ProjectionResult series -> YearlyData key
+SERIES_KEYS = {
+    'main_super': 'mainSuper',
+    'buffer': 'buffer',
+    'cash': 'cash',
+    'total_balance': 'totalBalance',
+    'income': 'income',
+    'spending': 'spending',
+    'age_pension': 'agePension',
+    'withdrawal': 'withdrawal',
+}
+
+
+def scenario_return(scenario):
+    """Return rate (%) for a selectedScenario index"""
+    try:
+        return SCENARIO_RETURNS.get(int(scenario), DEFAULT_SCENARIO_RETURN)
+    except (TypeError, ValueError):
+        return DEFAULT_SCENARIO_RETURN
+
+
+def spending_multiplier(age, pattern):
+    """Age-based spending multiplier (linear between the pattern's ages)"""
+    if pattern not in SPENDING_PATTERNS:
+        return 1.0
+    ages, multipliers = SPENDING_PATTERNS[pattern]
+    return float(np.interp(age, ages, multipliers))
+
+
+def splurge_amount(age, amount, start_age, duration, ramp_down_years):
+    """Splurge spending at an age, including the optional ramp-down"""
+    end_age = start_age + duration
+    if age < start_age or age >= end_age:
+        return 0.0
+    ramp_start = end_age - ramp_down_years
+    if ramp_down_years == 0 or age < ramp_start:
+        return amount
+    return amount * (1 - (age - ramp_start) / ramp_down_years)
+
+
+def age_pension(total_balance, pension_income, is_homeowner, recipient_type='couple'):
+    """Annual Age Pension: the lower of the asset and income tests (vectorized over balances)"""
+    t = AGE_PENSION_THRESHOLDS[recipient_type]
+    threshold = t['assetThresholdHomeowner'] if is_homeowner else t['assetThresholdNonHomeowner']
+    asset_test = np.maximum(0.0, t['maxRate'] - np.maximum(0.0, total_balance - threshold) * t['assetTaperRate'])
+
+    fortnightly = pension_income / 26
+    if fortnightly <= t['incomeThreshold']:
+        income_test = t['maxRate']
+    else:
+        reduction = (fortnightly - t['incomeThreshold']) * t['incomeTaperRate']
+        income_test = max(0.0, (t['maxRate'] / 26 - reduction) * 26)
+    return np.maximum(0.0, np.minimum(asset_test, income_test))
+
+
+class ProjectionParams:
+    """Plan inputs for a projection, read from a report payload"""
+
+    __slots__ = ('current_age', 'retirement_age', 'main_super', 'buffer',
+                 'pension_income', 'base_spending', 'inflation_rate',
+                 'selected_scenario', 'is_homeowner', 'include_age_pension',
+                 'spending_pattern', 'show_nominal', 'use_guardrails',
+                 'upper_guardrail', 'lower_guardrail', 'guardrail_adjustment',
+                 'splurge_amount', 'splurge_start_age', 'splurge_duration',
+                 'splurge_ramp_down_years', 'one_off_expenses', 'debt_total')
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    @classmethod
+    def from_payload(cls, data):
+        """Params from the RetirementData payload posted to the report routes"""
+        guardrails = data.get('guardrailParams') or data
+        debt = data.get('debtParams') or data
+        debts = (debt.get('debts') or []) if debt.get('includeDebt') else []
+        return cls(
+            current_age=int(to_number(data.get('currentAge'), 55)),
+            retirement_age=int(to_number(data.get('retirementAge'), 60)),
+            main_super=to_number(data.get('mainSuperBalance')),
+            buffer=to_number(data.get('sequencingBuffer')),
+            pension_income=to_number(data.get('totalPensionIncome')),
+            base_spending=to_number(data.get('baseSpending')),
+            inflation_rate=to_number(data.get('inflationRate'), 2.5),
+            selected_scenario=data.get('selectedScenario'),
+            is_homeowner=bool(data.get('isHomeowner')),
+            include_age_pension=bool(data.get('includeAgePension')),
+            spending_pattern=data.get('spendingPattern') or 'constant',
+            show_nominal=bool(data.get('showNominalDollars')),
+            use_guardrails=bool(guardrails.get('useGuardrails') or data.get('useGuardrails')),
+            upper_guardrail=to_number(guardrails.get('upperGuardrail')),
+            lower_guardrail=to_number(guardrails.get('lowerGuardrail')),
+            guardrail_adjustment=to_number(guardrails.get('guardrailAdjustment')),
+            splurge_amount=to_number(data.get('splurgeAmount')),
+            splurge_start_age=to_number(data.get('splurgeStartAge')),
+            splurge_duration=to_number(data.get('splurgeDuration')),
+            splurge_ramp_down_years=to_number(data.get('splurgeRampDownYears')),
+            one_off_expenses=[
+                (to_number(e.get('age')), to_number(e.get('amount')))
+                for e in data.get('oneOffExpenses') or [] if isinstance(e, dict)
+            ],
+            debt_total=sum(to_number(d.get('amount')) for d in debts if isinstance(d, dict)),
+        )
+
+    @property
+    def ages(self):
+        return np.arange(self.current_age, FINAL_AGE + 1, dtype=np.float64)
+
+
+def survived(final_balance, lengths, years):
+    """Whether each path succeeded: lasted its years with a final balance >= 0.
+
+    This is the one success rule of the server engines (projections, Monte
+    Carlo, historical backtests and stress tests), taken from runFormalTests.
+    The client's isProjectionSuccessful, runMonteCarloSimulation and
+    runHistoricalMonteCarlo count a final balance > 0 instead, so a path
+    ending on exactly $0 in its last year succeeds here but fails there.
+    Paths that run out earlier end at or below zero short of their years and
+    fail under both rules.
+    """
+    return (np.asarray(lengths) >= years) & (np.asarray(final_balance) >= 0)
+
+
+class ProjectionResult:
+    """Year-by-year series for N scenarios as (N, years) arrays.
+
+    The arrays are transposed views of year-major storage, so .T gives
+    contiguous per-year rows across scenarios.
+
+    Values are NaN after a path is exhausted (the TS loop stops recording
+    there); lengths holds the number of recorded years for each path.
+    """
+
+    __slots__ = ('ages', 'years', 'inflation', 'market_return', 'lengths',
+                 'base_spending') + tuple(SERIES_KEYS)
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    def __len__(self):
+        return len(self.lengths)
+
+    @property
+    def final_balance(self):
+        """Balance at the last recorded year of each path"""
+        rows = np.arange(len(self.lengths))
+        return self.total_balance[rows, np.maximum(self.lengths - 1, 0)]
+
+    def survived(self, years=None):
+        """Success of each path over years (default: every projected year)"""
+        return survived(self.final_balance, self.lengths, len(self.ages) if years is None else years)
+
+    @property
+    def success(self):
+        return self.survived()
+
+    @property
+    def success_rate(self):
+        return float(self.success.mean() * 100) if len(self) else 0.0
+
+    @property
+    def exhaustion_age(self):
+        """Age at which each path ran out (NaN if it never did)"""
+        exhausted = self.total_balance <= 0
+        first = exhausted.argmax(axis=1)
+        return np.where(exhausted.any(axis=1), self.ages[first], np.nan)
+
+    def chart_data(self, index=0):
+        """One path as a YearlyData[] list, matching the TS projection output"""
+        rows = []
+        for y in range(int(self.lengths[index])):
+            row = {'age': int(self.ages[y]), 'year': int(self.years[y])}
+            for name, key in SERIES_KEYS.items():
+                row[key] = float(getattr(self, name)[index, y])
+            row['marketReturn'] = float(self.market_return[index, y])
+            row['inflationAdjustment'] = float(self.inflation[y])
+            row['baseSpendingReal'] = self.base_spending
+            row['baseSpendingNominal'] = self.base_spending * float(self.inflation[y])
+            row['inAgedCare'] = False
+            row['partnerInAgedCare'] = False
+            row['partnerAlive'] = True
+            rows.append(row)
+        return rows
+
+
+def project(params, returns=None, scenarios=None, keep=None, years=None):
+    """Project N scenarios together.
+
+    returns is an (N, years) or (years,) array of annual returns in percent;
+    years beyond its width fall back to the scenario return, as in the TS
+    model. Without returns a single deterministic path is projected.
+
+    keep limits the recorded series to those names (total_balance is always
+    kept); the others are None on the result. Large simulations that only
+    need a few series use it to save memory. years stops the projection
+    after that many years instead of at age 100.
+    """
+    ages = params.ages if years is None else params.ages[:years]
+    n_years = len(ages)
+    fixed_return = scenario_return(params.selected_scenario)
+
+    if returns is None:
+        returns = np.empty((scenarios or 1, 0))
+    returns = np.asarray(returns, dtype=np.float64)
+    if returns.ndim == 1:
+        returns = returns[np.newaxis, :]
+    n = returns.shape[0]
+
+    # Year-major (years, N) layout keeps every per-year read and write contiguous
+    market = np.full((n_years, n), fixed_return)
+    width = min(returns.shape[1], n_years)
+    market[:width] = returns[:, :width].T
+
+    main_super = np.full(n, params.main_super, dtype=np.float64)
+    buffer = np.full(n, params.buffer, dtype=np.float64)
+    cash = np.zeros(n)
+    initial_total = params.main_super + params.buffer
+    base = params.base_spending
+
+    # Debts are paid from the buffer first, then super, when already retired
+    if params.debt_total and params.current_age >= params.retirement_age:
+        from_buffer = min(params.buffer, params.debt_total)
+        buffer -= from_buffer
+        main_super = np.maximum(0.0, main_super - (params.debt_total - from_buffer))
+
+    one_off = {}
+    for age, amount in params.one_off_expenses:
+        one_off[age] = one_off.get(age, 0.0) + amount
+
+    recorded = SERIES_KEYS if keep is None else set(keep) | {'total_balance'}
+    series = {name: np.zeros((n_years, n)) for name in SERIES_KEYS if name in recorded}
+    scratch = {name: np.zeros(n) for name in SERIES_KEYS if name not in recorded}
+    inflation = np.ones(n_years)
+    active = np.ones(n, dtype=bool)
+    lengths = np.zeros(n, dtype=np.int64)
+    cumulative_inflation = 1.0
+    total = np.empty(n)
+
+    for y, age in enumerate(ages):
+        cumulative_inflation *= 1 + params.inflation_rate / 100
+        inflation[y] = cumulative_inflation
+        out = {name: values[y] for name, values in series.items()}
+        out.update(scratch)
+
+        if age >= params.retirement_age:
+            np.add(main_super, buffer, out=total)
+            total += cash
+
+            pension = 0.0
+            if params.include_age_pension:
+                pension = age_pension(total, params.pension_income, params.is_homeowner) * cumulative_inflation
+
+            spending = base * spending_multiplier(age, params.spending_pattern)
+            if params.use_guardrails:
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    percentage = total / initial_total * 100
+                adjustment = params.guardrail_adjustment / 100
+                factor = np.where(percentage >= 100 + params.upper_guardrail, 1 + adjustment,
+                                  np.where(percentage <= 100 - params.lower_guardrail, 1 - adjustment, 1.0))
+                spending = spending * factor
+            spending = spending + splurge_amount(age, params.splurge_amount, params.splurge_start_age,
+                                                 params.splurge_duration, params.splurge_ramp_down_years)
+            spending = spending * cumulative_inflation + one_off.get(age, 0.0) * cumulative_inflation
+            income = params.pension_income * cumulative_inflation + pension
+
+            # Withdraw from the buffer first, then super; surplus goes to cash
+            withdrawal = out['withdrawal']
+            np.subtract(spending, income, out=withdrawal)
+            np.maximum(withdrawal, 0.0, out=withdrawal)
+            from_buffer = np.minimum(buffer, withdrawal)
+            buffer -= from_buffer
+            main_super -= withdrawal - from_buffer
+            np.maximum(main_super, 0.0, out=main_super)
+            cash += np.maximum(np.subtract(income, spending), 0.0)
+
+            out['income'][:] = income
+            out['spending'][:] = spending
+            out['age_pension'][:] = pension
+
+        multiplier = 1 + market[y] / 100
+        main_super *= multiplier
+        buffer *= multiplier
+
+        # Move surplus cash into the buffer once it exceeds two years' spending
+        rebalance = cash > base * 2 * cumulative_inflation
+        if rebalance.any():
+            excess = (cash - base * cumulative_inflation) * rebalance
+            buffer += excess
+            cash -= excess
+
+        out['main_super'][:] = main_super
+        out['buffer'][:] = buffer
+        out['cash'][:] = cash
+        balance = out['total_balance']
+        np.add(main_super, buffer, out=balance)
+        balance += cash
+
+        # Paths stop recording once exhausted
+        lengths += active
+        active &= balance > 0
+        if not active.any():
+            break
+
+    # Blank out the years after each path stopped, then convert to real dollars
+    stopped = np.arange(n_years)[:, np.newaxis] >= lengths[np.newaxis, :]
+    display = np.ones(n_years) if params.show_nominal else 1 / inflation
+    for values in series.values():
+        values *= display[:, np.newaxis]
+        values[stopped] = np.nan
+    market[stopped] = np.nan
+
+    return ProjectionResult(
+        ages=ages,
+        years=START_YEAR + np.arange(n_years),
+        inflation=inflation,
+        market_return=market.T,
+        lengths=lengths,
+        base_spending=base,
+        **{name: values.T for name, values in series.items()},
+    )
+
+
+def project_payload(data, returns=None):
+    """Project the plan described by a report payload"""
+    return project(ProjectionParams.from_payload(data), returns)
+
+
+def compare_chart_data(result, chart_data, index=0):
+    """Largest absolute difference per column between a path and posted chartData"""
+    posted = chart_columns(chart_data)
+    count = min(len(posted), int(result.lengths[index]))
+    differences = {'rows': count, 'posted_rows': len(posted), 'projected_rows': int(result.lengths[index])}
+    for name in ('total_balance', 'main_super', 'buffer', 'income', 'spending'):
+        if name not in posted.keys:
+            continue
+        expected = np.frombuffer(getattr(posted, name), dtype=np.float64)[:count]
+        actual = getattr(result, name)[index, :count]
+        differences[name] = float(np.abs(actual - expected).max()) if count else 0.0
+    return differences
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: projection_engine.py <input_json>")
+        sys.exit(1)
+
+    with open(sys.argv[1], 'r') as f:
+        data = json.load(f)
+
+    result = project_payload(data)
+    print(json.dumps(compare_chart_data(result, data.get('chartData', [])), indent=2))
+
+if __name__ == "__main__":
+    main()
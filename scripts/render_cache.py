@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Australian Retirement Planning - Render Cache
+
+Content-addressed cache in front of the PDF and DOCX renderers. A render is
+keyed on a canonical hash of the payload, the output format, the template
+version (a hash of the generator sources) and the date printed on the
+cover, so a repeat request for the same client returns the stored bytes
+instead of redoing the ReportLab layout or python-docx build.
+
+Two tiers, both size-bounded LRUs:
+    memory   per process, useful in the long-lived worker and render pool
+    disk     shared between processes, one file per report under a directory
+
+YearlyData[] lists hash by their normalized columns, so the same plan sent
+as JSON rows, streamed JSON or a columnar bundle maps to the same entry.
+Set reportDate in the payload (or SOURCE_DATE_EPOCH) to pin the report date
+and make renders reproducible; otherwise entries are only reused on the day
+they were rendered.
+
+Configuration (environment):
+    REPORT_CACHE=0                 disable caching
+    REPORT_CACHE_DIR=PATH          enable the disk tier
+    REPORT_CACHE_DISK_MB=512       disk tier budget
+    REPORT_CACHE_MEMORY_MB=32      in-process tier budget (0 disables it)
+
+Usage:
+    render_cache.py stats [DIR]
+    render_cache.py clear [DIR]
+"""
+
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+
+from payload_stream import COLUMNAR_PATHS, SKIPPED_PATHS, path_matches
+from report_data import CHART_FIELDS, ChartColumns, is_rows, report_date, report_timestamp
+
+
+# Bump when report output changes in a way the source hash cannot see
+# (e.g. a fonts or template asset update)
+TEMPLATE_VERSION = 1
+
+DEFAULT_MEMORY_MB = 32
+DEFAULT_DISK_MB = 512
+
+ENTRY_SUFFIX = '.bin'
+
+_template_digest = None
+
+
+def template_version():
+    """Hash of TEMPLATE_VERSION and every script the generators are built from"""
+    global _template_digest
+    if _template_digest is None:
+        digest = hashlib.sha256(str(TEMPLATE_VERSION).encode())
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for name in sorted(os.listdir(directory)):
+            if name.endswith('.py'):
+                with open(os.path.join(directory, name), 'rb') as f:
+                    digest.update(name.encode() + b'\0' + f.read())
+        _template_digest = digest.hexdigest()[:16]
+    return _template_digest
+
+
+# ========== KEYS ==========
+
+def _feed(update, value, path=()):
+    """Feed a canonical encoding of a payload value to a hash"""
+    if any(path_matches(p, path) for p in COLUMNAR_PATHS) and is_rows(value):
+        value = value if isinstance(value, ChartColumns) else ChartColumns.from_rows(value)
+        update(b'C')
+        for field in CHART_FIELDS:
+            column = memoryview(getattr(value, field)).tobytes()
+            update(field.encode() + len(column).to_bytes(8, 'little') + column)
+    elif isinstance(value, dict):
+        update(b'{')
+        for key in sorted(value, key=str):
+            child = path + (key,)
+            if any(path_matches(p, child) for p in SKIPPED_PATHS):
+                continue
+            update(json.dumps(str(key)).encode() + b':')
+            _feed(update, value[key], child)
+            update(b',')
+        update(b'}')
+    elif isinstance(value, (list, tuple)):
+        update(b'[')
+        for item in value:
+            _feed(update, item, path + ('*',))
+            update(b',')
+        update(b']')
+    else:
+        update(json.dumps(value, default=str).encode())
+
+
+def payload_digest(data):
+    """Canonical SHA-256 of a payload (key order and row encoding do not matter)"""
+    digest = hashlib.sha256()
+    _feed(digest.update, data)
+    return digest.hexdigest()
+
+
+def cache_key(fmt, data):
+    """Cache key for rendering data as fmt"""
+    # Unpinned reports print today's date, so they are only reused within a day
+    timestamp = report_timestamp(data)
+    stamp = report_date(data).date().isoformat() if timestamp is None else str(timestamp)
+    return f'{fmt}-{template_version()}-{stamp}-{payload_digest(data)}'
+
+
+def is_cacheable(data):
+    """False when a render is not a pure function of its payload"""
+    options = data.get('serverMonteCarlo')
+    if options and report_timestamp(data) is None:
+        # Unseeded simulations differ on every run unless the date pins the seed
+        return isinstance(options, dict) and options.get('seed') is not None
+    return True
+
+
+# ========== TIERS ==========
+
+class MemoryTier:
+    """In-process LRU of rendered bytes, bounded by total size"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.evictions = 0
+
+    def get(self, key):
+        body = self.entries.get(key)
+        if body is not None:
+            self.entries.move_to_end(key)
+        return body
+
+    def put(self, key, body):
+        if len(body) > self.max_bytes:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes -= len(old)
+        self.entries[key] = body
+        self.bytes += len(body)
+        while self.bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= len(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+
+class DiskTier:
+    """LRU of rendered bytes under a directory, ordered by file mtime.
+
+    Hits touch the file, so several processes sharing the directory keep a
+    common recency order. Writes are atomic (temp file + rename).
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._bytes = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def _scan(self):
+        """(mtime, size, path) of every entry, oldest first"""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(ENTRY_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        return entries
+
+    @property
+    def bytes(self):
+        if self._bytes is None:
+            self._bytes = sum(size for _, size, _ in self._scan())
+        return self._bytes
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                body = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return body
+
+    def put(self, key, body):
+        if len(body) > self.max_bytes:
+            return
+        current = self.bytes
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(body)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+        self._bytes = current + len(body)
+        if self._bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        # Re-read the directory: other processes may have added or touched entries
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._bytes = total
+
+    def clear(self):
+        for _, _, path in self._scan():
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+        self._bytes = 0
+
+
+# ========== CACHE ==========
+
+class RenderCache:
+    """Memory tier in front of an optional disk tier, with hit/miss counters"""
+
+    def __init__(self, memory_bytes=DEFAULT_MEMORY_MB << 20, directory=None,
+                 disk_bytes=DEFAULT_DISK_MB << 20):
+        self.memory = MemoryTier(memory_bytes) if memory_bytes > 0 else None
+        self.disk = DiskTier(directory, disk_bytes) if directory else None
+        self._lock = threading.Lock()
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0, 'bypassed': 0}
+
+    @classmethod
+    def from_env(cls):
+        """Cache configured from REPORT_CACHE* (None when disabled)"""
+        if os.environ.get('REPORT_CACHE', '').strip() == '0':
+            return None
+        memory_mb = float(os.environ.get('REPORT_CACHE_MEMORY_MB', DEFAULT_MEMORY_MB))
+        disk_mb = float(os.environ.get('REPORT_CACHE_DISK_MB', DEFAULT_DISK_MB))
+        directory = os.environ.get('REPORT_CACHE_DIR', '').strip() or None
+        if memory_mb <= 0 and directory is None:
+            return None
+        return cls(int(memory_mb * (1 << 20)), directory, int(disk_mb * (1 << 20)))
+
+    def get(self, key):
+        with self._lock:
+            if self.memory is not None:
+                body = self.memory.get(key)
+                if body is not None:
+                    self._stats['memory_hits'] += 1
+                    return body
+            if self.disk is not None:
+                body = self.disk.get(key)
+                if body is not None:
+                    self._stats['disk_hits'] += 1
+                    if self.memory is not None:
+                        self.memory.put(key, body)
+                    return body
+            self._stats['misses'] += 1
+            return None
+
+    def put(self, key, body):
+        with self._lock:
+            self._stats['stores'] += 1
+            if self.memory is not None:
+                self.memory.put(key, body)
+            if self.disk is not None:
+                self.disk.put(key, body)
+
+    def render(self, fmt, data, renderer):
+        """Stored bytes for (fmt, data), rendering and storing them on a miss"""
+        if not is_cacheable(data):
+            with self._lock:
+                self._stats['bypassed'] += 1
+            return renderer(data)
+        key = cache_key(fmt, data)
+        body = self.get(key)
+        if body is None:
+            body = renderer(data)
+            self.put(key, body)
+        return body
+
+    def clear(self):
+        with self._lock:
+            for tier in (self.memory, self.disk):
+                if tier is not None:
+                    tier.clear()
+
+    def stats(self):
+        """Hit/miss/eviction counters and tier sizes"""
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+            stats['hit_rate'] = round((lookups - stats['misses']) / lookups, 4) if lookups else 0.0
+            if self.memory is not None:
+                stats.update(memory_entries=len(self.memory.entries),
+                             memory_bytes=self.memory.bytes,
+                             memory_evictions=self.memory.evictions)
+            if self.disk is not None:
+                stats.update(disk_bytes=self.disk.bytes,
+                             disk_evictions=self.disk.evictions)
+            return stats
+
+
+_default_cache = None
+_default_loaded = False
+
+
+def default_cache():
+    """Process-wide cache configured from the environment (None when disabled)"""
+    global _default_cache, _default_loaded
+    if not _default_loaded:
+        _default_cache = RenderCache.from_env()
+        _default_loaded = True
+    return _default_cache
+
+
+def cached_render(fmt, data, renderer):
+    """renderer(data) through the process-wide cache, if one is enabled"""
+    cache = default_cache()
+    if cache is None:
+        return renderer(data)
+    return cache.render(fmt, data, renderer)
+
+
+def cache_stats():
+    """Stats of the process-wide cache, or None if it is disabled or unused"""
+    return _default_cache.stats() if _default_cache is not None else None
+
+
+def main():
+    if len(sys.argv) not in (2, 3) or sys.argv[1] not in ('stats', 'clear'):
+        print("Usage: render_cache.py stats|clear [DIR]")
+        sys.exit(1)
+
+    directory = sys.argv[2] if len(sys.argv) == 3 else os.environ.get('REPORT_CACHE_DIR')
+    if not directory:
+        print("No cache directory given (pass DIR or set REPORT_CACHE_DIR)")
+        sys.exit(1)
+
+    disk = DiskTier(directory, DEFAULT_DISK_MB << 20)
+    if sys.argv[1] == 'clear':
+        disk.clear()
+        print(f"Render cache cleared: {directory}")
+        return
+    entries = disk._scan()
+    print(json.dumps({
+        'directory': directory,
+        'entries': len(entries),
+        'bytes': sum(size for _, size, _ in entries),
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
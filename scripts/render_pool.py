@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Australian Retirement Planning - Render Pool Server
+
+Pre-forks a fixed number of worker processes that each import both report
+generators once, then serves PDF and DOCX render jobs over a Unix socket
+using the render_protocol framing.
+
+Memory stays within a fixed envelope: at most --workers interpreters exist,
+at most --queue-size jobs wait behind them, and anything beyond that is
+rejected immediately with a retryable "busy" error instead of forking more
+processes. Jobs that exceed --timeout have their worker killed and replaced.
+
+Usage:
+    render_pool.py --socket PATH [--workers N] [--queue-size N] [--timeout SECS]
+    render_pool.py --socket PATH --probe
+"""
+
+import multiprocessing
+import os
+import queue
+import socketserver
+import sys
+import threading
+import time
+
+from render_protocol import ProtocolError, decode_message, probe, read_frame, write_message
+
+
+class PoolBusy(Exception):
+    """Raised when the job queue is full (backpressure)"""
+
+
+class JobTimeout(Exception):
+    """Raised when a job runs past its timeout"""
+
+
+class JobFailed(Exception):
+    """Raised when a renderer raises inside a worker"""
+
+
+def load_renderers():
+    """Import both generators (done once per worker process)"""
+    from generate_pdf_report import render_pdf_bytes
+    from generate_retirement_docx import render_docx_bytes
+    return {'pdf': render_pdf_bytes, 'docx': render_docx_bytes}
+
+
+def _worker_main(conn, loader):
+    """Worker process loop: receive (format, data), reply (ok, bytes-or-error)"""
+    renderers = loader()
+    conn.send(('ready', os.getpid()))
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            return
+        if job is None:
+            return
+        fmt, data = job
+        try:
+            conn.send((True, renderers[fmt](data)))
+        except Exception as e:
+            conn.send((False, f'{type(e).__name__}: {e}'))
+
+
+class _Job:
+    """A queued render request"""
+
+    def __init__(self, fmt, data, timeout):
+        self.fmt = fmt
+        self.data = data
+        self.timeout = timeout
+        self.enqueued = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _WorkerSlot:
+    """One pre-forked worker process plus the thread that feeds it"""
+
+    def __init__(self, pool, index):
+        self.pool = pool
+        self.index = index
+        self.process = None
+        self.conn = None
+        self.jobs_served = 0
+        self.busy = False
+
+    def spawn(self):
+        parent_conn, child_conn = self.pool.context.Pipe()
+        self.process = self.pool.context.Process(
+            target=_worker_main, args=(child_conn, self.pool.loader),
+            name=f'render-worker-{self.index}', daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.jobs_served = 0
+        if not self.conn.poll(self.pool.startup_timeout):
+            self.kill()
+            raise RuntimeError(f'Worker {self.index} did not become ready')
+        self.conn.recv()
+
+    def kill(self):
+        if self.process is not None and self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        if self.conn is not None:
+            self.conn.close()
+        self.process = None
+        self.conn = None
+
+    def stop(self):
+        if self.process is not None and self.process.is_alive():
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+            self.process.join(timeout=5)
+        self.kill()
+
+    def respawn(self):
+        """Replace the worker process; a failed spawn is retried on the next job"""
+        self.kill()
+        self.pool._count('restarts')
+        try:
+            self.spawn()
+        except (RuntimeError, OSError) as e:
+            print(f"Render worker {self.index} failed to restart: {e}", file=sys.stderr)
+
+    def run(self):
+        """Dispatcher thread: pull jobs off the shared queue into this worker"""
+        while True:
+            job = self.pool.jobs.get()
+            if job is None:
+                return
+            self.busy = True
+            try:
+                self._run_job(job)
+            finally:
+                self.busy = False
+                job.done.set()
+
+    def _run_job(self, job):
+        self.pool._record_wait(time.perf_counter() - job.enqueued)
+        if self.process is None or not self.process.is_alive():
+            self.respawn()
+            if self.process is None:
+                job.error = JobFailed('No render worker available')
+                self.pool._count('failed')
+                return
+        try:
+            self.conn.send((job.fmt, job.data))
+            ready = self.conn.poll(job.timeout)
+            if ready:
+                ok, value = self.conn.recv()
+        except (EOFError, OSError) as e:
+            job.error = JobFailed(f'Worker crashed: {e}')
+            self.pool._count('failed')
+            self.respawn()
+            return
+
+        if not ready:
+            job.error = JobTimeout(f'Render exceeded {job.timeout}s')
+            self.pool._count('timed_out')
+            self.respawn()
+            return
+
+        if ok:
+            job.result = value
+            self.pool._count('completed')
+        else:
+            job.error = JobFailed(value)
+            self.pool._count('failed')
+
+        self.jobs_served += 1
+        if self.pool.max_jobs_per_worker and self.jobs_served >= self.pool.max_jobs_per_worker:
+            # Recycle long-lived workers so heap growth can't accumulate
+            self.respawn()
+
+
+class RenderPool:
+    """Fixed-size pool of report render workers with a bounded queue"""
+
+    def __init__(self, workers=None, queue_size=64, job_timeout=60,
+                 max_jobs_per_worker=500, startup_timeout=60, loader=load_renderers):
+        # loader runs in each worker and returns the renderers by format;
+        # it must be a module-level function so spawned workers can import it
+        self.loader = loader
+        self.size = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.job_timeout = job_timeout
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.startup_timeout = startup_timeout
+        # Spawn (not fork) so workers never inherit the dispatcher threads
+        self.context = multiprocessing.get_context('spawn')
+        self.jobs = queue.Queue(maxsize=queue_size)
+        self.slots = [_WorkerSlot(self, i) for i in range(self.size)]
+        self.threads = []
+        self.started = None
+        self._lock = threading.Lock()
+        self._stats = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'timed_out': 0,
+            'rejected': 0,
+            'restarts': 0,
+        }
+        self._max_depth = 0
+        self._wait_total = 0.0
+        self._wait_count = 0
+
+    def start(self):
+        for slot in self.slots:
+            slot.spawn()
+        for slot in self.slots:
+            thread = threading.Thread(target=slot.run, name=f'render-dispatch-{slot.index}', daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        self.started = time.time()
+        return self
+
+    def close(self):
+        for _ in self.threads:
+            self.jobs.put(None)
+        for thread in self.threads:
+            thread.join(timeout=self.job_timeout)
+        for slot in self.slots:
+            slot.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def _record_wait(self, seconds):
+        with self._lock:
+            self._wait_total += seconds
+            self._wait_count += 1
+
+    def submit(self, fmt, data, timeout=None):
+        """Render one document, blocking until done. Raises PoolBusy when full."""
+        if fmt not in ('pdf', 'docx'):
+            raise ValueError(f'Unsupported format: {fmt}')
+        job = _Job(fmt, data, timeout or self.job_timeout)
+        try:
+            self.jobs.put_nowait(job)
+        except queue.Full:
+            self._count('rejected')
+            raise PoolBusy(f'Render queue full ({self.queue_size} jobs waiting)')
+        self._count('submitted')
+        with self._lock:
+            self._max_depth = max(self._max_depth, self.jobs.qsize())
+        job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    def metrics(self):
+        """Queue-depth and throughput counters for health checks and dashboards"""
+        with self._lock:
+            stats = dict(self._stats)
+            max_depth = self._max_depth
+            avg_wait = self._wait_total / self._wait_count if self._wait_count else 0.0
+        alive = sum(1 for slot in self.slots if slot.process is not None and slot.process.is_alive())
+        return dict(
+            stats,
+            workers=self.size,
+            workers_alive=alive,
+            workers_busy=sum(1 for slot in self.slots if slot.busy),
+            queue_depth=self.jobs.qsize(),
+            queue_capacity=self.queue_size,
+            max_queue_depth=max_depth,
+            avg_queue_wait=round(avg_wait, 4),
+            uptime=round(time.time() - self.started, 3) if self.started else 0,
+        )
+
+
+def serve(pool, path):
+    """Serve the pool over a Unix socket (one thread per client connection)"""
+    if os.path.exists(path):
+        os.unlink(path)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            while True:
+                try:
+                    payload = read_frame(self.rfile)
+                    if payload is None:
+                        return
+                    request = decode_message(payload)
+                except ProtocolError as e:
+                    write_message(self.wfile, {'ok': False, 'error': str(e)})
+                    return
+                header, body = handle_request(pool, request)
+                write_message(self.wfile, header, body)
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    server = Server(path, Handler)
+    print(f"Render pool ({pool.size} workers, queue {pool.queue_size}) listening on {path}", file=sys.stderr)
+    try:
+        server.serve_forever(poll_interval=0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def handle_request(pool, request):
+    """Map one protocol request onto the pool, returning (header, body)"""
+    if not isinstance(request, dict):
+        return {'id': None, 'ok': False, 'error': 'Request must be a JSON object'}, None
+    request_id = request.get('id')
+    op = request.get('op', 'render')
+
+    if op in ('health', 'metrics'):
+        metrics = pool.metrics()
+        ready = metrics['workers_alive'] == metrics['workers']
+        return dict(metrics, id=request_id, ok=True, status='ready' if ready else 'degraded'), None
+
+    if op != 'render':
+        return {'id': request_id, 'ok': False, 'error': f'Unknown op: {op}'}, None
+
+    fmt = request.get('format', 'pdf')
+    started = time.perf_counter()
+    try:
+        body = pool.submit(fmt, request.get('data') or {}, timeout=request.get('timeout'))
+    except PoolBusy as e:
+        return {'id': request_id, 'ok': False, 'error': str(e), 'busy': True, 'retryable': True}, None
+    except (JobTimeout, JobFailed, ValueError) as e:
+        return {'id': request_id, 'ok': False, 'error': str(e)}, None
+
+    header = {
+        'id': request_id,
+        'ok': True,
+        'format': fmt,
+        'elapsed': round(time.perf_counter() - started, 4),
+    }
+    return header, body
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Pre-forked render pool for PDF and DOCX reports')
+    parser.add_argument('--socket', required=True, help='Unix socket path to serve on')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--queue-size', type=int, default=64, help='Jobs allowed to wait before rejecting')
+    parser.add_argument('--timeout', type=float, default=60, help='Per-job timeout in seconds')
+    parser.add_argument('--max-jobs-per-worker', type=int, default=500,
+                        help='Recycle a worker after this many jobs (0 = never)')
+    parser.add_argument('--probe', action='store_true', help='Check the pool on --socket and exit')
+    args = parser.parse_args()
+
+    if args.probe:
+        sys.exit(probe(args.socket))
+
+    pool = RenderPool(
+        workers=args.workers,
+        queue_size=args.queue_size,
+        job_timeout=args.timeout,
+        max_jobs_per_worker=args.max_jobs_per_worker,
+    )
+    with pool:
+        serve(pool, args.socket)
+
+
+if __name__ == "__main__":
+    main()
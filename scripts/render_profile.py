@@ -0,0 +1,150 @@
+"""
+Australian Retirement Planning - Render Profiling
+
+Opt-in per-section instrumentation for both report generators. For each
+section it records wall time, peak traced allocation (tracemalloc) and how
+many flowables (PDF story items) or body elements (DOCX) it added, then
+emits one JSON record per report. A render that raises still emits its
+record, with the error and the section it failed in.
+
+Enable with the REPORT_PROFILE environment variable:
+    REPORT_PROFILE=stderr              JSON record on stderr
+    REPORT_PROFILE=/path/metrics.jsonl one JSON line appended per report
+or pass a RenderProfiler to generate_pdf_report() / build_document().
+"""
+
+from contextlib import contextmanager
+import json
+import os
+import sys
+import time
+
+
+class RenderProfiler:
+    """Collects per-section timings for one report render"""
+
+    def __init__(self, report, enabled=True, target='stderr', track_memory=True):
+        self.report = report
+        self.enabled = enabled
+        self.target = target
+        self.track_memory = track_memory and enabled
+        self.sections = []
+        self._current = None
+        self._failed = None
+        self._started = None
+        self._owns_tracemalloc = False
+        self._tracemalloc = None
+
+    @classmethod
+    def from_env(cls, report):
+        """Profiler configured from REPORT_PROFILE (disabled when unset)"""
+        target = os.environ.get('REPORT_PROFILE', '').strip()
+        if not target or target == '0':
+            return cls(report, enabled=False)
+        if target in ('1', 'stderr'):
+            target = 'stderr'
+        return cls(report, enabled=True, target=target)
+
+    def start(self):
+        if not self.enabled:
+            return self
+        if self.track_memory:
+            # Imported on first use so unprofiled renders don't pay for it
+            import tracemalloc
+            self._tracemalloc = tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracemalloc = True
+        self._started = time.perf_counter()
+        return self
+
+    def _count(self, container):
+        if container is None:
+            return 0
+        # DOCX documents are counted by body elements, PDF stories by flowables
+        body = getattr(getattr(container, 'element', None), 'body', None)
+        return len(body) if body is not None else len(container)
+
+    def _open(self, name, container):
+        if self.track_memory:
+            self._tracemalloc.reset_peak()
+        self._current = (name, container, self._count(container), time.perf_counter())
+
+    def _close(self):
+        if self._current is None:
+            return
+        name, container, count_before, started = self._current
+        record = {
+            'name': name,
+            'seconds': round(time.perf_counter() - started, 6),
+            'items': self._count(container) - count_before,
+        }
+        if self.track_memory:
+            record['peak_bytes'] = self._tracemalloc.get_traced_memory()[1]
+        self.sections.append(record)
+        self._current = None
+
+    def checkpoint(self, name, container=None):
+        """End the running section (if any) and start a new one"""
+        if not self.enabled:
+            return
+        if self._started is None:
+            self.start()
+        self._close()
+        self._open(name, container)
+
+    @contextmanager
+    def section(self, name, container=None):
+        """Time the enclosed block as one section"""
+        if not self.enabled:
+            yield
+            return
+        if self._started is None:
+            self.start()
+        self._close()
+        self._open(name, container)
+        try:
+            yield
+        except BaseException:
+            self._failed = name
+            raise
+        finally:
+            self._close()
+
+    def finish(self, **extra):
+        """Close the last section and emit the report's record"""
+        if not self.enabled or self._started is None:
+            return None
+        self._close()
+        record = {
+            'report': self.report,
+            'pid': os.getpid(),
+            'timestamp': round(time.time(), 3),
+            'total_seconds': round(time.perf_counter() - self._started, 6),
+            'sections': self.sections,
+        }
+        if self.track_memory:
+            record['peak_bytes'] = max((s['peak_bytes'] for s in self.sections), default=0)
+            if self._owns_tracemalloc:
+                self._tracemalloc.stop()
+                self._owns_tracemalloc = False
+        record.update(extra)
+        self.emit(record)
+        self._started = None
+        self._failed = None
+        return record
+
+    def fail(self, error):
+        """Emit the record of a render that raised, naming the failed section"""
+        if not self.enabled or self._started is None:
+            return None
+        section = self._current[0] if self._current is not None else self._failed
+        return self.finish(error=f'{type(error).__name__}: {error}', failed_section=section)
+
+    def emit(self, record):
+        line = json.dumps(record)
+        if self.target == 'stderr':
+            print(line, file=sys.stderr)
+        else:
+            with open(self.target, 'a') as f:
+                f.write(line + '\n')
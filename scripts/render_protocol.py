@@ -0,0 +1,268 @@
+"""
+Australian Retirement Planning - Render Worker Protocol
+
+Length-prefixed JSON framing used by the long-lived report render workers.
+Every frame is a 4-byte big-endian length followed by that many bytes.
+
+Requests are a single JSON frame:
+    {"id": "...", "op": "render", "format": "pdf", "data": {...}}
+    {"id": "...", "op": "health"}
+    {"id": "...", "op": "shutdown"}
+
+Responses are a JSON header frame. A successful render header carries
+"size" and is followed by one binary frame holding the document bytes.
+
+On a Unix socket every connection gets its own thread: renders run one at
+a time, while health requests are answered even during a long render.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+import traceback
+
+from render_cache import cache_stats
+
+
+FRAME_HEADER = struct.Struct('>I')
+MAX_FRAME_SIZE = 256 * 1024 * 1024  # 256 MB
+
+
+class ProtocolError(Exception):
+    """Raised when a peer sends a malformed or oversized frame"""
+
+
+def read_exact(stream, size):
+    """Read exactly size bytes, or return None on a clean EOF"""
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = stream.read(remaining)
+        if not chunk:
+            if remaining == size:
+                return None
+            raise ProtocolError('Connection closed mid-frame')
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(chunks)
+
+
+def read_frame(stream):
+    """Read one frame, returning its bytes (None at end of stream)"""
+    header = read_exact(stream, FRAME_HEADER.size)
+    if header is None:
+        return None
+    (size,) = FRAME_HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise ProtocolError(f'Frame of {size} bytes exceeds limit')
+    if size == 0:
+        return b''
+    payload = read_exact(stream, size)
+    if payload is None:
+        raise ProtocolError('Connection closed mid-frame')
+    return payload
+
+
+def write_frame(stream, payload):
+    """Write one frame"""
+    stream.write(FRAME_HEADER.pack(len(payload)))
+    stream.write(payload)
+
+
+def decode_message(payload):
+    """Parse the bytes of one JSON frame"""
+    try:
+        return json.loads(payload)
+    except ValueError as e:
+        raise ProtocolError(f'Invalid JSON frame: {e}')
+
+
+def read_message(stream):
+    """Read one JSON frame as a dict (None at end of stream)"""
+    payload = read_frame(stream)
+    if payload is None:
+        return None
+    return decode_message(payload)
+
+
+def write_message(stream, message, body=None):
+    """Write a JSON header frame, followed by a binary body frame if given"""
+    if body is not None:
+        message = dict(message, size=len(body))
+    write_frame(stream, json.dumps(message).encode('utf-8'))
+    if body is not None:
+        write_frame(stream, body)
+    stream.flush()
+
+
+class RenderWorker:
+    """Dispatches protocol requests to renderer functions imported once"""
+
+    def __init__(self, renderers, name='report'):
+        # renderers maps a format name ('pdf', 'docx') to fn(data) -> bytes
+        self.renderers = renderers
+        self.name = name
+        self.started = time.time()
+        self.jobs = 0
+        self.failures = 0
+        self.active = 0
+        self.running = True
+        # Renderers are not thread-safe; only render requests take the lock
+        self.lock = threading.Lock()
+
+    def health(self):
+        """Readiness snapshot returned by the 'health' op"""
+        return {
+            'ok': True,
+            'status': 'ready' if self.running else 'stopping',
+            'busy': self.active > 0,
+            'worker': self.name,
+            'pid': os.getpid(),
+            'formats': sorted(self.renderers),
+            'uptime': round(time.time() - self.started, 3),
+            'jobs': self.jobs,
+            'failures': self.failures,
+            'cache': cache_stats(),
+        }
+
+    def handle(self, request):
+        """Handle one request, returning (header, body-or-None)"""
+        if not isinstance(request, dict):
+            return {'id': None, 'ok': False, 'error': 'Request must be a JSON object'}, None
+        request_id = request.get('id')
+        op = request.get('op', 'render')
+
+        if op == 'health':
+            return dict(self.health(), id=request_id), None
+
+        if op == 'shutdown':
+            self.running = False
+            return {'id': request_id, 'ok': True, 'status': 'stopping'}, None
+
+        if op != 'render':
+            return {'id': request_id, 'ok': False, 'error': f'Unknown op: {op}'}, None
+
+        fmt = request.get('format', next(iter(self.renderers)))
+        renderer = self.renderers.get(fmt)
+        if renderer is None:
+            return {'id': request_id, 'ok': False, 'error': f'Unsupported format: {fmt}'}, None
+
+        with self.lock:
+            started = time.perf_counter()
+            self.jobs += 1
+            self.active += 1
+            try:
+                body = renderer(request.get('data') or {})
+            except Exception as e:
+                self.failures += 1
+                traceback.print_exc(file=sys.stderr)
+                return {'id': request_id, 'ok': False, 'error': f'{type(e).__name__}: {e}'}, None
+            finally:
+                self.active -= 1
+
+        header = {
+            'id': request_id,
+            'ok': True,
+            'format': fmt,
+            'elapsed': round(time.perf_counter() - started, 4),
+        }
+        return header, body
+
+    def serve_stream(self, instream, outstream):
+        """Serve requests from one stream pair until EOF or shutdown"""
+        while self.running:
+            try:
+                payload = read_frame(instream)
+                if payload is None:
+                    return
+                request = decode_message(payload)
+            except ProtocolError as e:
+                write_message(outstream, {'ok': False, 'error': str(e)})
+                return
+            header, body = self.handle(request)
+            write_message(outstream, header, body)
+
+
+def serve_stdio(worker):
+    """Serve over stdin/stdout, keeping stray prints off the protocol stream"""
+    instream = sys.stdin.buffer
+    outstream = sys.stdout.buffer
+    sys.stdout = sys.stderr
+    worker.serve_stream(instream, outstream)
+
+
+def serve_unix_socket(worker, path):
+    """Serve over a Unix domain socket, a thread per connection"""
+    if os.path.exists(path):
+        os.unlink(path)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            worker.serve_stream(self.rfile, self.wfile)
+            if not worker.running:
+                # shutdown() waits for serve_forever, so it can't run on this thread
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+    server = socketserver.ThreadingUnixStreamServer(path, Handler)
+    # Open client connections must not keep a stopping worker alive
+    server.daemon_threads = True
+    print(f"{worker.name} worker listening on {path}", file=sys.stderr)
+    try:
+        server.serve_forever(poll_interval=0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def request(path, message, timeout=30):
+    """Send one request to a worker socket, returning (header, body)"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    sock.connect(path)
+    with sock, sock.makefile('rb') as rfile, sock.makefile('wb') as wfile:
+        write_message(wfile, message)
+        header = read_message(rfile)
+        if header is None:
+            raise ProtocolError('Worker closed the connection')
+        body = read_frame(rfile) if header.get('ok') and 'size' in header else None
+        return header, body
+
+
+def probe(path, timeout=5):
+    """Health probe for a worker socket; returns a process exit code"""
+    try:
+        header, _ = request(path, {'id': 'probe', 'op': 'health'}, timeout=timeout)
+    except (OSError, ProtocolError) as e:
+        print(json.dumps({'ok': False, 'status': 'unreachable', 'error': str(e)}))
+        return 1
+    print(json.dumps(header))
+    return 0 if header.get('ok') and header.get('status') == 'ready' else 1
+
+
+def run_worker(argv, renderers, name='report'):
+    """Entry point for a script's --worker mode"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog=f'{name} worker')
+    parser.add_argument('--socket', help='Serve on this Unix socket instead of stdin/stdout')
+    parser.add_argument('--probe', action='store_true', help='Check the worker on --socket and exit')
+    args = parser.parse_args(argv)
+
+    if args.probe:
+        if not args.socket:
+            parser.error('--probe requires --socket')
+        sys.exit(probe(args.socket))
+
+    worker = RenderWorker(renderers, name=name)
+    if args.socket:
+        serve_unix_socket(worker, args.socket)
+    else:
+        serve_stdio(worker)
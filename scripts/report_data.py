@@ -0,0 +1,167 @@
+"""
+Australian Retirement Planning - Report Data Normalization
+
+chartData arrives with different key spellings depending on where it was
+produced ('Total Balance' from the chart export, 'totalBalance' from the
+projection engine, older snake_case payloads). This module resolves those
+aliases once per payload and stores each series as a compact float array,
+so report sections read plain columns instead of chaining dict.get calls
+for every row.
+"""
+
+from array import array
+from datetime import datetime, timezone
+import math
+import os
+
+
+# Canonical column -> accepted keys, in order of preference
+CHART_FIELDS = {
+    'age': ('age',),
+    'year': ('year',),
+    'total_balance': ('Total Balance', 'totalBalance', 'total_balance', 'balance'),
+    'main_super': ('Main Super', 'mainSuper', 'main_super'),
+    'buffer': ('Buffer', 'buffer', 'seqBuffer'),
+    'spending': ('Spending', 'spending', 'spend'),
+    'income': ('Income', 'income', 'inc'),
+}
+
+# Columns that are labels rather than amounts; missing values become NaN
+LABEL_FIELDS = ('age', 'year')
+
+
+def to_number(value, default=0.0):
+    """Coerce a payload value to float, falling back to default"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.replace(',', '').replace('$', ''))
+        except ValueError:
+            return default
+    return default
+
+
+def format_label(value):
+    """Format an age/year column value for display ('' when missing)"""
+    if math.isnan(value):
+        return ''
+    if value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def resolve_keys(rows, fields=CHART_FIELDS):
+    """Pick the payload key used for each canonical field.
+
+    Rows from a single payload share one schema, so the first row that
+    carries a field decides which alias is used for every row.
+    """
+    resolved = {}
+    for row in rows:
+        if not isinstance(row, dict):
+            continue
+        for field, aliases in fields.items():
+            if field in resolved:
+                continue
+            for alias in aliases:
+                if alias in row:
+                    resolved[field] = alias
+                    break
+        if len(resolved) == len(fields):
+            break
+    return resolved
+
+
+class ChartColumns:
+    """Column-oriented chartData with one float array per series"""
+
+    __slots__ = ('age', 'year', 'total_balance', 'main_super', 'buffer',
+                 'spending', 'income', 'keys')
+
+    def __init__(self, keys=None, **columns):
+        self.keys = keys or {}
+        for field in CHART_FIELDS:
+            setattr(self, field, columns.get(field, array('d')))
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build columns from a list of chartData dicts in a single pass"""
+        rows = [row for row in (rows or []) if isinstance(row, dict)]
+        keys = resolve_keys(rows)
+        columns = {}
+        for field in CHART_FIELDS:
+            key = keys.get(field)
+            default = math.nan if field in LABEL_FIELDS else 0.0
+            if key is None:
+                columns[field] = array('d', [default]) * len(rows)
+            else:
+                columns[field] = array('d', [to_number(row.get(key), default) for row in rows])
+        return cls(keys=keys, **columns)
+
+    def __len__(self):
+        return len(self.total_balance)
+
+    def __reduce__(self):
+        # Bundle columns are memoryviews over an mmap; pickle copies as arrays
+        columns = {field: array('d', getattr(self, field)) for field in CHART_FIELDS}
+        return (_restore_columns, (self.keys, columns))
+
+
+def _restore_columns(keys, columns):
+    return ChartColumns(keys=keys, **columns)
+
+
+def is_rows(value):
+    """True for a YearlyData[] list or already-normalized columns"""
+    return isinstance(value, (list, tuple, ChartColumns))
+
+
+def chart_columns(chart_data):
+    """Normalize chartData (rows or existing ChartColumns) to ChartColumns"""
+    if isinstance(chart_data, ChartColumns):
+        return chart_data
+    return ChartColumns.from_rows(chart_data)
+
+
+def pinned_report_date(data):
+    """The report date fixed by the input, or None when it is 'now'.
+
+    The payload's reportDate (ISO date or date-time, e.g. '2025-03-01') wins;
+    otherwise SOURCE_DATE_EPOCH (Unix seconds, the reproducible-builds
+    convention) pins every report rendered by the process.
+    """
+    value = data.get('reportDate') if isinstance(data, dict) else None
+    if isinstance(value, str) and value.strip():
+        try:
+            return datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+        except ValueError:
+            pass
+    epoch = os.environ.get('SOURCE_DATE_EPOCH', '').strip()
+    if epoch:
+        try:
+            return datetime.fromtimestamp(int(epoch), timezone.utc)
+        except (ValueError, OverflowError, OSError):
+            pass
+    return None
+
+
+def report_date(data):
+    """Date printed on the report: the pinned date (see above), else today"""
+    pinned = pinned_report_date(data)
+    return pinned if pinned is not None else datetime.now()
+
+
+def report_timestamp(data):
+    """Pinned report date as Unix seconds (naive dates are taken as UTC), or None.
+
+    A pinned date puts the generators in reproducible mode: every embedded
+    timestamp and document ID is derived from it, so the same payload
+    always renders to the same bytes.
+    """
+    pinned = pinned_report_date(data)
+    if pinned is None:
+        return None
+    if pinned.tzinfo is None:
+        pinned = pinned.replace(tzinfo=timezone.utc)
+    return int(pinned.timestamp())
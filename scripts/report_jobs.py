@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Australian Retirement Planning - Report Job Queue
+
+Asynchronous rendering for the report API routes. Submitting a job stores
+the payload in a local SQLite queue and returns an id straight away;
+worker processes claim jobs, render them with the generators (imported once
+per worker) and write the PDF/DOCX to an artifacts directory, where clients
+fetch it after polling the job's status. Request latency no longer depends
+on render time.
+
+Retries:
+    A claimed job holds a lease. If its worker crashes, or is still running
+    when the lease expires, the job is queued again, up to MAX_ATTEMPTS
+    claims. Only the supervisor expires leases: it kills the hung worker
+    first, so a render never runs twice. Renderer exceptions are not
+    retried: the same payload would fail the same way.
+
+Finished jobs and their artifacts are deleted once they are older than the
+TTL; the worker supervisor runs this cleanup periodically.
+
+Configuration (environment):
+    REPORT_JOBS_DIR=PATH       queue database and artifacts
+                               (default: <tmp>/retirement-report-jobs)
+    REPORT_JOBS_TTL=3600       seconds finished jobs are kept
+
+Usage:
+    report_jobs.py submit pdf|docx <input|->     prints {"id": ..., "status": "queued"}
+    report_jobs.py status <id>
+    report_jobs.py fetch <id> <output|->
+    report_jobs.py worker [--workers N] [--lease SECS] [--once]
+    report_jobs.py cleanup
+All commands take --dir PATH to override REPORT_JOBS_DIR. The API routes
+under app/api/report-jobs call submit/status/fetch; run the workers
+alongside the Next.js server.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+from io import BytesIO
+
+
+FORMATS = ('pdf', 'docx')
+
+MAX_ATTEMPTS = 3
+DEFAULT_LEASE = 300
+DEFAULT_TTL = 3600
+POLL_INTERVAL = 0.25
+CLEANUP_INTERVAL = 60
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+LEASE_EXPIRED = 'Render did not finish within its lease'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    format TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload BLOB,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    worker TEXT,
+    lease_expires REAL,
+    error TEXT,
+    size INTEGER,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, created);
+"""
+
+
+class JobNotFound(KeyError):
+    """Raised for an unknown (or already cleaned up) job id"""
+
+
+class JobNotReady(Exception):
+    """Raised when fetching a job that has not finished successfully"""
+
+
+def default_directory():
+    return os.environ.get('REPORT_JOBS_DIR', '').strip() or \
+        os.path.join(tempfile.gettempdir(), 'retirement-report-jobs')
+
+
+def default_ttl():
+    return float(os.environ.get('REPORT_JOBS_TTL') or DEFAULT_TTL)
+
+
+# ========== STORE ==========
+
+class JobStore:
+    """SQLite-backed job queue plus an artifacts directory.
+
+    Every process opens its own store; SQLite's locking (WAL mode,
+    BEGIN IMMEDIATE for claims) makes claims atomic across workers.
+    """
+
+    def __init__(self, directory=None, ttl=None):
+        self.directory = directory or default_directory()
+        self.ttl = default_ttl() if ttl is None else ttl
+        self.artifacts = os.path.join(self.directory, 'artifacts')
+        os.makedirs(self.artifacts, exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(self.directory, 'jobs.sqlite3'),
+                                  timeout=30, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def artifact_path(self, job_id, fmt):
+        return os.path.join(self.artifacts, f'{job_id}.{fmt}')
+
+    # ----- clients -----
+
+    def submit(self, fmt, payload, max_attempts=MAX_ATTEMPTS):
+        """Queue a render of payload (JSON or bundle bytes); returns the job id"""
+        if fmt not in FORMATS:
+            raise ValueError(f'Unsupported format: {fmt}')
+        job_id = uuid.uuid4().hex
+        self.db.execute(
+            'INSERT INTO jobs (id, format, status, payload, max_attempts, created) VALUES (?, ?, ?, ?, ?, ?)',
+            (job_id, fmt, QUEUED, payload, max_attempts, time.time()),
+        )
+        return job_id
+
+    def status(self, job_id):
+        """Job state as a JSON-serializable dict"""
+        row = self.db.execute(
+            'SELECT id, format, status, attempts, error, size, created, started, finished '
+            'FROM jobs WHERE id = ?', (job_id,)
+        ).fetchone()
+        if row is None:
+            raise JobNotFound(job_id)
+        status = dict(row)
+        if status['status'] == QUEUED:
+            status['position'] = self.db.execute(
+                'SELECT COUNT(*) FROM jobs WHERE status = ? AND created <= ?', (QUEUED, row['created'])
+            ).fetchone()[0]
+        if status['finished'] is not None:
+            status['expires'] = status['finished'] + self.ttl
+        return status
+
+    def fetch(self, job_id):
+        """(format, path) of a finished job's artifact"""
+        status = self.status(job_id)
+        if status['status'] != DONE:
+            raise JobNotReady(f"Job {job_id} is {status['status']}")
+        path = self.artifact_path(job_id, status['format'])
+        if not os.path.exists(path):
+            raise JobNotFound(job_id)
+        return status['format'], path
+
+    # ----- workers -----
+
+    def _requeue(self, condition, args, reason):
+        """Queue running jobs matching condition again, failing those out of attempts"""
+        now = time.time()
+        self.db.execute(
+            f'UPDATE jobs SET status = ?, error = ?, finished = ?, payload = NULL, worker = NULL, '
+            f'lease_expires = NULL WHERE status = ? AND attempts >= max_attempts AND {condition}',
+            (FAILED, reason, now, RUNNING) + args,
+        )
+        self.db.execute(
+            f'UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL '
+            f'WHERE status = ? AND {condition}',
+            (QUEUED, RUNNING) + args,
+        )
+
+    def claim(self, worker, lease=DEFAULT_LEASE):
+        """Lease the oldest queued job to worker: (id, format, payload) or None"""
+        now = time.time()
+        self.db.execute('BEGIN IMMEDIATE')
+        try:
+            row = self.db.execute(
+                'SELECT id, format, payload FROM jobs WHERE status = ? ORDER BY created LIMIT 1', (QUEUED,)
+            ).fetchone()
+            if row is not None:
+                self.db.execute(
+                    'UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, '
+                    'lease_expires = ?, started = ? WHERE id = ?',
+                    (RUNNING, worker, now + lease, now, row['id']),
+                )
+            self.db.execute('COMMIT')
+        except BaseException:
+            self.db.execute('ROLLBACK')
+            raise
+        return (row['id'], row['format'], row['payload']) if row is not None else None
+
+    def release(self, worker, reason='Render worker crashed'):
+        """Requeue the jobs of a worker that died (or was killed)"""
+        self.db.execute('BEGIN IMMEDIATE')
+        try:
+            self._requeue('worker = ?', (worker,), reason)
+            self.db.execute('COMMIT')
+        except BaseException:
+            self.db.execute('ROLLBACK')
+            raise
+
+    def expired_workers(self):
+        """Workers holding a job past its lease (hung renders)"""
+        rows = self.db.execute(
+            'SELECT DISTINCT worker FROM jobs WHERE status = ? AND lease_expires < ?', (RUNNING, time.time())
+        )
+        return [row[0] for row in rows]
+
+    def complete(self, job_id, worker, body):
+        """Store a rendered artifact; False if the lease was lost meanwhile"""
+        row = self.db.execute('SELECT format FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None:
+            return False
+        path = self.artifact_path(job_id, row['format'])
+        fd, tmp = tempfile.mkstemp(dir=self.artifacts, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(body)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+        updated = self.db.execute(
+            'UPDATE jobs SET status = ?, size = ?, finished = ?, payload = NULL, lease_expires = NULL '
+            'WHERE id = ? AND worker = ? AND status = ?',
+            (DONE, len(body), time.time(), job_id, worker, RUNNING),
+        )
+        return updated.rowcount == 1
+
+    def fail(self, job_id, worker, error):
+        """Mark a job failed (renderer errors are not retried)"""
+        self.db.execute(
+            'UPDATE jobs SET status = ?, error = ?, finished = ?, payload = NULL, lease_expires = NULL '
+            'WHERE id = ? AND worker = ? AND status = ?',
+            (FAILED, error, time.time(), job_id, worker, RUNNING),
+        )
+
+    def cleanup(self):
+        """Delete finished jobs older than the TTL and their artifacts; returns the count"""
+        cutoff = time.time() - self.ttl
+        expired = self.db.execute(
+            'SELECT id, format FROM jobs WHERE status IN (?, ?) AND finished < ?', (DONE, FAILED, cutoff)
+        ).fetchall()
+        for row in expired:
+            try:
+                os.unlink(self.artifact_path(row['id'], row['format']))
+            except FileNotFoundError:
+                pass
+        self.db.executemany('DELETE FROM jobs WHERE id = ?', [(row['id'],) for row in expired])
+
+        # Artifacts left behind by a crash between writing and recording them
+        with os.scandir(self.artifacts) as it:
+            for entry in it:
+                job_id = entry.name.split('.')[0]
+                if entry.stat().st_mtime < cutoff and self.db.execute(
+                        'SELECT 1 FROM jobs WHERE id = ? AND status = ?', (job_id, DONE)).fetchone() is None:
+                    try:
+                        os.unlink(entry.path)
+                    except FileNotFoundError:
+                        pass
+        return len(expired)
+
+
+# ========== WORKERS ==========
+
+def decode_payload(content):
+    """Payload dict from queued JSON or bundle bytes"""
+    from report_payload import is_bundle, loads_bundle
+    from payload_stream import load_json
+    if is_bundle(content[:4]):
+        return loads_bundle(content)
+    return load_json(BytesIO(content))
+
+
+def work(directory, lease=DEFAULT_LEASE, poll_interval=POLL_INTERVAL, once=False, loader=None):
+    """Worker loop: claim, render and store jobs until interrupted (or the queue is empty, with once)
+
+    loader returns the renderers by format (default: render_pool.load_renderers).
+    """
+    if loader is None:
+        from render_pool import load_renderers as loader
+    renderers = loader()
+    store = JobStore(directory)
+    worker = str(os.getpid())
+    try:
+        while True:
+            job = store.claim(worker, lease)
+            if job is None:
+                if once:
+                    return
+                time.sleep(poll_interval)
+                continue
+            job_id, fmt, payload = job
+            try:
+                body = renderers[fmt](decode_payload(payload))
+            except Exception as e:
+                store.fail(job_id, worker, f'{type(e).__name__}: {e}')
+                continue
+            store.complete(job_id, worker, body)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+
+
+def supervise(directory, workers=None, lease=DEFAULT_LEASE, loader=None, stop=None):
+    """Run worker processes, replacing any that crash or overrun their lease
+
+    Runs until interrupted, or until the stop event (a threading.Event) is set.
+    """
+    import multiprocessing
+
+    context = multiprocessing.get_context('spawn')
+    store = JobStore(directory)
+    size = workers or os.cpu_count() or 1
+
+    def spawn():
+        process = context.Process(target=work, args=(store.directory, lease),
+                                  kwargs={'loader': loader}, daemon=True)
+        process.start()
+        return process
+
+    processes = [spawn() for _ in range(size)]
+    print(f"Report job workers ({size}) serving {store.directory}", file=sys.stderr)
+    last_cleanup = 0.0
+    try:
+        while stop is None or not stop.is_set():
+            # Kill hung workers before requeueing their jobs, so a job is
+            # never rendered by two workers at once
+            hung = set(store.expired_workers())
+            for i, process in enumerate(processes):
+                pid = str(process.pid)
+                if pid in hung:
+                    hung.discard(pid)
+                    if process.is_alive():
+                        process.kill()
+                        process.join()
+                    store.release(pid, LEASE_EXPIRED)
+                if not process.is_alive():
+                    store.release(pid)
+                    processes[i] = spawn()
+            # Leases left by workers that are not ours (an earlier
+            # supervisor, or a `worker --once` run)
+            for worker in hung:
+                store.release(worker, LEASE_EXPIRED)
+            if time.time() - last_cleanup >= CLEANUP_INTERVAL:
+                store.cleanup()
+                last_cleanup = time.time()
+            if stop is None:
+                time.sleep(1)
+            else:
+                stop.wait(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join(timeout=5)
+            store.release(str(process.pid))
+        store.close()
+
+
+# ========== CLI ==========
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Asynchronous report job queue')
+    parser.add_argument('--dir', default=None, help='Queue directory (default: REPORT_JOBS_DIR)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    submit = commands.add_parser('submit', help='Queue a render and print its job id')
+    submit.add_argument('format', choices=FORMATS)
+    submit.add_argument('input', help="Payload JSON or bundle ('-' for stdin)")
+
+    status = commands.add_parser('status', help='Print a job status as JSON')
+    status.add_argument('id')
+
+    fetch = commands.add_parser('fetch', help='Write a finished job\'s artifact')
+    fetch.add_argument('id')
+    fetch.add_argument('output', help="Output path ('-' for stdout)")
+
+    worker = commands.add_parser('worker', help='Run worker processes')
+    worker.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    worker.add_argument('--lease', type=float, default=DEFAULT_LEASE,
+                        help='Seconds a render may take before it is retried')
+    worker.add_argument('--once', action='store_true', help='Drain the queue in this process and exit')
+
+    commands.add_parser('cleanup', help='Delete finished jobs older than REPORT_JOBS_TTL')
+    args = parser.parse_args()
+
+    directory = args.dir or default_directory()
+    if args.command == 'worker':
+        if args.once:
+            work(directory, args.lease, once=True)
+        else:
+            supervise(directory, args.workers, args.lease)
+        return
+
+    store = JobStore(directory)
+    try:
+        if args.command == 'submit':
+            if args.input == '-':
+                payload = sys.stdin.buffer.read()
+            else:
+                with open(args.input, 'rb') as f:
+                    payload = f.read()
+            job_id = store.submit(args.format, payload)
+            print(json.dumps({'id': job_id, 'status': QUEUED}))
+        elif args.command == 'status':
+            print(json.dumps(store.status(args.id)))
+        elif args.command == 'fetch':
+            _, path = store.fetch(args.id)
+            with open(path, 'rb') as f:
+                body = f.read()
+            if args.output == '-':
+                sys.stdout.buffer.write(body)
+            else:
+                with open(args.output, 'wb') as f:
+                    f.write(body)
+        elif args.command == 'cleanup':
+            print(json.dumps({'deleted': store.cleanup()}))
+    except JobNotFound as e:
+        print(json.dumps({'error': f'Unknown job: {e.args[0]}'}), file=sys.stderr)
+        sys.exit(2)
+    except JobNotReady as e:
+        print(json.dumps({'error': str(e)}), file=sys.stderr)
+        sys.exit(3)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
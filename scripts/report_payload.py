@@ -0,0 +1,259 @@
+"""
+Australian Retirement Planning - Report Payload Loading
+
+Reads report payloads either as JSON or as a compact columnar bundle. A
+bundle is an uncompressed .npz archive: the scalar parameters as one JSON
+member plus one float64 .npy member per series, instead of repeating
+"totalBalance" etc. for every year of every path. Bundle members are
+memory-mapped and exposed as ChartColumns over zero-copy memoryviews, so
+nothing is parsed per row.
+
+Bundle layout (member names are '/'-joined payload paths):
+    params.npy                                    uint8, UTF-8 JSON of the rest
+    chartData/totalBalance.npy                    one float64 column per field
+    monteCarloResults/percentiles/p10/totalBalance.npy
+    formalTestResults/<key>/simulationData/age.npy
+
+NumPy is not needed to read or write bundles, but np.load() reads them and
+np.savez() can produce them. Pack an existing JSON payload with:
+    python report_payload.py <input_json> <output_npz>
+"""
+
+import ast
+from array import array
+import json
+import mmap
+import struct
+import sys
+from io import BytesIO
+
+from payload_stream import COLUMNAR_PATHS, load_json
+from report_data import CHART_FIELDS, LABEL_FIELDS, ChartColumns
+
+
+PARAMS_MEMBER = 'params'
+
+NPY_MAGIC = b'\x93NUMPY'
+
+# .npy dtype (without byte order) -> array typecode
+_TYPECODES = {'f8': 'd', 'f4': 'f', 'i8': 'q', 'i4': 'i', 'i2': 'h', 'u1': 'B', 'i1': 'b'}
+
+# Column name -> canonical ChartColumns field
+_FIELD_BY_ALIAS = {alias: field for field, aliases in CHART_FIELDS.items() for alias in aliases}
+
+
+class PayloadError(ValueError):
+    """Raised for malformed payload bundles"""
+
+
+def _escape(segment):
+    return str(segment).replace('~', '~0').replace('/', '~1')
+
+
+def _unescape(segment):
+    return segment.replace('~1', '/').replace('~0', '~')
+
+
+def _columnar_lists(data, pattern=None, path=()):
+    """Yield (path, rows) for every YearlyData[] list at a COLUMNAR_PATHS location"""
+    patterns = COLUMNAR_PATHS if pattern is None else (pattern,)
+    for pattern in patterns:
+        if not pattern:
+            if isinstance(data, list) and data:
+                yield path, data
+            continue
+        if not isinstance(data, dict):
+            continue
+        head, rest = pattern[0], pattern[1:]
+        keys = list(data) if head == '*' else [head] if head in data else []
+        for key in keys:
+            yield from _columnar_lists(data[key], rest, path + (key,))
+
+
+def _set_path(data, path, value):
+    for key in path[:-1]:
+        data = data.setdefault(key, {})
+    data[path[-1]] = value
+
+
+# ========== .npy MEMBERS ==========
+
+def _npy_bytes(payload, descr):
+    """Serialize a 1-D buffer as a version 1.0 .npy member"""
+    count = len(payload) // int(descr[-1])
+    header = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': ({count},), }}"
+    # Pad so the data starts on a 64-byte boundary, as NumPy does
+    padding = 64 - (len(NPY_MAGIC) + 4 + len(header) + 1) % 64
+    header = header + ' ' * padding + '\n'
+    return NPY_MAGIC + b'\x01\x00' + struct.pack('<H', len(header)) + header.encode('latin1') + payload
+
+
+def _npy_layout(buffer, offset):
+    """(descr, count, data offset) of the .npy member starting at offset"""
+    if bytes(buffer[offset:offset + 6]) != NPY_MAGIC:
+        raise PayloadError('Bundle member is not a .npy array')
+    major = buffer[offset + 6]
+    if major == 1:
+        header_len = struct.unpack('<H', bytes(buffer[offset + 8:offset + 10]))[0]
+        start = offset + 10
+    else:
+        header_len = struct.unpack('<I', bytes(buffer[offset + 8:offset + 12]))[0]
+        start = offset + 12
+    header = ast.literal_eval(bytes(buffer[start:start + header_len]).decode('latin1'))
+    shape = header['shape']
+    if len(shape) > 1 and any(dim != 1 for dim in shape[1:]):
+        raise PayloadError(f'Bundle columns must be 1-D, got shape {shape}')
+    count = shape[0] if shape else 1
+    return header['descr'], count, start + header_len
+
+
+def _column(buffer, descr, count, start):
+    """Zero-copy float view of a column (copied only if dtype or byte order differ)"""
+    order, kind = descr[0], descr[1:]
+    if kind not in _TYPECODES:
+        raise PayloadError(f'Unsupported column dtype: {descr}')
+    typecode = _TYPECODES[kind]
+    size = array(typecode).itemsize
+    raw = memoryview(buffer)[start:start + count * size]
+    native = order in '=|' or order == ('<' if sys.byteorder == 'little' else '>')
+    if typecode == 'd' and native:
+        return raw.cast('d')
+    values = array(typecode, raw.tobytes())
+    if not native:
+        values.byteswap()
+    return array('d', values)
+
+
+def _member_offset(buffer, info):
+    """Offset of a stored member's data within the archive buffer"""
+    import zipfile
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    header = bytes(buffer[info.header_offset:info.header_offset + 30])
+    name_len, extra_len = struct.unpack('<HH', header[26:30])
+    return info.header_offset + 30 + name_len + extra_len
+
+
+# ========== BUNDLES ==========
+
+def _decode_bundle(archive, buffer):
+    members = {}
+    for info in archive.infolist():
+        name = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+        offset = _member_offset(buffer, info)
+        if offset is None:
+            # Compressed members cannot be mapped; fall back to reading them
+            member = archive.read(info)
+            offset = 0
+            member_buffer = member
+        else:
+            member_buffer = buffer
+        members[name] = (member_buffer,) + _npy_layout(member_buffer, offset)
+
+    if PARAMS_MEMBER not in members:
+        raise PayloadError('Bundle has no params member')
+    member_buffer, _, count, start = members.pop(PARAMS_MEMBER)
+    data = json.loads(bytes(member_buffer[start:start + count]).decode('utf-8'))
+
+    # Group series members by the list they belong to
+    lists = {}
+    for name, (member_buffer, descr, count, start) in members.items():
+        *path, column = name.split('/')
+        lists.setdefault(tuple(_unescape(p) for p in path), {})[column] = (
+            _column(member_buffer, descr, count, start)
+        )
+
+    for path, columns in lists.items():
+        if not path:
+            continue
+        length = max(len(values) for values in columns.values())
+        fields, keys = {}, {}
+        for column, values in columns.items():
+            field = _FIELD_BY_ALIAS.get(column)
+            if field is not None and field not in fields:
+                fields[field] = values
+                keys[field] = column
+        for field in CHART_FIELDS:
+            if field not in fields:
+                default = float('nan') if field in LABEL_FIELDS else 0.0
+                fields[field] = array('d', [default]) * length
+        _set_path(data, path, ChartColumns(keys=keys, **fields))
+    return data
+
+
+def load_bundle(path):
+    """Load a payload bundle, memory-mapping its columns"""
+    # zipfile is imported here so JSON payloads don't pay for it at startup
+    import zipfile
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    # The mapping stays alive for as long as any column view refers to it
+    with zipfile.ZipFile(path) as archive:
+        return _decode_bundle(archive, buffer)
+
+
+def loads_bundle(content):
+    """Load a payload bundle from bytes (e.g. read from stdin)"""
+    import zipfile
+    with zipfile.ZipFile(BytesIO(content)) as archive:
+        return _decode_bundle(archive, content)
+
+
+def dump_bundle(data, target):
+    """Write a payload as a bundle: YearlyData[] lists become float64 columns"""
+    import zipfile
+    params = json.loads(json.dumps(data))
+    columns = {}
+    for path, rows in list(_columnar_lists(params)):
+        chart = ChartColumns.from_rows(rows)
+        prefix = '/'.join(_escape(p) for p in path)
+        for field, key in chart.keys.items():
+            values = getattr(chart, field)
+            if sys.byteorder != 'little':
+                values = array('d', values)
+                values.byteswap()
+            columns[f'{prefix}/{_escape(key)}.npy'] = _npy_bytes(values.tobytes(), '<f8')
+        _set_path(params, path, [])
+
+    with zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_STORED) as archive:
+        archive.writestr(f'{PARAMS_MEMBER}.npy',
+                         _npy_bytes(json.dumps(params).encode('utf-8'), '|u1'))
+        for name, content in columns.items():
+            archive.writestr(name, content)
+
+
+def is_bundle(head):
+    """True when the leading bytes of an input are a zip (bundle) rather than JSON"""
+    return head[:4] == b'PK\x03\x04'
+
+
+def load_payload(source):
+    """Load a report payload from a path or '-' (stdin), as JSON or a bundle.
+
+    JSON goes through payload_stream.load_json (incremental for large
+    payloads), so YearlyData[] lists arrive as ChartColumns either way.
+    """
+    if source == '-':
+        head = sys.stdin.buffer.read(4)
+        if is_bundle(head):
+            return loads_bundle(head + sys.stdin.buffer.read())
+        return load_json(sys.stdin.buffer, prefix=head)
+    with open(source, 'rb') as f:
+        head = f.read(4)
+        if not is_bundle(head):
+            return load_json(f, prefix=head)
+    return load_bundle(source)
+
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage: report_payload.py <input_json> <output_npz>")
+        sys.exit(1)
+
+    with open(sys.argv[1], 'r') as f:
+        data = json.load(f)
+    dump_bundle(data, sys.argv[2])
+    print(f"Payload bundle written: {sys.argv[2]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Australian Retirement Planning - PDF Style Registry
+
+Paragraph and table styles for the PDF report, built once per theme on
+first use and shared by every report rendered in the process (CLI, worker,
+render pool or batch run). Styles are shared objects - treat them as
+read-only and use register_theme() for variations.
+"""
+
+from reportlab.lib import colors
+from reportlab.lib.colors import HexColor
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.platypus import TableStyle
+
+
+DEFAULT_THEME = 'default'
+
+DEFAULT_PALETTE = {
+    'title': '#1f2937',
+    'heading': '#2563eb',
+    'subheading': '#4b5563',
+    'body': '#374151',
+    'header_fill': '#2563eb',
+    'historical_header_fill': '#10b981',
+    'monte_carlo_header_fill': '#3b82f6',
+    'section_fill': '#e5e7eb',
+    'cover_fill': '#f3f4f6',
+    'row_fill': '#f9fafb',
+    'total_fill': '#dbeafe',
+    'alt_row_fill': '#ffffff',
+}
+
+# theme name -> (base theme, palette overrides)
+_themes = {DEFAULT_THEME: (None, {})}
+_built = {}
+
+
+class ReportStyles:
+    """Paragraph styles and named table styles for one theme"""
+
+    def __init__(self, name, palette):
+        self.name = name
+        self.palette = dict(palette)
+        c = {key: HexColor(value) for key, value in palette.items()}
+        sample = getSampleStyleSheet()
+        suffix = '' if name == DEFAULT_THEME else f'-{name}'
+
+        self.title = ParagraphStyle(
+            f'CustomTitle{suffix}',
+            parent=sample['Heading1'],
+            fontSize=24,
+            textColor=c['title'],
+            spaceAfter=30,
+            alignment=TA_CENTER,
+        )
+        self.heading = ParagraphStyle(
+            f'CustomHeading{suffix}',
+            parent=sample['Heading2'],
+            fontSize=16,
+            textColor=c['heading'],
+            spaceAfter=12,
+            spaceBefore=12,
+        )
+        self.subheading = ParagraphStyle(
+            f'CustomSubHeading{suffix}',
+            parent=sample['Heading3'],
+            fontSize=12,
+            textColor=c['subheading'],
+            spaceAfter=6,
+        )
+        self.body = ParagraphStyle(
+            f'CustomBody{suffix}',
+            parent=sample['Normal'],
+            fontSize=10,
+            textColor=c['body'],
+            alignment=TA_JUSTIFY,
+        )
+
+        grid = ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
+        self._table_commands = {
+            'client': [
+                ('BACKGROUND', (0, 0), (-1, -1), c['cover_fill']),
+                ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+                ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+                ('FONTSIZE', (0, 0), (-1, -1), 10),
+                ('TOPPADDING', (0, 0), (-1, -1), 8),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+                grid,
+            ],
+            'summary': [
+                ('BACKGROUND', (0, 0), (-1, 0), c['header_fill']),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 10),
+                ('TOPPADDING', (0, 0), (-1, -1), 8),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+                ('BACKGROUND', (0, 1), (-1, -1), c['row_fill']),
+                grid,
+            ],
+            # Portfolio details and economic assumptions
+            'details': [
+                ('BACKGROUND', (0, 0), (-1, -1), c['row_fill']),
+                ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 10),
+                ('TOPPADDING', (0, 0), (-1, -1), 6),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+                grid,
+            ],
+            'historical_mc': self._monte_carlo_commands(c['historical_header_fill'], c, grid),
+            'monte_carlo': self._monte_carlo_commands(c['monte_carlo_header_fill'], c, grid),
+            'outcome': [
+                ('BACKGROUND', (0, 0), (0, -1), c['cover_fill']),
+                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+                ('FONTNAME', (1, 0), (1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 9),
+                ('TOPPADDING', (0, 0), (-1, -1), 4),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+                grid,
+            ],
+            'detail': [
+                ('BACKGROUND', (0, 0), (-1, 0), c['header_fill']),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+                ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 8),
+                ('TOPPADDING', (0, 0), (-1, -1), 4),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+                ('BACKGROUND', (0, 1), (-1, -1), c['row_fill']),
+                grid,
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [c['alt_row_fill'], c['row_fill']]),
+            ],
+            'expense': [
+                ('BACKGROUND', (0, 0), (-1, 0), c['header_fill']),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+                ('ALIGN', (2, 0), (2, -1), 'RIGHT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 9),
+                ('TOPPADDING', (0, 0), (-1, -1), 6),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+                ('BACKGROUND', (0, 1), (-1, -2), c['row_fill']),
+                ('BACKGROUND', (0, -1), (-1, -1), c['total_fill']),
+                grid,
+            ],
+        }
+        self._tables = {key: TableStyle(cmds) for key, cmds in self._table_commands.items()}
+
+    @staticmethod
+    def _monte_carlo_commands(header_fill, c, grid):
+        return [
+            ('BACKGROUND', (0, 0), (-1, 0), header_fill),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('BACKGROUND', (0, 2), (-1, 2), c['section_fill']),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, 2), (-1, 2), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ('BACKGROUND', (0, 1), (-1, -1), c['row_fill']),
+            grid,
+        ]
+
+    def table(self, name, *extra_commands):
+        """Shared TableStyle by name; extra commands produce a one-off copy"""
+        if not extra_commands:
+            return self._tables[name]
+        return TableStyle(self._table_commands[name] + list(extra_commands))
+
+
+def register_theme(name, base=DEFAULT_THEME, **palette):
+    """Register a themed variant as palette overrides on top of another theme"""
+    unknown = set(palette) - set(DEFAULT_PALETTE)
+    if unknown:
+        raise ValueError(f"Unknown palette keys: {', '.join(sorted(unknown))}")
+    if base not in _themes:
+        raise ValueError(f'Unknown base theme: {base}')
+    _themes[name] = (base, palette)
+    # Drop cached builds of this theme and anything derived from it
+    for built in list(_built):
+        if built == name or _derives_from(built, name):
+            del _built[built]
+
+
+def _derives_from(theme, ancestor):
+    base = _themes.get(theme, (None, {}))[0]
+    while base is not None:
+        if base == ancestor:
+            return True
+        base = _themes[base][0]
+    return False
+
+
+def _palette(name):
+    base, overrides = _themes[name]
+    palette = dict(DEFAULT_PALETTE) if base is None else _palette(base)
+    palette.update(overrides)
+    return palette
+
+
+def get_styles(theme=None):
+    """Styles for a theme, built on first use and cached for the process"""
+    theme = theme or DEFAULT_THEME
+    styles = _built.get(theme)
+    if styles is None:
+        if theme not in _themes:
+            raise ValueError(f'Unknown theme: {theme}')
+        styles = _built[theme] = ReportStyles(theme, _palette(theme))
+    return styles
@@ -0,0 +1,206 @@
+"""
+Australian Retirement Planning - Report Summary Statistics
+
+Computes the figures the report sections quote (final balance, exhaustion
+age, lowest balance, retirement totals, percentile balances) from the
+normalized chart columns, so each section reads a finished summary instead
+of rescanning chartData.
+"""
+
+from itertools import compress, repeat
+from operator import ge, le
+import re
+
+from report_data import chart_columns, format_label, is_rows, to_number
+
+
+PERCENTILE_KEYS = ('p10', 'p25', 'p50', 'p75', 'p90')
+
+# runMonteCarloSimulation's default when results don't say how many ran
+DEFAULT_SIMULATION_RUNS = 1000
+
+
+class ChartSummary:
+    """Whole-column summary of one projection path"""
+
+    __slots__ = ('rows', 'final_balance', 'final_age', 'exhaustion_age',
+                 'min_balance', 'min_balance_age', 'retirement_years',
+                 'total_spending', 'total_income', 'avg_spending',
+                 'net_withdrawals', 'passed')
+
+    def __init__(self, rows=0):
+        self.rows = rows
+        self.final_balance = 0.0
+        self.final_age = ''
+        self.exhaustion_age = None
+        self.min_balance = 0.0
+        self.min_balance_age = ''
+        self.retirement_years = 0
+        self.total_spending = 0.0
+        self.total_income = 0.0
+        self.avg_spending = 0.0
+        self.net_withdrawals = 0.0
+        self.passed = None
+
+
+def summarize_chart(chart_data, retirement_age=None):
+    """Summarize a projection path with whole-column builtins.
+
+    Spending/income totals only include years at or after retirement_age
+    (all years when it is None). min/sum/compress/map run their loops in C
+    over the float columns; NumPy is deliberately not used here, as the
+    generators avoid importing it unless a simulation is requested.
+    """
+    columns = chart_columns(chart_data)
+    summary = ChartSummary(rows=len(columns))
+
+    if not summary.rows:
+        return summary
+
+    ages = columns.age
+    balances = columns.total_balance
+    indices = range(summary.rows)
+
+    # First lowest balance, and the first year at or below zero
+    min_index = min(indices, key=balances.__getitem__)
+    exhaustion_index = next(compress(indices, map(le, balances, repeat(0.0))), None)
+
+    if retirement_age is None:
+        spending, income = columns.spending, columns.income
+        years = summary.rows
+    else:
+        retired = list(map(ge, ages, repeat(retirement_age)))
+        spending = compress(columns.spending, retired)
+        income = compress(columns.income, retired)
+        years = sum(retired)
+    total_spending = sum(spending, 0.0)
+    total_income = sum(income, 0.0)
+
+    summary.final_balance = balances[-1]
+    summary.final_age = format_label(ages[-1])
+    summary.min_balance = balances[min_index]
+    summary.min_balance_age = format_label(ages[min_index])
+    if exhaustion_index is not None:
+        summary.exhaustion_age = format_label(ages[exhaustion_index])
+    summary.retirement_years = years
+    summary.total_spending = total_spending
+    summary.total_income = total_income
+    summary.avg_spending = total_spending / years if years else 0.0
+    summary.net_withdrawals = max(0.0, total_spending - total_income)
+    return summary
+
+
+def plan_metrics(data):
+    """Starting-point figures derived from the plan inputs"""
+    portfolio_total = to_number(data.get('mainSuperBalance', 0)) + to_number(data.get('sequencingBuffer', 0))
+    annual_spending = to_number(data.get('baseSpending', 0))
+    pension_income = to_number(data.get('totalPensionIncome', 0))
+    net_drawdown = annual_spending - pension_income
+    withdrawal_rate = (net_drawdown / portfolio_total) * 100 if portfolio_total > 0 else 0
+    return {
+        'portfolio_total': portfolio_total,
+        'annual_spending': annual_spending,
+        'pension_income': pension_income,
+        'net_drawdown': net_drawdown,
+        'withdrawal_rate': withdrawal_rate,
+    }
+
+
+def simulation_runs(mc_results, data=None):
+    """Number of simulated scenarios behind a set of Monte Carlo results"""
+    for source, key in ((mc_results, 'runs'), (data, 'monteCarloRuns')):
+        runs = int(to_number((source or {}).get(key)))
+        if runs > 0:
+            return runs
+    return DEFAULT_SIMULATION_RUNS
+
+
+def _natural_key(key):
+    return [(0, int(part), '') if part.isdigit() else (1, 0, part)
+            for part in re.split(r'(\d+)', str(key)) if part]
+
+
+def formal_tests(data, field='formalTestResults'):
+    """(key, test) pairs of formalTestResults (or another field) in key order (A1, A2, B1, ..., B10).
+
+    The order is taken from the keys rather than from the payload's object
+    order, so equivalent payloads list the tests identically.
+    """
+    tests = data.get(field) or {}
+    if not isinstance(tests, dict):
+        return []
+    return [(key, tests[key]) for key in sorted(tests, key=_natural_key)
+            if isinstance(tests[key], dict)]
+
+
+def outcome_summary(test):
+    """ChartSummary of a formal test sent as a reduced outcome instead of simulationData.
+
+    Outcomes carry passed, finalBalance and yearsLasted (as runFormalTests
+    returns), plus minBalance/minBalanceAge and depletionAge when computed
+    server-side. The lowest balance is None when the outcome does not include it.
+    """
+    summary = ChartSummary(rows=int(to_number(test.get('yearsLasted'), 1)))
+    if test.get('passed') is not None:
+        summary.passed = bool(test['passed'])
+    summary.final_balance = to_number(test.get('finalBalance'))
+    summary.min_balance = to_number(test['minBalance']) if test.get('minBalance') is not None else None
+    if test.get('minBalanceAge') is not None:
+        summary.min_balance_age = format_label(to_number(test['minBalanceAge']))
+    if test.get('depletionAge') is not None:
+        summary.exhaustion_age = format_label(to_number(test['depletionAge']))
+    return summary
+
+
+def formal_test_passed(test, summary):
+    """Whether a formal test passed.
+
+    Uses the test's own passed flag (runFormalTests and stress_tests pass a
+    test that lasts its target years with a final balance >= 0), falling
+    back to a positive final balance for payloads that don't send one.
+    """
+    if summary.passed is not None:
+        return summary.passed
+    if test.get('passed') is not None:
+        return bool(test['passed'])
+    return summary.final_balance > 0
+
+
+def percentile_final_balance(p_data):
+    """Final balance for one percentile band.
+
+    Bands arrive as a plain number, a {'finalBalance': ...} object, or the
+    full YearlyData[] path returned by runMonteCarloSimulation (as rows or
+    bundle columns).
+    """
+    if isinstance(p_data, dict):
+        return to_number(p_data.get('finalBalance', 0))
+    if is_rows(p_data):
+        columns = chart_columns(p_data)
+        return columns.total_balance[-1] if len(columns) else 0.0
+    return to_number(p_data)
+
+
+def percentile_finals(percentiles):
+    """Final balance for each of the p10-p90 bands"""
+    percentiles = percentiles or {}
+    return {key: percentile_final_balance(percentiles.get(key, 0)) for key in PERCENTILE_KEYS}
+
+
+def percentile_paths(percentiles):
+    """Ages and per-band balance columns for percentile paths.
+
+    Returns (ages, {band: balances}) truncated to the shortest band, or
+    None when the bands are single numbers rather than YearlyData[] paths.
+    """
+    bands = {}
+    for key in PERCENTILE_KEYS:
+        band = (percentiles or {}).get(key)
+        if not is_rows(band) or not len(band):
+            return None
+        bands[key] = chart_columns(band)
+    length = min(len(columns) for columns in bands.values())
+    if length < 2:
+        return None
+    ages = bands['p50'].age[:length]
+    return ages, {key: columns.total_balance[:length] for key, columns in bands.items()}
@@ -0,0 +1,128 @@
+"""
+Australian Retirement Planning - Startup Report
+
+The API route spawns a process per report, so every request pays for the
+generator's imports. This re-runs a generator under `python -X importtime`
+and summarizes where that time goes, checked against a budget.
+
+Usage (through either generator):
+    generate_pdf_report.py --startup-report [<input> <output>]
+    generate_retirement_docx.py --startup-report [<input> <output>]
+
+Without arguments only the module import is measured. With an input, a full
+render runs as well, so modules imported lazily by the sections it needs
+(chart widgets, NumPy for serverMonteCarlo) are counted too. Exits with
+status 1 when imports exceed the budget; override the budget with
+REPORT_STARTUP_BUDGET_MS.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+
+# Import-time budgets (ms) for a bare import and for a full render, which
+# adds lazily imported chart modules. Most of it is reportlab.platypus /
+# python-docx, which every report needs; use the --worker mode or
+# render_pool.py to avoid paying it per report.
+STARTUP_BUDGET_MS = {
+    'pdf': {'import': 275, 'render': 325},
+    'docx': {'import': 200, 'render': 225},
+}
+
+TOP_MODULES = 8
+
+
+def parse_importtime(stderr):
+    """(self_us, cumulative_us, depth, module) for each -X importtime line"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((int(fields[0]), int(fields[1]), depth, name.strip()))
+    return entries
+
+
+def _importtime(args, env):
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + args,
+                            capture_output=True, text=True, env=env)
+    return result, time.perf_counter() - started
+
+
+def measure(script, argv=()):
+    """Run script under -X importtime; returns the summary dict"""
+    env = dict(os.environ, REPORT_CACHE='0')
+    directory = os.path.dirname(os.path.abspath(script))
+    module = os.path.splitext(os.path.basename(script))[0]
+
+    # Modules the bare interpreter imports anyway are reported separately
+    baseline, _ = _importtime(['-c', 'pass'], env)
+    interpreter = {name for _, _, _, name in parse_importtime(baseline.stderr)}
+
+    if argv:
+        args = [os.path.abspath(script)] + list(argv)
+    else:
+        args = ['-c', f'import sys; sys.path.insert(0, {directory!r}); import {module}']
+    result, wall = _importtime(args, env)
+    if result.returncode != 0:
+        raise RuntimeError(f'{module} exited with status {result.returncode}:\n{result.stderr[-2000:]}')
+
+    entries = [e for e in parse_importtime(result.stderr) if e[3] not in interpreter]
+    by_package = {}
+    for self_us, _, _, name in entries:
+        root = name.split('.')[0]
+        by_package[root] = by_package.get(root, 0) + self_us
+    # Imports made by the generator itself (one level below it for a bare import)
+    direct_depth = 0 if argv else 1
+    direct = [(name, cumulative) for _, cumulative, depth, name in entries if depth == direct_depth]
+    return {
+        'module': module,
+        'rendered': bool(argv),
+        'import_ms': sum(e[0] for e in entries) / 1000,
+        'interpreter_ms': sum(e[0] for e in parse_importtime(baseline.stderr)) / 1000,
+        'wall_ms': wall * 1000,
+        'modules': len(entries),
+        'by_package': sorted(((k, v / 1000) for k, v in by_package.items()),
+                             key=lambda item: -item[1]),
+        'direct': sorted(((k, v / 1000) for k, v in direct), key=lambda item: -item[1]),
+    }
+
+
+def print_report(summary, budget_ms):
+    """Human-readable startup summary (returns True when within budget)"""
+    within = summary['import_ms'] <= budget_ms
+    mode = 'import + render' if summary['rendered'] else 'import only'
+    print(f"Startup report: {summary['module']} ({mode})")
+    print(f"  Imports:      {summary['import_ms']:8.1f} ms across {summary['modules']} modules "
+          f"(budget {budget_ms:.0f} ms: {'OK' if within else 'OVER'})")
+    print(f"  Interpreter:  {summary['interpreter_ms']:8.1f} ms")
+    print(f"  Process wall: {summary['wall_ms']:8.1f} ms")
+    print("  By package (self time):")
+    for name, ms in summary['by_package'][:TOP_MODULES]:
+        print(f"    {name:<40} {ms:8.1f} ms")
+    print("  Slowest direct imports (cumulative):")
+    for name, ms in summary['direct'][:TOP_MODULES]:
+        print(f"    {name:<40} {ms:8.1f} ms")
+    return within
+
+
+def main(report, script, argv):
+    """Entry point for the generators' --startup-report flag; returns the exit status"""
+    if len(argv) not in (0, 2):
+        print(f"Usage: {os.path.basename(script)} --startup-report [<input> <output>]")
+        return 1
+    mode = 'render' if argv else 'import'
+    budget = float(os.environ.get('REPORT_STARTUP_BUDGET_MS') or STARTUP_BUDGET_MS[report][mode])
+    try:
+        summary = measure(script, argv)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+    return 0 if print_report(summary, budget) else 1
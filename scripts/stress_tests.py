@@ -0,0 +1,147 @@
+"""
+Australian Retirement Planning - Batched Formal Test Evaluation
+
+Server-side counterpart of runFormalTests (app/page.tsx). Instead of
+uploading every test's full simulationData, a payload can send just the
+test definitions (name, desc, return-shock sequence, CPI, health shock,
+target years). Tests sharing a CPI and health setting are projected
+together as one matrix by the vectorized projection engine, and each test
+is reduced to its outcome: pass/fail, depletion age, lowest balance and
+final balance. The PDF's Formal Test Scenarios page renders those outcomes
+directly.
+
+Requires NumPy. Reports opt in with a formalTestDefinitions payload key:
+    "formalTestDefinitions": true                       the standard A1-H1 set
+    "formalTestDefinitions": {"X1": {"name": ..., "desc": ...,
+                              "returns": [-30, -10, 5], "cpi": 3, "years": 35}}
+The computed outcomes replace formalTestResults.
+"""
+
+import numpy as np
+
+from projection_engine import ProjectionParams, project, scenario_return, survived
+from report_data import to_number
+from report_summary import formal_tests
+
+
+DEFAULT_TARGET_YEARS = 35
+DEFAULT_CPI = 2.5
+
+# $30k a year (real) from the 15th simulated year, as runSimulation's healthShock
+HEALTH_SHOCK_COST = 30000
+HEALTH_SHOCK_YEAR = 15
+
+# Mirrors formalTests in app/page.tsx
+STANDARD_TESTS = {
+    'A1': {'name': 'A1: Base Case', 'returns': [5] * 35, 'cpi': 2.5,
+           'desc': '5% return, baseline test', 'health': False, 'years': 35},
+    'A2': {'name': 'A2: Low Returns', 'returns': [3.5] * 35, 'cpi': 2.5,
+           'desc': '3.5% return, structural test', 'health': False, 'years': 35},
+    'B1': {'name': 'B1: Crash', 'returns': [-25, -15] + [5] * 33, 'cpi': 2.5,
+           'desc': 'Immediate crash then recovery', 'health': False, 'years': 35},
+    'B2': {'name': 'B2: Bear Market', 'returns': [0] * 10 + [5] * 25, 'cpi': 2.5,
+           'desc': '10 years zero return', 'health': False, 'years': 35},
+    'B3': {'name': 'B3: High Volatility',
+           'returns': [12, -18, 15, -12, 20, -15, 18, -10, 10, -8, 15, -12, 8, -5, 12, -8, 10, -6,
+                       8, -4, 7, -3, 6, -2] + [5] * 11,
+           'cpi': 2.5, 'desc': 'High volatility 5% average', 'health': False, 'years': 35},
+    'C1': {'name': 'C1: High Inflation', 'returns': [5] * 35, 'cpi': 5,
+           'desc': '5% CPI entire period', 'health': False, 'years': 35},
+    'D1': {'name': 'D1: Extreme Longevity', 'returns': [5] * 45, 'cpi': 2.5,
+           'desc': 'Survival to age 105', 'health': False, 'years': 45},
+    'G1': {'name': 'G1: Health Shock', 'returns': [5] * 35, 'cpi': 2.5,
+           'desc': '$30k/year from age 75', 'health': True, 'years': 35},
+    'H1': {'name': 'H1: Worst Case', 'returns': [-25, -15, 5] + [0] * 7 + [5] * 25, 'cpi': 5,
+           'desc': 'Crash + High CPI + Health', 'health': True, 'years': 35},
+}
+
+
+def _variant(params, cpi, health):
+    """Copy of params with the test's CPI and health shock applied"""
+    values = {name: getattr(params, name) for name in ProjectionParams.__slots__}
+    values['inflation_rate'] = cpi
+    if health:
+        shock_age = params.current_age + HEALTH_SHOCK_YEAR - 1
+        values['one_off_expenses'] = list(params.one_off_expenses) + [
+            (float(age), HEALTH_SHOCK_COST) for age in range(int(shock_age), int(params.ages[-1]) + 1)
+        ]
+    return ProjectionParams(**values)
+
+
+def _returns_matrix(sequences, fill):
+    """Pad return sequences of different lengths into one (tests, years) matrix"""
+    width = max((len(s) for s in sequences), default=0)
+    matrix = np.full((len(sequences), width), fill)
+    for i, sequence in enumerate(sequences):
+        matrix[i, :len(sequence)] = sequence
+    return matrix
+
+
+def outcomes(result, target_years):
+    """Reduce each projected path to its outcome over its target years"""
+    ages = result.ages
+    n_years = len(ages)
+    target = np.minimum(np.asarray(target_years, dtype=np.int64), n_years)
+    lengths = np.minimum(result.lengths, target)
+    rows = np.arange(len(lengths))
+
+    recorded = np.arange(n_years)[np.newaxis, :] < lengths[:, np.newaxis]
+    balances = np.where(recorded, result.total_balance, np.inf)
+    lowest = balances.argmin(axis=1)
+    exhausted = recorded & (result.total_balance <= 0)
+    depleted = exhausted.any(axis=1)
+    first_exhausted = exhausted.argmax(axis=1)
+    final = result.total_balance[rows, np.maximum(lengths - 1, 0)]
+
+    # Passed as runFormalTests: lasted the target years, final balance >= 0
+    passed = survived(final, lengths, target)
+
+    reduced = []
+    for i in rows:
+        reduced.append({
+            'passed': bool(passed[i]),
+            'finalBalance': float(final[i]),
+            'yearsLasted': int(lengths[i]),
+            'targetYears': int(target[i]),
+            'depletionAge': int(ages[first_exhausted[i]]) if depleted[i] else None,
+            'minBalance': float(result.total_balance[i, lowest[i]]),
+            'minBalanceAge': int(ages[lowest[i]]),
+        })
+    return reduced
+
+
+def evaluate_tests(params, definitions):
+    """Outcome of every (key, definition) test, batched by CPI and health shock"""
+    groups = {}
+    for key, test in definitions:
+        cpi = to_number(test.get('cpi'), DEFAULT_CPI)
+        groups.setdefault((cpi, bool(test.get('health'))), []).append((key, test))
+
+    fill = scenario_return(params.selected_scenario)
+    results = {}
+    for (cpi, health), tests in groups.items():
+        returns = _returns_matrix([[to_number(r) for r in test.get('returns') or []] for _, test in tests], fill)
+        projection = project(_variant(params, cpi, health), returns)
+        target = [int(to_number(test.get('years'), DEFAULT_TARGET_YEARS)) for _, test in tests]
+        for (key, test), outcome in zip(tests, outcomes(projection, target)):
+            results[key] = dict(name=test.get('name', key), desc=test.get('desc', ''),
+                                source='server', **outcome)
+
+    # Keep the definitions' order
+    return {key: results[key] for key, _ in definitions}
+
+
+def tests_for_payload(data):
+    """Evaluate the formal tests defined in a report payload"""
+    if not isinstance(data.get('formalTestDefinitions'), dict):
+        data = dict(data, formalTestDefinitions=STANDARD_TESTS)
+    return evaluate_tests(ProjectionParams.from_payload(data), formal_tests(data, 'formalTestDefinitions'))
+
+
+def with_server_formal_tests(data):
+    """Payload copy whose formalTestResults were computed here (unchanged if not requested)"""
+    if not data.get('formalTestDefinitions'):
+        return data
+    data = dict(data)
+    data['formalTestResults'] = tests_for_payload(data)
+    return data
@@ -0,0 +1,14 @@
+"""
+Australian Retirement Planning - Script Tests
+
+Run from the repository root with `python -m pytest scripts/tests`.
+The report scripts import each other as top-level modules, so scripts/
+goes on the path here.
+"""
+
+import os
+import sys
+
+SCRIPTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SCRIPTS not in sys.path:
+    sys.path.insert(0, SCRIPTS)
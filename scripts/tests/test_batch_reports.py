@@ -0,0 +1,69 @@
+"""Tests for the batch report generator (batch_reports.py)"""
+
+import json
+import multiprocessing
+import os
+
+import pytest
+
+import batch_reports
+from batch_reports import iter_payloads, run_batch
+
+
+def _init_test_worker():
+    """Stand-in renderers: {"crash": true} kills the worker process"""
+    def render(data):
+        if data.get('crash'):
+            os._exit(1)
+        return b'%PDF-test'
+    batch_reports._renderers = {'pdf': render, 'docx': render}
+
+
+@pytest.fixture
+def test_renderers(monkeypatch):
+    if multiprocessing.get_start_method() != 'fork':
+        pytest.skip('stand-in renderers reach the workers through fork')
+    monkeypatch.setattr(batch_reports, '_init_worker', _init_test_worker)
+
+
+def write_jsonl(path, rows):
+    path.write_text('\n'.join(row if isinstance(row, str) else json.dumps(row) for row in rows) + '\n')
+    return str(path)
+
+
+def test_non_object_json_is_a_per_client_failure(tmp_path):
+    source = write_jsonl(tmp_path / 'clients.jsonl', ['[1, 2]', '"text"', '{"clientId": "a"}', '{bad'])
+    payloads = list(iter_payloads(source))
+    assert [name for name, _ in payloads] == ['line-1', 'line-2', 'a', 'line-4']
+    assert isinstance(payloads[0][1], ValueError)
+    assert isinstance(payloads[1][1], ValueError)
+    assert payloads[2][1] == {'clientId': 'a'}
+
+
+def test_non_object_json_file_in_directory(tmp_path):
+    (tmp_path / 'list.json').write_text('[1, 2]')
+    (tmp_path / 'ok.json').write_text('{}')
+    payloads = dict(iter_payloads(str(tmp_path)))
+    assert isinstance(payloads['list'], ValueError)
+    assert payloads['ok'] == {}
+
+
+def test_duplicate_names_never_collide(tmp_path, test_renderers):
+    source = write_jsonl(tmp_path / 'clients.jsonl', [
+        {'clientId': 'acme'}, {'clientId': 'acme-2'}, {'clientId': 'acme'}, {'clientId': 'acme'},
+    ])
+    summary = run_batch(source, str(tmp_path / 'out'), workers=1)
+    assert summary['failures'] == 0
+    assert sorted(os.listdir(tmp_path / 'out')) == ['acme-2.pdf', 'acme-3.pdf', 'acme-4.pdf', 'acme.pdf']
+
+
+def test_crashed_worker_fails_only_its_clients(tmp_path, test_renderers):
+    source = write_jsonl(tmp_path / 'clients.jsonl', [
+        {'clientId': 'before'}, {'clientId': 'boom', 'crash': True}, [1], {'clientId': 'after'},
+    ])
+    summary = run_batch(source, str(tmp_path / 'out'), workers=1, in_flight=1)
+    failed = {failure['client'] for failure in summary['failed']}
+    assert summary['clients'] == 4
+    assert 'boom' in failed and 'line-3' in failed
+    assert 'after' not in failed
+    assert os.path.exists(tmp_path / 'out' / 'after.pdf')
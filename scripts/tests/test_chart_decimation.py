@@ -0,0 +1,102 @@
+"""Tests for shape-preserving chart decimation (chart_decimation.py)"""
+
+import random
+
+import pytest
+
+from chart_decimation import decimate_bars, decimate_line, exhaustion_index, lttb_indices, minmax_indices
+from report_data import chart_columns
+
+
+def monthly_chart(months=1200, depleted_at=1000, spike_at=300, dip_at=600):
+    """Declining balance with a one-month spike and dip, exhausted at depleted_at"""
+    rows = []
+    for m in range(months):
+        balance = 1000000 * (depleted_at - m) / depleted_at
+        if m == spike_at:
+            balance += 400000
+        if m == dip_at:
+            balance -= 300000
+        rows.append({
+            'age': 60 + m / 12,
+            'totalBalance': balance,
+            'mainSuper': balance * 0.8,
+            'income': 2000 + (15000 if m == 450 else 0),
+            'spending': 5000 + (60000 if m == 700 else 0),
+        })
+    return chart_columns(rows)
+
+
+def test_lttb_keeps_ends_and_threshold_points():
+    ys = [float((i * 7919) % 101) for i in range(500)]
+    indices = lttb_indices(list(range(500)), ys, 50)
+    assert len(indices) == 50
+    assert indices[0] == 0 and indices[-1] == 499
+    assert indices == sorted(set(indices))
+
+
+def test_lttb_keeps_a_spike_on_a_flat_line():
+    ys = [1.0] * 400
+    ys[123] = 50.0
+    assert 123 in lttb_indices(list(range(400)), ys, 20)
+
+
+def test_lttb_short_series_is_unchanged():
+    assert lttb_indices([0, 1, 2], [3, 1, 2], 10) == [0, 1, 2]
+
+
+def test_minmax_keeps_every_bucket_extreme():
+    ys = [0.0] * 100
+    ys[10], ys[55] = 9.0, -9.0
+    selected = minmax_indices(ys, 5)
+    assert {10, 55} <= selected
+    assert len(selected) <= 10
+
+
+def test_line_keeps_extrema_and_exhaustion_row():
+    columns = monthly_chart()
+    rows = decimate_line(columns, 120, secondary=('main_super', 'income'))
+    balances = columns.total_balance
+
+    assert rows == sorted(set(rows))
+    assert rows[0] == 0 and rows[-1] == len(columns) - 1
+    assert 300 in rows  # spike, the global maximum
+    assert balances.index(min(balances)) in rows
+    assert 600 in rows  # dip
+    assert exhaustion_index(balances) == 1000 and 1000 in rows
+    assert 450 in rows  # income spike in a secondary series
+    assert len(rows) <= 120 + 4 * (120 // 4) + 3
+
+
+def test_bars_keep_spending_spike_and_exhaustion_row():
+    columns = monthly_chart()
+    rows = decimate_bars(columns, 15)
+    assert 700 in rows
+    assert 1000 in rows
+    assert len(rows) <= 16
+
+
+def test_short_series_are_drawn_whole():
+    columns = monthly_chart(months=10, depleted_at=8, spike_at=2, dip_at=5)
+    assert decimate_line(columns, 120) == list(range(10))
+    assert decimate_bars(columns, 15) == list(range(10))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random_walks_keep_global_extrema(seed):
+    rng = random.Random(seed)
+    balance, rows = 500000.0, []
+    for m in range(900):
+        balance += rng.gauss(-600, 20000)
+        rows.append({'age': 60 + m / 12, 'totalBalance': balance, 'spending': rng.uniform(0, 9000)})
+    columns = chart_columns(rows)
+    balances = columns.total_balance
+
+    kept = decimate_line(columns, 60)
+    assert balances.index(max(balances)) in kept
+    assert balances.index(min(balances)) in kept
+    if exhaustion_index(balances) is not None:
+        assert exhaustion_index(balances) in kept
+
+    bars = decimate_bars(columns, 12)
+    assert columns.spending.index(max(columns.spending)) in bars
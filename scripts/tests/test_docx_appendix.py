@@ -0,0 +1,88 @@
+"""Tests for the year-by-year DOCX appendix (create_year_by_year_appendix)"""
+
+from docx import Document
+from docx.enum.section import WD_ORIENT
+from docx.oxml.ns import qn
+
+from generate_retirement_docx import create_year_by_year_appendix
+
+YEARS = 75
+CHART = [{'year': 2026 + i, 'age': 25 + i, 'totalBalance': 900000 - i * 15000, 'income': 1000 * i,
+          'spending': 50000} for i in range(YEARS)]
+
+
+def band(offset, years=YEARS, start_age=25, with_ages=True):
+    rows = [{'totalBalance': 900000 - i * 15000 + offset} for i in range(years)]
+    if with_ages:
+        for i, row in enumerate(rows):
+            row['age'] = start_age + i
+    return rows
+
+
+def percentiles(**options):
+    offsets = {'p10': -200000, 'p25': -100000, 'p50': 0, 'p75': 100000, 'p90': 200000}
+    return {key: band(offset, **options) for key, offset in offsets.items()}
+
+
+def appendix(data):
+    doc = Document()
+    create_year_by_year_appendix(doc, data)
+    return doc
+
+
+def rows_text(table):
+    return [[cell.text for cell in row.cells] for row in table.rows]
+
+
+def test_every_year_with_percentile_columns():
+    doc = appendix({'chartData': CHART, 'monteCarloResults': {'percentiles': percentiles()}})
+    (table,) = doc.tables
+    rows = rows_text(table)
+    assert rows[0] == ['Year', 'Age', 'Total Balance', 'Income', 'Spending', 'P10', 'P25', 'P50', 'P75', 'P90']
+    assert len(rows) == YEARS + 1
+    assert rows[1][:2] == ['2026', '25'] and rows[-1][:2] == ['2100', '99']
+    assert rows[1][5:] == ['$700,000', '$800,000', '$900,000', '$1,000,000', '$1,100,000']
+    # The header row repeats on every page
+    assert table.rows[0]._tr.trPr.find(qn('w:tblHeader')) is not None
+    assert doc.sections[-1].orientation == WD_ORIENT.LANDSCAPE
+
+
+def test_percentiles_are_matched_on_age():
+    later = percentiles(years=10, start_age=60)
+    (table,) = appendix({'chartData': CHART, 'monteCarloResults': {'percentiles': later}}).tables
+    rows = rows_text(table)
+    assert rows[1][5:] == [''] * 5  # age 25 has no band
+    assert rows[36][1] == '60' and rows[36][7] == '$900,000'
+    assert rows[46][5:] == [''] * 5  # past the bands' last age
+
+
+def test_percentiles_without_ages_line_up_by_year():
+    paths = percentiles(years=3, with_ages=False)
+    (table,) = appendix({'chartData': CHART, 'historicalMonteCarloResults': {'percentiles': paths}}).tables
+    rows = rows_text(table)
+    assert rows[3][7] == '$870,000'
+    assert rows[4][5:] == [''] * 5
+
+
+def test_without_percentile_paths_or_when_disabled():
+    numbers = {'p10': 1, 'p25': 2, 'p50': 3, 'p75': 4, 'p90': 5}
+    for data in ({'chartData': CHART, 'monteCarloResults': {'percentiles': numbers}},
+                 {'chartData': CHART, 'monteCarloResults': {'percentiles': percentiles()},
+                  'appendixPercentileColumns': False}):
+        (table,) = appendix(data).tables
+        assert len(table.columns) == 5
+        assert len(table.rows) == YEARS + 1
+
+
+def test_exhausted_years_are_shaded():
+    (table,) = appendix({'chartData': CHART}).tables
+    fills = [row.cells[0]._tc.tcPr.find(qn('w:shd')) for row in table.rows[1:]]
+    shaded = [i for i, fill in enumerate(fills) if fill is not None]
+    assert shaded == list(range(60, YEARS))  # balance <= 0 from the 61st year
+    assert fills[60].get(qn('w:fill')) == 'FEE2E2'
+
+
+def test_no_appendix_without_chart_data():
+    doc = appendix({'chartData': []})
+    assert not doc.tables
+    assert len(doc.sections) == 1
@@ -0,0 +1,79 @@
+"""Tests for incremental DOCX section rendering (docx_fragments.py)"""
+
+import pytest
+from lxml import etree
+
+from docx_fragments import depends_on, section_key
+from generate_retirement_docx import DOCUMENT_SECTIONS, build_document
+from render_cache import RenderCache
+
+PLAN = {
+    'reportDate': '2025-03-01',
+    'mainSuperBalance': 1000000,
+    'sequencingBuffer': 150000,
+    'totalPensionIncome': 30000,
+    'currentAge': 58,
+    'retirementAge': 60,
+    'baseSpending': 70000,
+    'inflationRate': 2.5,
+    'selectedScenario': 3,
+    'spendingPattern': 'jpmorgan',
+    'chartData': [
+        {'age': 58 + i, 'year': 2026 + i, 'totalBalance': 1150000 - i * 20000, 'mainSuper': 1000000 - i * 20000,
+         'buffer': 150000, 'spending': 70000 if i >= 2 else 0, 'income': 30000 if i >= 2 else 0}
+        for i in range(43)
+    ],
+}
+
+
+def body_xml(doc):
+    return etree.tostring(doc.element.body)
+
+
+def build(data, cache):
+    return body_xml(build_document(data, fragments=cache))
+
+
+@pytest.fixture
+def cache():
+    return RenderCache(memory_bytes=16 << 20)
+
+
+def test_section_key_reads_only_declared_inputs():
+    @depends_on('baseSpending')
+    def create_section(doc, data):
+        pass
+
+    key = section_key(create_section, PLAN)
+    assert section_key(create_section, dict(PLAN, currentAge=40)) == key
+    assert section_key(create_section, dict(PLAN, baseSpending=1)) != key
+
+
+def test_cached_sections_splice_to_the_same_document(cache):
+    fresh = build(PLAN, False)
+    assert build(PLAN, cache) == fresh
+    misses = cache.stats()['misses']
+
+    assert build(PLAN, cache) == fresh
+    stats = cache.stats()
+    assert stats['misses'] == misses
+    assert stats['memory_hits'] >= len([s for s in DOCUMENT_SECTIONS if hasattr(s, 'dependencies')])
+
+
+def test_edit_rebuilds_only_dependent_sections(cache):
+    build(PLAN, cache)
+    misses = cache.stats()['misses']
+
+    edited = dict(PLAN, baseSpending=75000)
+    assert build(edited, cache) == build(edited, False)
+    rebuilt = cache.stats()['misses'] - misses
+    dependent = [s for s in DOCUMENT_SECTIONS if 'baseSpending' in getattr(s, 'dependencies', ())]
+    assert 0 < rebuilt == len(dependent)
+
+
+def test_landscape_appendix_section_properties_survive_splicing(cache):
+    build(PLAN, cache)
+    doc = build_document(PLAN, fragments=cache)
+    fresh = build_document(PLAN, fragments=False)
+    assert len(fresh.sections) == 2
+    assert [s.orientation for s in doc.sections] == [s.orientation for s in fresh.sections]
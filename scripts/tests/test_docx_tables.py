@@ -0,0 +1,108 @@
+"""Equivalence tests: bulk w:tbl tables (docx_tables.py) against python-docx's per-cell API"""
+
+import pytest
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml.ns import qn
+from docx.shared import RGBColor
+
+from docx_tables import Cell, add_table, build_table_xml
+from generate_retirement_docx import set_cell_background
+
+HEADER = ['Year', 'Age', 'Notes & <Events>', 'Balance']
+ROWS = [
+    [2026, 60, 'Buy caravan & boat', '$1,200,000'],
+    [2027, 61, 'Returns < 0 > expected', '$1,150,000'],
+    [2028, 62, 'Line one\nLine two', '$1,100,000'],
+    [2029, 63, None, '$0'],
+]
+ALIGN = ['center', 'center', 'left', 'right']
+ALIGNMENTS = {'center': WD_ALIGN_PARAGRAPH.CENTER, 'left': WD_ALIGN_PARAGRAPH.LEFT,
+              'right': WD_ALIGN_PARAGRAPH.RIGHT}
+
+
+def per_cell_table(doc):
+    """The table as the generator used to build it, one proxy cell at a time"""
+    table = doc.add_table(rows=len(ROWS) + 1, cols=len(HEADER))
+    table.style = 'Light Grid Accent 1'
+    for i, header in enumerate(HEADER):
+        cell = table.rows[0].cells[i]
+        cell.text = header
+        cell.paragraphs[0].runs[0].font.bold = True
+        cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+        set_cell_background(cell, '1E3A8A')
+        cell.paragraphs[0].runs[0].font.color.rgb = RGBColor(255, 255, 255)
+    for idx, values in enumerate(ROWS, 1):
+        for i, value in enumerate(values):
+            cell = table.rows[idx].cells[i]
+            cell.text = '' if value is None else str(value)
+            cell.paragraphs[0].alignment = ALIGNMENTS[ALIGN[i]]
+    return table
+
+
+def bulk_table(doc):
+    return add_table(doc, ROWS, header=HEADER, header_fill='1E3A8A', header_align='center', align=ALIGN)
+
+
+def table_text(table):
+    return [[cell.text for cell in row.cells] for row in table.rows]
+
+
+def cell_fill(cell):
+    shading = cell._element.tcPr.find(qn('w:shd'))
+    return None if shading is None else shading.get(qn('w:fill'))
+
+
+@pytest.fixture
+def tables():
+    doc = Document()
+    return per_cell_table(doc), bulk_table(doc)
+
+
+def test_same_grid_and_style(tables):
+    old, new = tables
+    assert len(new.columns) == len(old.columns) == len(HEADER)
+    assert len(new.rows) == len(old.rows)
+    assert new.style.name == old.style.name
+
+
+def test_same_cell_text_including_escaped_characters(tables):
+    old, new = tables
+    assert table_text(new) == table_text(old)
+    assert new.cell(0, 2).text == 'Notes & <Events>'
+    assert new.cell(2, 2).text == 'Returns < 0 > expected'
+    assert new.cell(3, 2).text == 'Line one\nLine two'
+
+
+def test_same_header_styling(tables):
+    old, new = tables
+    for old_cell, new_cell in zip(old.rows[0].cells, new.rows[0].cells):
+        old_run, new_run = old_cell.paragraphs[0].runs[0], new_cell.paragraphs[0].runs[0]
+        assert new_run.font.bold is old_run.font.bold is True
+        assert new_run.font.color.rgb == old_run.font.color.rgb == RGBColor(255, 255, 255)
+        assert new_cell.paragraphs[0].alignment == old_cell.paragraphs[0].alignment
+        assert cell_fill(new_cell) == cell_fill(old_cell) == '1E3A8A'
+
+
+def test_same_body_alignment_without_shading(tables):
+    old, new = tables
+    for old_row, new_row in zip(old.rows[1:], new.rows[1:]):
+        for old_cell, new_cell in zip(old_row.cells, new_row.cells):
+            assert new_cell.paragraphs[0].alignment == old_cell.paragraphs[0].alignment
+            assert cell_fill(new_cell) is None
+
+
+def test_cell_overrides_and_row_fill():
+    doc = Document()
+    table = add_table(doc, [[1, Cell(2, bold=True, fill='FF0000')], [3, 4]],
+                      formats={1: lambda v: f'${v}'}, row_fill=lambda r, values: 'EEEEEE' if r else None)
+    assert table_text(table) == [['1', '$2'], ['3', '$4']]
+    assert table.cell(0, 1).paragraphs[0].runs[0].font.bold is True
+    assert cell_fill(table.cell(0, 1)) == 'FF0000'
+    assert cell_fill(table.cell(0, 0)) is None
+    assert cell_fill(table.cell(1, 0)) == 'EEEEEE'
+
+
+def test_xml_escapes_markup():
+    xml = build_table_xml([['a & b', '<c>']], 2, 9000)
+    assert 'a &amp; b' in xml and '&lt;c&gt;' in xml
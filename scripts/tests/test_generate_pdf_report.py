@@ -0,0 +1,70 @@
+"""Tests for the rendered PDF report (generate_pdf_report.py)"""
+
+import re
+
+import pytest
+from reportlab import rl_config
+
+from generate_pdf_report import create_monte_carlo_fan_chart, generate_pdf_report
+
+PLAN = {
+    'mainSuperBalance': 1000000,
+    'sequencingBuffer': 0,
+    'currentAge': 60,
+    'retirementAge': 60,
+    'baseSpending': 60000,
+    'chartData': [{'age': 60, 'year': 2026, 'totalBalance': 1000000}],
+}
+
+
+@pytest.fixture
+def render(monkeypatch):
+    # Uncompressed page streams keep the drawn strings searchable
+    monkeypatch.setattr(rl_config, 'pageCompression', 0)
+
+    def render(data):
+        content = generate_pdf_report(dict(PLAN, **data)).getvalue()
+        return [text.decode('latin-1') for text in re.findall(rb'\(((?:PASS|FAIL) - [^)]*)\)', content)]
+    return render
+
+
+def test_formal_test_exhausted_at_target_is_a_pass(render):
+    outcomes = render({'formalTestResults': {
+        'A1': {'name': 'Edge', 'passed': True, 'finalBalance': 0, 'yearsLasted': 35, 'depletionAge': 94},
+        'A2': {'name': 'Short', 'passed': False, 'finalBalance': 0, 'yearsLasted': 20, 'depletionAge': 80},
+    }})
+    assert outcomes == ['PASS - Portfolio survives with $0 remaining',
+                        'FAIL - Portfolio depletes at age 80']
+
+
+def test_formal_test_without_passed_flag_needs_a_positive_balance(render):
+    outcomes = render({'formalTestResults': {
+        'A1': {'name': 'Legacy', 'finalBalance': 0, 'yearsLasted': 35, 'depletionAge': 94},
+    }})
+    assert outcomes == ['FAIL - Portfolio depletes at age 94']
+
+
+def band_path(start, step, years=75):
+    return [{'age': 60 + i, 'totalBalance': start + step * i} for i in range(years)]
+
+
+def test_fan_chart_band_polygons():
+    from reportlab.graphics.shapes import Polygon
+
+    percentiles = {'p10': band_path(-50000, -1000), 'p25': band_path(500000, 0), 'p50': band_path(800000, 1000),
+                   'p75': band_path(900000, 2000), 'p90': band_path(1000000, 5000)}
+    drawing = create_monte_carlo_fan_chart(percentiles, width=600, height=300)
+    outer, inner = [node for node in drawing.contents if isinstance(node, Polygon)]
+
+    y_scale = 200 / ((1000000 + 5000 * 74) / 1000 * 1.1)
+    x_scale = 500 / 74
+    assert len(outer.points) == 4 * 75
+    assert outer.points[:4] == pytest.approx([50, 50 + 1000 * y_scale, 50 + x_scale, 50 + 1005 * y_scale])
+    # Back along p10, which is clipped at zero
+    assert outer.points[150:152] == pytest.approx([550, 50])
+    assert outer.points[-2:] == pytest.approx([50, 50])
+    assert inner.points[-1] == pytest.approx(50 + 500 * y_scale)
+
+
+def test_fan_chart_needs_percentile_paths():
+    assert create_monte_carlo_fan_chart({'p10': 1, 'p25': 2, 'p50': 3, 'p75': 4, 'p90': 5}) is None
@@ -0,0 +1,67 @@
+"""Tests for the rolling-window historical backtest (historical_backtest.py)"""
+
+from array import array
+
+import numpy as np
+import pytest
+
+from historical_backtest import (DEFAULT_HORIZON, HISTORICAL_RETURNS, backtest_for_payload,
+                                 rolling_windows, run_backtest)
+from projection_engine import ProjectionParams, project
+
+PLAN = {
+    'mainSuperBalance': 900000,
+    'sequencingBuffer': 100000,
+    'totalPensionIncome': 25000,
+    'currentAge': 60,
+    'retirementAge': 60,
+    'baseSpending': 70000,
+    'inflationRate': 2.5,
+    'selectedScenario': 3,
+}
+
+
+def test_rolling_windows_are_views():
+    returns = array('d', [1.0, 2.0, 3.0, 4.0])
+    windows = rolling_windows(returns, 3)
+    assert windows.tolist() == [[1.0, 2.0, 3.0], [2.0, 3.0, 4.0]]
+    assert not windows.flags.writeable
+    with pytest.raises(ValueError):
+        rolling_windows(returns, 5)
+
+
+def test_one_run_per_complete_block():
+    result = backtest_for_payload(dict(PLAN, serverHistoricalMonteCarlo=True)).to_payload()
+    assert result['runs'] == len(HISTORICAL_RETURNS) - DEFAULT_HORIZON + 1
+    assert result['horizon'] == DEFAULT_HORIZON
+    assert result['periods'][0] == '1928-1962'
+    assert len(result['percentiles']['p50']) == DEFAULT_HORIZON
+
+
+def test_success_is_measured_over_the_horizon():
+    params = ProjectionParams.from_payload(PLAN)
+    result = run_backtest(params)
+    windows = rolling_windows(HISTORICAL_RETURNS, DEFAULT_HORIZON)
+    full = project(params, windows)
+
+    # Each window, projected on its own for the horizon years only
+    within = full.total_balance[:, :DEFAULT_HORIZON]
+    lasted = (full.lengths >= DEFAULT_HORIZON) & (within[:, -1] >= 0)
+    assert result.success_rate == pytest.approx(lasted.mean() * 100)
+    assert len(result.failed_periods()) == int((~lasted).sum())
+    np.testing.assert_array_equal(result.projection.total_balance, within)
+
+
+def test_failed_periods_name_the_windows():
+    poor = [-20.0] * 10 + [0.0] * 40
+    result = backtest_for_payload(dict(PLAN, serverHistoricalMonteCarlo={
+        'returns': poor, 'firstYear': 1900, 'horizon': 30}))
+    payload = result.to_payload()
+    assert payload['periods'] == ['1900-1929', '1920-1949']
+    assert payload['failedPeriods'][0] == '1900-1929'
+    assert payload['successRate'] < 100
+
+
+def test_horizon_is_capped_at_the_plan_length():
+    result = backtest_for_payload(dict(PLAN, currentAge=90, serverHistoricalMonteCarlo={'horizon': 35}))
+    assert result.horizon == 11
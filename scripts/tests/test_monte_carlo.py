@@ -0,0 +1,110 @@
+"""Tests for the batched Monte Carlo engine (monte_carlo.py)"""
+
+import numpy as np
+import pytest
+
+import monte_carlo
+from monte_carlo import monte_carlo_for_payload, percentile_bands
+from projection_engine import ProjectionParams, project
+
+PLAN = {
+    'mainSuperBalance': 900000,
+    'sequencingBuffer': 100000,
+    'totalPensionIncome': 20000,
+    'currentAge': 60,
+    'retirementAge': 60,
+    'baseSpending': 75000,
+    'inflationRate': 2.5,
+    'selectedScenario': 3,
+    'includeAgePension': True,
+    'isHomeowner': True,
+}
+
+
+def with_options(**options):
+    data = dict(PLAN)
+    data['serverMonteCarlo'] = options
+    return data
+
+
+def test_string_seed_matches_integer_seed():
+    a = monte_carlo_for_payload(with_options(runs=200, seed='7')).to_payload()
+    b = monte_carlo_for_payload(with_options(runs=200, seed=7)).to_payload()
+    assert a == b
+    assert a['seed'] == 7
+
+
+@pytest.mark.parametrize('seed', ['seven', '', [1]])
+def test_invalid_seed_is_rejected(seed):
+    with pytest.raises(ValueError, match='Invalid Monte Carlo seed'):
+        monte_carlo_for_payload(with_options(runs=10, seed=seed))
+
+
+def test_negative_seed_is_normalized():
+    result = monte_carlo_for_payload(with_options(runs=10, seed=-1))
+    assert result.seed == 2 ** 32 - 1
+
+
+def test_pre_1970_report_date_seeds_the_generator():
+    data = dict(with_options(runs=10), reportDate='1965-07-01')
+    a = monte_carlo_for_payload(data).to_payload()
+    assert 0 <= a['seed'] < 2 ** 32
+    assert monte_carlo_for_payload(data).to_payload() == a
+
+
+def test_runs_are_capped(capsys):
+    result = monte_carlo_for_payload(with_options(runs=monte_carlo.DEFAULT_MAX_RUNS * 10, seed=1))
+    assert result.runs == monte_carlo.DEFAULT_MAX_RUNS
+    assert len(result.ending_balances) == monte_carlo.DEFAULT_MAX_RUNS
+    payload = result.to_payload()
+    assert (payload['runs'], payload['requestedRuns']) == (20000, 200000)
+    assert 'capped at 20,000 (200,000 requested' in capsys.readouterr().err
+
+
+def test_run_cap_is_configurable_up_to_the_limit(monkeypatch):
+    monkeypatch.setenv('REPORT_MC_MAX_RUNS', '50000')
+    assert monte_carlo.max_runs() == 50000
+    monkeypatch.setenv('REPORT_MC_MAX_RUNS', '1000000')
+    assert monte_carlo.max_runs() == monte_carlo.RUNS_LIMIT
+
+
+def test_uncapped_runs_are_not_reported(capsys):
+    payload = monte_carlo_for_payload(with_options(runs=50, seed=1)).to_payload()
+    assert payload['runs'] == payload['requestedRuns'] == 50
+    assert capsys.readouterr().err == ''
+
+
+def test_only_banded_series_are_kept():
+    result = monte_carlo_for_payload(with_options(runs=50, seed=1))
+    assert result.projection.main_super is None
+    assert result.projection.total_balance.shape[0] == 50
+
+
+def test_kept_series_match_full_projection():
+    params = ProjectionParams.from_payload(PLAN)
+    returns = monte_carlo.draw_returns(100, len(params.ages), 7.0, 18.0, seed=5)
+    full = project(params, returns)
+    kept = project(params, returns, keep=monte_carlo.PERCENTILE_SERIES)
+    for name in monte_carlo.PERCENTILE_SERIES:
+        np.testing.assert_array_equal(getattr(kept, name), getattr(full, name))
+
+
+def test_percentile_bands_skip_exhausted_paths():
+    values = np.array([
+        [10.0, 20.0, np.nan],
+        [30.0, np.nan, np.nan],
+        [50.0, 40.0, np.nan],
+    ])
+    bands = percentile_bands(values)
+    for key, band in bands.items():
+        level = int(key[1:])
+        assert band[0] == pytest.approx(np.percentile([10, 30, 50], level))
+        assert band[1] == pytest.approx(np.percentile([20, 40], level))
+        assert np.isnan(band[2])
+
+
+def test_same_seed_is_reproducible():
+    a = monte_carlo_for_payload(with_options(runs=300, seed=11)).to_payload()
+    b = monte_carlo_for_payload(with_options(runs=300, seed=11)).to_payload()
+    assert a == b
+    assert 0 <= a['successRate'] <= 100
@@ -0,0 +1,115 @@
+"""Tests for JSON payload ingestion (payload_stream.py, report_payload.py)"""
+
+import json
+import math
+from io import BytesIO
+
+import pytest
+
+from payload_stream import load_json, load_json_stream
+from report_data import CHART_FIELDS, ChartColumns
+from report_payload import dump_bundle, load_payload
+
+ROWS = [
+    {'age': 60 + i, 'year': 2025 + i, 'totalBalance': 1000000 - i * 25000.5,
+     'spending': '65,000', 'income': 20000 + i, 'agePension': 0}
+    for i in range(40)
+]
+
+PAYLOAD = {
+    'currentAge': 60,
+    'baseSpending': 65000,
+    'chartData': ROWS,
+    'constantReturnChartData': [],
+    'monteCarloResults': {
+        'successRate': 87.5,
+        'percentiles': {'p10': ROWS[:10], 'p50': ROWS},
+        'allProjections': [ROWS, ROWS],
+        'endingBalances': [1.0, 2.0],
+    },
+    'formalTestResults': {'gfc': {'passed': True, 'simulationData': ROWS[:5]}},
+}
+
+
+def columns_equal(a, b):
+    assert isinstance(a, ChartColumns) and isinstance(b, ChartColumns)
+    assert a.keys == b.keys
+    for field in CHART_FIELDS:
+        assert getattr(a, field).tobytes() == getattr(b, field).tobytes(), field
+
+
+def assert_same_payload(a, b):
+    assert type(a) is type(b)
+    if isinstance(a, dict):
+        assert list(a) == list(b)
+        for key in a:
+            assert_same_payload(a[key], b[key])
+    elif isinstance(a, ChartColumns):
+        columns_equal(a, b)
+    else:
+        assert a == b
+
+
+def parse_both(payload):
+    raw = json.dumps(payload).encode()
+    streamed = load_json(BytesIO(raw), threshold=0)
+    decoded = load_json(BytesIO(raw), threshold=len(raw))
+    return streamed, decoded
+
+
+def test_small_and_streamed_payloads_parse_the_same():
+    streamed, decoded = parse_both(PAYLOAD)
+    assert_same_payload(streamed, decoded)
+    assert_same_payload(streamed, load_json_stream(BytesIO(json.dumps(PAYLOAD).encode())))
+
+
+def test_yearly_lists_become_columns():
+    _, data = parse_both(PAYLOAD)
+    chart = data['chartData']
+    assert len(chart) == len(ROWS)
+    assert chart.total_balance[1] == 1000000 - 25000.5
+    assert chart.spending[0] == 65000.0
+    assert len(data['constantReturnChartData']) == 0
+    assert len(data['formalTestResults']['gfc']['simulationData']) == 5
+    assert data['formalTestResults']['gfc']['passed'] is True
+
+
+def test_unused_bulk_results_are_dropped():
+    for data in parse_both(PAYLOAD):
+        results = data['monteCarloResults']
+        assert 'allProjections' not in results
+        assert 'endingBalances' not in results
+        assert results['successRate'] == 87.5
+        assert len(results['percentiles']['p10']) == 10
+
+
+def test_missing_label_fields_are_nan():
+    for data in parse_both({'chartData': [{'totalBalance': 1}]}):
+        assert math.isnan(data['chartData'].age[0])
+
+
+def test_prefix_is_part_of_the_document():
+    raw = json.dumps(PAYLOAD).encode()
+    for threshold in (0, len(raw)):
+        data = load_json(BytesIO(raw[4:]), prefix=raw[:4], threshold=threshold)
+        assert data['currentAge'] == 60
+
+
+@pytest.mark.parametrize('threshold', [0, 1 << 20])
+def test_malformed_json_raises(threshold):
+    with pytest.raises(ValueError):
+        load_json(BytesIO(b'{"chartData": [{"age": 60}'), threshold=threshold)
+    with pytest.raises(ValueError):
+        load_json(BytesIO(b'{"a": 1} trailing'), threshold=threshold)
+
+
+def test_bundle_round_trip(tmp_path):
+    json_path = tmp_path / 'payload.json'
+    json_path.write_text(json.dumps(PAYLOAD))
+    bundle_path = tmp_path / 'payload.npz'
+    dump_bundle(PAYLOAD, str(bundle_path))
+
+    from_json = load_payload(str(json_path))
+    from_bundle = load_payload(str(bundle_path))
+    columns_equal(from_json['chartData'], from_bundle['chartData'])
+    assert from_bundle['baseSpending'] == 65000
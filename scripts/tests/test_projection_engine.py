@@ -0,0 +1,91 @@
+"""Equivalence tests: projection_engine.py against calculateRetirementProjection.
+
+fixtures/projection_cases.json holds ProjectionOptions and the chartData
+the TS model returns for them; __tests__/projectionFixtures.test.ts keeps
+it in step with lib/calculations/projection.ts (regenerate with
+UPDATE_PROJECTION_FIXTURES=1 npx jest projectionFixtures).
+"""
+
+import json
+import math
+import os
+
+import numpy as np
+import pytest
+
+from projection_engine import ProjectionParams, ProjectionResult, SERIES_KEYS, project, survived
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'projection_cases.json')
+
+with open(FIXTURES) as f:
+    CASES = json.load(f)['cases']
+
+
+def payload_for(options):
+    """Report payload carrying the same plan as a set of ProjectionOptions"""
+    data = dict(options['retirementParams'])
+    data.update(options.get('splurgeParams') or {})
+    for key in ('guardrailParams', 'debtParams', 'oneOffExpenses'):
+        if key in options:
+            data[key] = options[key]
+    # The TS model reads showNominalDollars from the options, not retirementParams
+    data['showNominalDollars'] = options.get('showNominalDollars', False)
+    return data
+
+
+def project_case(case):
+    params = ProjectionParams.from_payload(payload_for(case['options']))
+    return project(params, case['options'].get('returns'))
+
+
+@pytest.mark.parametrize('case', CASES, ids=[case['name'] for case in CASES])
+def test_matches_typescript_projection(case):
+    result = project_case(case)
+    expected = case['chartData']
+    assert int(result.lengths[0]) == len(expected)
+
+    for row, want in zip(result.chart_data(), expected):
+        assert set(row) == set(want)
+        for key, value in want.items():
+            if isinstance(value, bool):
+                assert row[key] is value, (want['age'], key)
+            else:
+                assert row[key] == pytest.approx(value, rel=1e-9, abs=1e-6), (want['age'], key)
+
+
+@pytest.mark.parametrize('case', CASES, ids=[case['name'] for case in CASES])
+def test_success_and_exhaustion_age(case):
+    result = project_case(case)
+    assert bool(result.success[0]) is case['success']
+    exhaustion = result.exhaustion_age[0]
+    if case['exhaustionAge'] is None:
+        assert math.isnan(exhaustion)
+    else:
+        assert exhaustion == case['exhaustionAge']
+
+
+def test_scenarios_are_projected_independently():
+    cases = [case for case in CASES if case['options'].get('returns')]
+    case = cases[0]
+    params = ProjectionParams.from_payload(payload_for(case['options']))
+    returns = np.asarray(case['options']['returns'], dtype=np.float64)
+    batch = project(params, np.vstack([returns, returns - 5, returns + 5]))
+    single = project(params, returns - 5)
+    width = int(single.lengths[0])
+    assert int(batch.lengths[1]) == width
+    for name in SERIES_KEYS:
+        np.testing.assert_allclose(getattr(batch, name)[1, :width], getattr(single, name)[0, :width])
+
+
+def test_one_success_rule_for_every_engine():
+    final = np.array([10.0, 0.0, 0.0, -5.0])
+    lengths = np.array([3, 3, 2, 3])
+    assert survived(final, lengths, 3).tolist() == [True, True, False, False]
+    assert survived(final, lengths, 2).tolist() == [True, True, True, False]
+
+    result = ProjectionResult(ages=np.arange(60.0, 63.0), lengths=lengths,
+                              total_balance=np.array([[20.0, 15.0, 10.0], [5.0, 2.0, 0.0],
+                                                      [5.0, 0.0, np.nan], [5.0, 1.0, -5.0]]))
+    assert result.success.tolist() == [True, True, False, False]
+    assert result.survived(2).tolist() == [True, True, True, False]
+    assert result.success_rate == 50.0
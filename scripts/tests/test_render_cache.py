@@ -0,0 +1,96 @@
+"""Tests for the content-addressed render cache (render_cache.py)"""
+
+import os
+import time
+
+from payload_stream import columnize
+from render_cache import DiskTier, MemoryTier, RenderCache, cache_key, is_cacheable, payload_digest
+
+ROWS = [{'age': 60 + i, 'totalBalance': 1000.0 * i, 'spending': 50.0} for i in range(5)]
+PAYLOAD = {'reportDate': '2025-01-01', 'baseSpending': 65000, 'chartData': ROWS,
+           'monteCarloResults': {'successRate': 90, 'allProjections': [[1, 2]]}}
+
+
+class Renderer:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, data):
+        self.calls += 1
+        return b'body-%d' % self.calls
+
+
+def test_digest_ignores_key_order_and_row_encoding():
+    reordered = dict(reversed(list(PAYLOAD.items())))
+    assert payload_digest(reordered) == payload_digest(PAYLOAD)
+    assert payload_digest(columnize(PAYLOAD)) == payload_digest(PAYLOAD)
+
+
+def test_digest_ignores_skipped_bulk_results():
+    trimmed = dict(PAYLOAD, monteCarloResults={'successRate': 90})
+    assert payload_digest(trimmed) == payload_digest(PAYLOAD)
+
+
+def test_digest_changes_with_content():
+    changed = dict(PAYLOAD, chartData=ROWS[:-1] + [dict(ROWS[-1], totalBalance=1.0)])
+    assert payload_digest(changed) != payload_digest(PAYLOAD)
+    assert cache_key('pdf', PAYLOAD) != cache_key('docx', PAYLOAD)
+
+
+def test_unseeded_simulation_is_not_cacheable():
+    unpinned = {'serverMonteCarlo': True}
+    assert not is_cacheable(unpinned)
+    assert is_cacheable({'serverMonteCarlo': {'seed': 3}})
+    assert is_cacheable(dict(unpinned, reportDate='2025-01-01'))
+
+
+def test_render_reuses_stored_bytes():
+    cache = RenderCache(memory_bytes=1 << 20)
+    renderer = Renderer()
+    assert cache.render('pdf', PAYLOAD, renderer) == b'body-1'
+    assert cache.render('pdf', dict(PAYLOAD), renderer) == b'body-1'
+    assert renderer.calls == 1
+    stats = cache.stats()
+    assert (stats['memory_hits'], stats['misses'], stats['stores']) == (1, 1, 1)
+
+
+def test_memory_tier_evicts_least_recently_used():
+    tier = MemoryTier(10)
+    tier.put('a', b'aaaa')
+    tier.put('b', b'bbbb')
+    assert tier.get('a') == b'aaaa'
+    tier.put('c', b'cccc')
+    assert tier.get('b') is None
+    assert tier.get('a') == b'aaaa'
+    assert tier.bytes == 8 and tier.evictions == 1
+    tier.put('huge', b'x' * 11)
+    assert tier.get('huge') is None
+
+
+def test_disk_tier_is_shared_and_bounded(tmp_path):
+    first = DiskTier(str(tmp_path), 10)
+    second = DiskTier(str(tmp_path), 10)
+    first.put('a', b'aaaa')
+    assert second.get('a') == b'aaaa'
+
+    # Make 'a' clearly older than the next entries
+    old = time.time() - 60
+    os.utime(tmp_path / 'a.bin', (old, old))
+    second.put('b', b'bbbb')
+    second.put('c', b'cccc')
+    assert first.get('a') is None
+    assert second.bytes == 8
+    assert sorted(os.listdir(tmp_path)) == ['b.bin', 'c.bin']
+
+
+def test_disk_hits_fill_the_memory_tier(tmp_path):
+    writer = RenderCache(memory_bytes=0, directory=str(tmp_path))
+    renderer = Renderer()
+    writer.render('pdf', PAYLOAD, renderer)
+
+    reader = RenderCache(memory_bytes=1 << 20, directory=str(tmp_path))
+    assert reader.render('pdf', PAYLOAD, renderer) == b'body-1'
+    assert reader.render('pdf', PAYLOAD, renderer) == b'body-1'
+    assert renderer.calls == 1
+    stats = reader.stats()
+    assert (stats['disk_hits'], stats['memory_hits']) == (1, 1)
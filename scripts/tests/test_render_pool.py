@@ -0,0 +1,119 @@
+"""Tests for the pre-forked render pool (render_pool.py)"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from render_pool import JobFailed, JobTimeout, PoolBusy, RenderPool, handle_request
+
+
+def load_test_renderers():
+    """Renderers for the worker processes: each reply is the worker's pid"""
+    return {'pdf': render_test, 'docx': render_test}
+
+
+def render_test(data):
+    if data.get('sleep'):
+        time.sleep(data['sleep'])
+    if data.get('crash'):
+        os._exit(1)
+    if data.get('fail'):
+        raise ValueError('bad payload')
+    return str(os.getpid()).encode()
+
+
+def make_pool(**options):
+    options.setdefault('workers', 1)
+    options.setdefault('job_timeout', 10)
+    return RenderPool(loader=load_test_renderers, **options)
+
+
+def wait_until(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail('Condition not met in time')
+        time.sleep(0.01)
+
+
+def test_renders_and_counts_jobs():
+    with make_pool(workers=2) as pool:
+        assert pool.submit('pdf', {}).isdigit()
+        assert pool.submit('docx', {}).isdigit()
+        with pytest.raises(ValueError, match='Unsupported format'):
+            pool.submit('xlsx', {})
+        metrics = pool.metrics()
+    assert (metrics['submitted'], metrics['completed'], metrics['workers_alive']) == (2, 2, 2)
+
+
+def test_full_queue_is_rejected_with_pool_busy():
+    with make_pool(queue_size=1) as pool:
+        results = []
+
+        def submit():
+            results.append(pool.submit('pdf', {'sleep': 1}))
+
+        running = threading.Thread(target=submit)
+        running.start()
+        wait_until(lambda: pool.metrics()['workers_busy'] == 1)
+        queued = threading.Thread(target=submit)
+        queued.start()
+        wait_until(lambda: pool.metrics()['queue_depth'] == 1)
+
+        with pytest.raises(PoolBusy, match='queue full'):
+            pool.submit('pdf', {})
+        header, _ = handle_request(pool, {'id': 'x', 'op': 'render'})
+        assert header['busy'] and header['retryable']
+
+        running.join()
+        queued.join()
+        metrics = pool.metrics()
+    assert len(results) == 2
+    assert metrics['rejected'] == 2
+    assert metrics['max_queue_depth'] == 1
+
+
+def test_job_timeout_replaces_the_worker():
+    with make_pool() as pool:
+        first = pool.submit('pdf', {})
+        with pytest.raises(JobTimeout):
+            pool.submit('pdf', {'sleep': 60}, timeout=0.5)
+        assert pool.submit('pdf', {}) != first
+        metrics = pool.metrics()
+    assert (metrics['timed_out'], metrics['restarts'], metrics['workers_alive']) == (1, 1, 1)
+
+
+def test_crashed_worker_is_restarted():
+    with make_pool() as pool:
+        first = pool.submit('pdf', {})
+        with pytest.raises(JobFailed, match='Worker crashed'):
+            pool.submit('pdf', {'crash': True})
+        assert pool.submit('pdf', {}) != first
+        assert pool.metrics()['restarts'] == 1
+
+
+def test_renderer_errors_keep_the_worker():
+    with make_pool() as pool:
+        first = pool.submit('pdf', {})
+        with pytest.raises(JobFailed, match='ValueError: bad payload'):
+            pool.submit('pdf', {'fail': True})
+        assert pool.submit('pdf', {}) == first
+        assert pool.metrics()['restarts'] == 0
+
+
+def test_workers_are_recycled_after_max_jobs():
+    with make_pool(max_jobs_per_worker=2) as pool:
+        pids = [pool.submit('pdf', {}) for _ in range(3)]
+        assert pids[0] == pids[1] != pids[2]
+        assert pool.metrics()['restarts'] == 1
+
+
+def test_protocol_requests():
+    with make_pool() as pool:
+        assert handle_request(pool, [])[0] == {'id': None, 'ok': False, 'error': 'Request must be a JSON object'}
+        assert handle_request(pool, {'op': 'health'})[0]['status'] == 'ready'
+        header, body = handle_request(pool, {'id': 1, 'format': 'docx'})
+        assert header['ok'] and body.isdigit()
+        assert handle_request(pool, {'id': 2, 'data': {'fail': True}})[0]['error'] == 'ValueError: bad payload'
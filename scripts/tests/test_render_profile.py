@@ -0,0 +1,81 @@
+"""Tests for per-section render profiling (render_profile.py)"""
+
+import json
+import tracemalloc
+
+import pytest
+
+import generate_pdf_report
+import generate_retirement_docx
+from render_profile import RenderProfiler
+
+PLAN = {
+    'mainSuperBalance': 1000000,
+    'sequencingBuffer': 100000,
+    'currentAge': 60,
+    'retirementAge': 60,
+    'baseSpending': 60000,
+    'chartData': [{'age': 60 + i, 'year': 2026 + i, 'totalBalance': 1000000 - i * 20000} for i in range(30)],
+}
+
+
+def records(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_disabled_without_report_profile(monkeypatch):
+    monkeypatch.delenv('REPORT_PROFILE', raising=False)
+    profiler = RenderProfiler.from_env('pdf')
+    assert not profiler.enabled
+    profiler.checkpoint('setup', [])
+    assert profiler.finish() is None
+
+
+def test_docx_sections_are_recorded_to_a_metrics_file(monkeypatch, tmp_path):
+    metrics = tmp_path / 'metrics.jsonl'
+    monkeypatch.setenv('REPORT_PROFILE', str(metrics))
+    generate_retirement_docx.build_document(dict(PLAN), fragments=False)
+
+    (record,) = records(metrics)
+    names = [section['name'] for section in record['sections']]
+    assert record['report'] == 'docx'
+    assert names == ['setup'] + [create.__name__ for create in generate_retirement_docx.DOCUMENT_SECTIONS]
+    # Sections add every body element but the new document's sectPr
+    assert sum(section['items'] for section in record['sections']) == record['body_elements'] - 1
+    assert all(section['peak_bytes'] > 0 for section in record['sections'])
+    assert not tracemalloc.is_tracing()
+
+
+def test_failed_pdf_render_reports_its_section(monkeypatch, tmp_path):
+    def broken_chart(*args, **kwargs):
+        raise RuntimeError('chart failed')
+
+    monkeypatch.setattr(generate_pdf_report, 'create_portfolio_chart', broken_chart)
+    profiler = RenderProfiler('pdf', target=str(tmp_path / 'metrics.jsonl'))
+    with pytest.raises(RuntimeError, match='chart failed'):
+        generate_pdf_report.generate_pdf_report(dict(PLAN), profiler=profiler)
+
+    (record,) = records(tmp_path / 'metrics.jsonl')
+    assert record['error'] == 'RuntimeError: chart failed'
+    assert record['failed_section'] == record['sections'][-1]['name']
+    assert not tracemalloc.is_tracing()
+
+
+def test_failed_docx_section_is_named(monkeypatch, tmp_path):
+    def create_broken_section(doc, data):
+        raise ValueError('bad section')
+
+    monkeypatch.setattr(generate_retirement_docx, 'DOCUMENT_SECTIONS', (create_broken_section,))
+    profiler = RenderProfiler('docx', target=str(tmp_path / 'metrics.jsonl'))
+    with pytest.raises(ValueError):
+        generate_retirement_docx.build_document(dict(PLAN), profiler=profiler, fragments=False)
+
+    (record,) = records(tmp_path / 'metrics.jsonl')
+    assert record['failed_section'] == 'create_broken_section'
+    assert record['error'] == 'ValueError: bad section'
+    assert not tracemalloc.is_tracing()
+
+    # The profiler is reusable for the next render
+    profiler.checkpoint('setup', [])
+    assert 'error' not in profiler.finish()
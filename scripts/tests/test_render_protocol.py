@@ -0,0 +1,112 @@
+"""Tests for the render worker protocol (render_protocol.py)"""
+
+import io
+import json
+import threading
+import time
+
+import pytest
+
+from render_protocol import (ProtocolError, RenderWorker, read_frame, read_message, request,
+                             serve_unix_socket, write_frame, write_message)
+
+
+def render_text(data):
+    return json.dumps(data, sort_keys=True).encode('utf-8')
+
+
+def exchange(worker, *messages):
+    instream = io.BytesIO()
+    for message in messages:
+        write_frame(instream, json.dumps(message).encode('utf-8'))
+    instream.seek(0)
+    outstream = io.BytesIO()
+    worker.serve_stream(instream, outstream)
+    outstream.seek(0)
+    return outstream
+
+
+def test_frames_round_trip():
+    stream = io.BytesIO()
+    write_message(stream, {'ok': True}, body=b'%PDF')
+    stream.seek(0)
+    assert read_message(stream) == {'ok': True, 'size': 4}
+    assert read_frame(stream) == b'%PDF'
+    assert read_frame(stream) is None
+
+
+def test_truncated_frame_is_a_protocol_error():
+    stream = io.BytesIO()
+    write_frame(stream, b'{"op": "health"}')
+    with pytest.raises(ProtocolError, match='mid-frame'):
+        read_frame(io.BytesIO(stream.getvalue()[:-3]))
+
+
+def test_render_and_health_over_a_stream():
+    worker = RenderWorker({'pdf': render_text}, name='pdf')
+    out = exchange(worker, {'id': 1, 'op': 'render', 'data': {'a': 1}}, {'id': 2, 'op': 'health'})
+    header = read_message(out)
+    assert header['ok'] and header['id'] == 1 and header['format'] == 'pdf'
+    assert read_frame(out) == b'{"a": 1}'
+    health = read_message(out)
+    assert health['status'] == 'ready' and health['jobs'] == 1 and not health['busy']
+
+
+@pytest.mark.parametrize('message', [[], 'x', 3, None])
+def test_non_object_requests_get_a_protocol_error(message):
+    worker = RenderWorker({'pdf': render_text})
+    out = exchange(worker, message, {'id': 2, 'op': 'health'})
+    assert read_message(out) == {'id': None, 'ok': False, 'error': 'Request must be a JSON object'}
+    assert read_message(out)['ok']
+
+
+def test_renderer_errors_are_reported():
+    def fail(data):
+        raise ValueError('bad payload')
+
+    worker = RenderWorker({'pdf': fail})
+    out = exchange(worker, {'id': 'x', 'format': 'pdf'}, {'id': 'y', 'format': 'docx'})
+    assert read_message(out) == {'id': 'x', 'ok': False, 'error': 'ValueError: bad payload'}
+    assert read_message(out)['error'] == 'Unsupported format: docx'
+    assert worker.failures == 1
+
+
+def connect(path, message, timeout=5):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return request(path, message, timeout=timeout)
+        except (FileNotFoundError, ConnectionRefusedError):
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.01)
+
+
+def test_health_is_answered_during_a_render(tmp_path):
+    started, release = threading.Event(), threading.Event()
+
+    def slow(data):
+        started.set()
+        release.wait(10)
+        return b'done'
+
+    path = str(tmp_path / 'worker.sock')
+    worker = RenderWorker({'pdf': slow})
+    server = threading.Thread(target=serve_unix_socket, args=(worker, path), daemon=True)
+    server.start()
+
+    results = []
+    render = threading.Thread(target=lambda: results.append(connect(path, {'op': 'render'})))
+    render.start()
+    assert started.wait(5)
+
+    health, _ = connect(path, {'op': 'health'}, timeout=2)
+    assert health['ok'] and health['busy']
+
+    release.set()
+    render.join(5)
+    assert results[0][1] == b'done'
+
+    assert connect(path, {'op': 'shutdown'})[0]['status'] == 'stopping'
+    server.join(5)
+    assert not server.is_alive()
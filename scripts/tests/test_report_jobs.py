@@ -0,0 +1,125 @@
+"""Tests for the report job queue (report_jobs.py)"""
+
+import os
+import threading
+import time
+
+import pytest
+
+import report_jobs
+from report_jobs import JobStore
+
+
+def load_test_renderers():
+    """Renderers for the worker processes: 'pdf' hangs on {"hang": true}"""
+    return {'pdf': render_or_hang, 'docx': lambda data: b'docx'}
+
+
+def render_or_hang(data):
+    if data.get('hang'):
+        with open(os.path.join(data['dir'], f'hung-{os.getpid()}'), 'w'):
+            pass
+        time.sleep(3600)
+    return b'%PDF-test'
+
+
+def wait_for(store, job_id, statuses, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = store.status(job_id)
+        if status['status'] in statuses:
+            return status
+        time.sleep(0.1)
+    pytest.fail(f'Job {job_id} still {status["status"]} after {timeout}s')
+
+
+def is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path), ttl=60)
+    yield store
+    store.close()
+
+
+def test_claim_takes_oldest_queued_job(store):
+    first = store.submit('pdf', b'{}')
+    store.submit('docx', b'{}')
+    job_id, fmt, payload = store.claim('w1')
+    assert (job_id, fmt, payload) == (first, 'pdf', b'{}')
+    assert store.status(first)['status'] == 'running'
+
+
+def test_claim_leaves_expired_leases_to_the_supervisor(store):
+    job_id = store.submit('pdf', b'{}')
+    store.claim('w1', lease=-1)
+    assert store.claim('w2') is None
+    assert store.status(job_id)['status'] == 'running'
+    assert store.expired_workers() == ['w1']
+
+
+def test_release_fails_job_out_of_attempts(store):
+    job_id = store.submit('pdf', b'{}', max_attempts=2)
+    store.claim('w1')
+    store.release('w1', report_jobs.LEASE_EXPIRED)
+    assert store.status(job_id)['status'] == 'queued'
+    store.claim('w2')
+    store.release('w2', report_jobs.LEASE_EXPIRED)
+    status = store.status(job_id)
+    assert status['status'] == 'failed'
+    assert status['error'] == report_jobs.LEASE_EXPIRED
+    assert status['attempts'] == 2
+
+
+def test_complete_requires_current_lease(store):
+    job_id = store.submit('pdf', b'{}')
+    store.claim('w1')
+    store.release('w1')
+    assert not store.complete(job_id, 'w1', b'late')
+    store.claim('w2')
+    assert store.complete(job_id, 'w2', b'body')
+    fmt, path = store.fetch(job_id)
+    with open(path, 'rb') as f:
+        assert (fmt, f.read()) == ('pdf', b'body')
+
+
+def test_fetch_unfinished_job(store):
+    job_id = store.submit('pdf', b'{}')
+    with pytest.raises(report_jobs.JobNotReady):
+        store.fetch(job_id)
+    with pytest.raises(report_jobs.JobNotFound):
+        store.fetch('0' * 32)
+
+
+def test_supervisor_kills_render_hung_past_its_lease(store, tmp_path):
+    hang = store.submit('pdf', b'{"hang": true, "dir": "%s"}' % str(tmp_path).encode(), max_attempts=2)
+    stop = threading.Event()
+    supervisor = threading.Thread(
+        target=report_jobs.supervise,
+        args=(store.directory, 2, 1),
+        kwargs={'loader': load_test_renderers, 'stop': stop},
+    )
+    supervisor.start()
+    try:
+        status = wait_for(store, hang, ('done', 'failed'))
+        assert status['status'] == 'failed'
+        assert status['error'] == report_jobs.LEASE_EXPIRED
+        assert status['attempts'] == 2
+
+        # Every worker that hung on it was killed, not just abandoned
+        hung = [int(name.split('-')[1]) for name in os.listdir(tmp_path) if name.startswith('hung-')]
+        assert len(hung) == 2
+        assert not any(is_running(pid) for pid in hung)
+
+        # ... and the pool still serves new jobs
+        job_id = store.submit('pdf', b'{}')
+        assert wait_for(store, job_id, ('done', 'failed'))['status'] == 'done'
+    finally:
+        stop.set()
+        supervisor.join()
@@ -0,0 +1,92 @@
+"""Tests for columnar payload bundles (report_payload.py)"""
+
+import json
+import math
+
+import numpy as np
+import pytest
+
+from report_data import ChartColumns
+from report_payload import PayloadError, dump_bundle, is_bundle, load_bundle, load_payload, loads_bundle
+
+ROWS = [{'age': 60 + i, 'year': 2026 + i, 'Total Balance': 1e6 - i * 1234.5, 'spending': 70000.0}
+        for i in range(30)]
+
+PAYLOAD = {
+    'clientName': 'Test/Client',
+    'baseSpending': 70000,
+    'chartData': ROWS,
+    'monteCarloResults': {'successRate': 91.5, 'percentiles': {'p10': ROWS[:3], 'p90': ROWS}},
+    'formalTestResults': {'A/1': {'passed': True, 'simulationData': ROWS[:4]}},
+}
+
+
+@pytest.fixture
+def bundle(tmp_path):
+    path = tmp_path / 'payload.npz'
+    dump_bundle(PAYLOAD, str(path))
+    return str(path)
+
+
+def test_bundle_round_trip(bundle):
+    data = load_bundle(bundle)
+    assert data['clientName'] == 'Test/Client'
+    assert data['baseSpending'] == 70000
+    chart = data['chartData']
+    assert isinstance(chart, ChartColumns)
+    assert list(chart.total_balance) == [row['Total Balance'] for row in ROWS]
+    assert chart.keys['total_balance'] == 'Total Balance'
+    assert len(data['monteCarloResults']['percentiles']['p10']) == 3
+    assert len(data['formalTestResults']['A/1']['simulationData']) == 4
+    assert data['formalTestResults']['A/1']['passed'] is True
+
+
+def test_missing_fields_use_defaults(bundle):
+    chart = load_bundle(bundle)['chartData']
+    assert list(chart.income) == [0.0] * len(ROWS)
+
+
+def test_bundle_and_json_load_the_same(bundle, tmp_path):
+    json_path = tmp_path / 'payload.json'
+    json_path.write_text(json.dumps(PAYLOAD))
+    with open(bundle, 'rb') as f:
+        content = f.read()
+    assert is_bundle(content[:4])
+
+    from_json = load_payload(str(json_path))['chartData']
+    for data in (load_payload(bundle), loads_bundle(content)):
+        assert list(data['chartData'].total_balance) == list(from_json.total_balance)
+        assert list(data['chartData'].age) == list(from_json.age)
+
+
+def test_numpy_written_bundles(tmp_path):
+    path = tmp_path / 'np.npz'
+    params = np.frombuffer(json.dumps({'baseSpending': 1}).encode(), dtype=np.uint8)
+    np.savez(path, **{
+        'params': params,
+        'chartData/age': np.arange(60, 65, dtype=np.int32),
+        'chartData/totalBalance': np.array([5.0, 4.0, 3.0, 2.0, 1.0], dtype='>f8'),
+    })
+    data = load_bundle(str(path))
+    assert data['baseSpending'] == 1
+    assert list(data['chartData'].age) == [60.0, 61.0, 62.0, 63.0, 64.0]
+    assert list(data['chartData'].total_balance) == [5.0, 4.0, 3.0, 2.0, 1.0]
+    assert math.isnan(data['chartData'].year[0])
+
+
+def test_compressed_bundles(tmp_path):
+    path = tmp_path / 'compressed.npz'
+    params = np.frombuffer(b'{}', dtype=np.uint8)
+    np.savez_compressed(path, params=params, **{'chartData/totalBalance': np.ones(3)})
+    assert list(load_bundle(str(path))['chartData'].total_balance) == [1.0, 1.0, 1.0]
+
+
+def test_invalid_bundles(tmp_path):
+    path = tmp_path / 'bad.npz'
+    np.savez(path, **{'chartData/totalBalance': np.ones(3)})
+    with pytest.raises(PayloadError, match='no params'):
+        load_bundle(str(path))
+
+    np.savez(path, params=np.frombuffer(b'{}', dtype=np.uint8), **{'chartData/totalBalance': np.ones((2, 2))})
+    with pytest.raises(PayloadError, match='1-D'):
+        load_bundle(str(path))
@@ -0,0 +1,81 @@
+"""Tests for report summary statistics (report_summary.py)"""
+
+import pytest
+
+from report_summary import formal_test_passed, formal_tests, outcome_summary, percentile_finals, summarize_chart
+
+CHART = [
+    {'age': 58, 'totalBalance': 900000, 'spending': 0, 'income': 0},
+    {'age': 60, 'totalBalance': 700000, 'spending': 80000, 'income': 20000},
+    {'age': 61, 'totalBalance': 300000, 'spending': 80000, 'income': 20000},
+    {'age': 62, 'totalBalance': -1000, 'spending': 80000, 'income': 30000},
+    {'age': 63, 'totalBalance': -1000, 'spending': 60000, 'income': 30000},
+]
+
+
+def test_summarize_chart():
+    summary = summarize_chart(CHART, retirement_age=60)
+    assert summary.rows == 5
+    assert summary.final_balance == -1000
+    assert summary.final_age == '63'
+    assert summary.exhaustion_age == '62'
+    assert summary.min_balance == -1000
+    assert summary.min_balance_age == '62'
+    assert summary.retirement_years == 4
+    assert summary.total_spending == 300000
+    assert summary.total_income == 100000
+    assert summary.avg_spending == 75000
+    assert summary.net_withdrawals == 200000
+
+
+def test_summarize_chart_without_retirement_age_counts_every_year():
+    summary = summarize_chart(CHART)
+    assert summary.retirement_years == 5
+    assert summary.total_income == 100000
+
+
+def test_summarize_chart_retirement_after_last_row():
+    summary = summarize_chart(CHART, retirement_age=70)
+    assert summary.retirement_years == 0
+    assert summary.avg_spending == 0.0
+    assert summary.exhaustion_age == '62'
+
+
+def test_summarize_empty_chart():
+    summary = summarize_chart([])
+    assert summary.rows == 0
+    assert summary.exhaustion_age is None
+
+
+def test_outcome_summary():
+    summary = outcome_summary({'finalBalance': 0, 'yearsLasted': 12, 'minBalance': 0,
+                               'minBalanceAge': 72, 'depletionAge': 72})
+    assert summary.rows == 12
+    assert summary.exhaustion_age == '72'
+    assert summary.min_balance_age == '72'
+    assert outcome_summary({'finalBalance': 5}).min_balance is None
+
+
+def test_formal_test_passed_prefers_the_passed_flag():
+    exhausted_at_end = {'passed': True, 'finalBalance': 0, 'depletionAge': 94}
+    assert outcome_summary(exhausted_at_end).passed is True
+    assert formal_test_passed(exhausted_at_end, outcome_summary(exhausted_at_end))
+    assert formal_test_passed({'passed': True}, summarize_chart(CHART))
+    assert not formal_test_passed({}, summarize_chart(CHART))
+    assert formal_test_passed({}, outcome_summary({'finalBalance': 5}))
+
+
+def test_formal_tests_in_natural_key_order():
+    tests = {'B10': {}, 'A2': {}, 'B1': {}, 'A1': {}, 'skip': 'not a test'}
+    assert [key for key, _ in formal_tests({'formalTestResults': tests})] == ['A1', 'A2', 'B1', 'B10']
+
+
+@pytest.mark.parametrize('band, expected', [
+    (123.0, 123.0),
+    ({'finalBalance': 50}, 50.0),
+    ([{'totalBalance': 1}, {'totalBalance': 2}], 2.0),
+])
+def test_percentile_finals(band, expected):
+    finals = percentile_finals({'p50': band})
+    assert finals['p50'] == expected
+    assert finals['p10'] == 0.0
@@ -0,0 +1,80 @@
+"""Tests for reproducible report output (pinned report dates)"""
+
+import zipfile
+from io import BytesIO
+
+import pytest
+
+from generate_pdf_report import generate_pdf_report
+from generate_retirement_docx import _build_docx_bytes
+from report_data import report_timestamp
+
+PLAN = {
+    'mainSuperBalance': 1000000,
+    'sequencingBuffer': 100000,
+    'currentAge': 60,
+    'retirementAge': 60,
+    'baseSpending': 60000,
+    'chartData': [{'age': 60 + i, 'year': 2026 + i, 'totalBalance': 1000000 - i * 20000} for i in range(30)],
+    'formalTestResults': {
+        'A1': {'name': 'Crash', 'passed': True, 'finalBalance': 1000, 'yearsLasted': 35},
+        'B2': {'name': 'Inflation', 'passed': False, 'finalBalance': -5, 'yearsLasted': 20, 'depletionAge': 80},
+        'A10': {'name': 'Late crash', 'passed': True, 'finalBalance': 50, 'yearsLasted': 35},
+    },
+}
+
+
+@pytest.fixture(autouse=True)
+def no_epoch(monkeypatch):
+    monkeypatch.delenv('SOURCE_DATE_EPOCH', raising=False)
+
+
+def pdf(data):
+    return generate_pdf_report(data).getvalue()
+
+
+@pytest.mark.parametrize('render', [pdf, _build_docx_bytes])
+def test_pinned_date_renders_identical_bytes(render):
+    data = dict(PLAN, reportDate='2025-03-01')
+    assert render(dict(data)) == render(dict(data))
+    assert render(dict(PLAN, reportDate='2025-03-02')) != render(data)
+
+
+@pytest.mark.parametrize('render', [pdf, _build_docx_bytes])
+def test_formal_test_order_does_not_change_the_bytes(render):
+    reordered = dict(reversed(list(PLAN['formalTestResults'].items())))
+    data = dict(PLAN, reportDate='2025-03-01')
+    assert render(dict(data, formalTestResults=reordered)) == render(data)
+
+
+def test_source_date_epoch_pins_reports_without_a_report_date(monkeypatch):
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', '1700000000')
+    assert report_timestamp(PLAN) == 1700000000
+    assert pdf(dict(PLAN)) == pdf(dict(PLAN))
+
+
+@pytest.mark.parametrize('value', ['not a date', '', '2025-13-40', 20250301])
+def test_invalid_report_date_falls_back(monkeypatch, value):
+    data = dict(PLAN, reportDate=value)
+    assert report_timestamp(data) is None
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', '1700000000')
+    assert report_timestamp(data) == 1700000000
+
+
+def test_invalid_source_date_epoch_is_ignored(monkeypatch):
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', 'yesterday')
+    assert report_timestamp(PLAN) is None
+
+
+def test_report_dates_with_offsets_are_utc():
+    assert report_timestamp({'reportDate': '2025-03-01T10:00:00+10:00'}) == \
+        report_timestamp({'reportDate': '2025-03-01T00:00:00Z'})
+
+
+def test_pre_1980_dates_are_clamped_in_the_docx_archive():
+    data = dict(PLAN, reportDate='1965-07-01')
+    content = _build_docx_bytes(data)
+    assert content == _build_docx_bytes(dict(data))
+    with zipfile.ZipFile(BytesIO(content)) as archive:
+        assert {info.date_time for info in archive.infolist()} == {(1980, 1, 1, 0, 0, 0)}
+    assert pdf(dict(data)) == pdf(dict(data))
@@ -0,0 +1,71 @@
+"""Tests for lazy imports and the startup report (startup_report.py)"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import startup_report
+from startup_report import main, parse_importtime
+
+SCRIPTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PDF_SCRIPT = os.path.join(SCRIPTS, 'generate_pdf_report.py')
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2000 |       5000 | reportlab
+import time:      3000 |       3000 |   reportlab.lib
+some other stderr line
+"""
+
+
+def imported_modules(module):
+    code = f'import sys; sys.path.insert(0, {SCRIPTS!r}); import {module}; print("\\n".join(sys.modules))'
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+
+def test_parse_importtime():
+    assert parse_importtime(IMPORTTIME) == [
+        (120, 120, 1, '_io'),
+        (2000, 5000, 0, 'reportlab'),
+        (3000, 3000, 1, 'reportlab.lib'),
+    ]
+
+
+@pytest.mark.parametrize('module, deferred', [
+    ('generate_pdf_report', ['numpy', 'docx', 'reportlab.graphics.charts.lineplots',
+                             'reportlab.graphics.charts.barcharts', 'concurrent.futures', 'tracemalloc']),
+    ('generate_retirement_docx', ['numpy', 'reportlab', 'concurrent.futures', 'tracemalloc']),
+])
+def test_heavy_modules_are_imported_on_demand(module, deferred):
+    modules = imported_modules(module)
+    assert not modules & set(deferred)
+
+
+def test_usage_error(capsys):
+    assert main('pdf', PDF_SCRIPT, ['only-input']) == 1
+    assert 'Usage' in capsys.readouterr().out
+
+
+def test_failed_render_is_reported(tmp_path, capsys):
+    missing = str(tmp_path / 'missing.json')
+    assert main('pdf', PDF_SCRIPT, [missing, str(tmp_path / 'out.pdf')]) == 1
+    assert 'generate_pdf_report exited with status' in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('budget, status, verdict', [('100000', 0, 'OK'), ('0.001', 1, 'OVER')])
+def test_import_budget(monkeypatch, capsys, budget, status, verdict):
+    monkeypatch.setenv('REPORT_STARTUP_BUDGET_MS', budget)
+    assert main('pdf', PDF_SCRIPT, []) == status
+    out = capsys.readouterr().out
+    assert 'Startup report: generate_pdf_report (import only)' in out
+    assert verdict in out
+
+
+def test_default_budgets_cover_both_reports():
+    for report in ('pdf', 'docx'):
+        budgets = startup_report.STARTUP_BUDGET_MS[report]
+        assert 0 < budgets['import'] <= budgets['render']
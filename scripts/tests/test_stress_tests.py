@@ -0,0 +1,89 @@
+"""Tests for batched formal test evaluation (stress_tests.py)"""
+
+import numpy as np
+import pytest
+
+from projection_engine import ProjectionParams, ProjectionResult
+import stress_tests
+from stress_tests import STANDARD_TESTS, evaluate_tests, outcomes
+
+PLAN = {
+    'mainSuperBalance': 1000000,
+    'sequencingBuffer': 150000,
+    'totalPensionIncome': 30000,
+    'currentAge': 60,
+    'retirementAge': 60,
+    'baseSpending': 65000,
+    'inflationRate': 2.5,
+    'selectedScenario': 3,
+}
+
+
+def path_result(balances, lengths):
+    balances = np.asarray(balances, dtype=np.float64)
+    return ProjectionResult(ages=60.0 + np.arange(balances.shape[1]), total_balance=balances,
+                            lengths=np.asarray(lengths))
+
+
+def test_exhausted_exactly_at_target_passes_like_run_formal_tests():
+    result = path_result([[100.0, 50.0, 0.0], [100.0, 0.0, np.nan]], [3, 2])
+    first, second = outcomes(result, [3, 3])
+    assert first['passed'] is True
+    assert first['finalBalance'] == 0.0
+    assert first['depletionAge'] == 62
+    assert second['passed'] is False
+    assert second['yearsLasted'] == 2
+
+
+def test_outcome_is_measured_over_target_years():
+    result = path_result([[100.0, 40.0, 80.0, 0.0]], [4])
+    (outcome,) = outcomes(result, [3])
+    assert outcome['passed'] is True
+    assert outcome['yearsLasted'] == 3
+    assert outcome['finalBalance'] == 80.0
+    assert (outcome['minBalance'], outcome['minBalanceAge']) == (40.0, 61)
+    assert outcome['depletionAge'] is None
+
+
+def test_standard_tests_in_order():
+    results = stress_tests.tests_for_payload(dict(PLAN, formalTestDefinitions=True))
+    assert list(results) == list(STANDARD_TESTS)
+    assert results['D1']['targetYears'] == 41  # capped at age 100
+    for outcome in results.values():
+        assert outcome['source'] == 'server'
+        assert outcome['passed'] == (outcome['yearsLasted'] >= outcome['targetYears']
+                                     and outcome['finalBalance'] >= 0)
+
+
+def test_batched_tests_match_individual_runs():
+    params = ProjectionParams.from_payload(PLAN)
+    definitions = list(STANDARD_TESTS.items())
+    batched = evaluate_tests(params, definitions)
+    for key, test in definitions:
+        assert evaluate_tests(params, [(key, test)])[key] == batched[key]
+
+
+def test_harsher_tests_end_lower():
+    results = stress_tests.tests_for_payload(dict(PLAN, formalTestDefinitions=True))
+    assert results['A2']['finalBalance'] < results['A1']['finalBalance']
+    assert results['G1']['finalBalance'] < results['A1']['finalBalance']
+    assert results['H1']['minBalance'] <= results['B1']['minBalance']
+
+
+def test_custom_definitions():
+    definitions = {'X1': {'name': 'X1: Crash', 'returns': [-40, -20], 'cpi': 3, 'years': 10}}
+    results = stress_tests.tests_for_payload(dict(PLAN, formalTestDefinitions=definitions))
+    assert list(results) == ['X1']
+    assert results['X1']['targetYears'] == 10
+    assert results['X1']['name'] == 'X1: Crash'
+
+
+@pytest.mark.parametrize('health', [False, True])
+def test_health_shock_adds_spending(health):
+    definitions = {'T': {'returns': [5] * 35, 'cpi': 2.5, 'health': health, 'years': 35}}
+    results = stress_tests.tests_for_payload(dict(PLAN, formalTestDefinitions=definitions))
+    baseline = stress_tests.tests_for_payload(dict(PLAN, formalTestDefinitions={'T': dict(definitions['T'], health=False)}))
+    if health:
+        assert results['T']['finalBalance'] < baseline['T']['finalBalance']
+    else:
+        assert results['T'] == baseline['T']